@@ -4,6 +4,9 @@ import numpy as np
 import re
 import csv
 import json
+import functools
+from types import MappingProxyType
+import eia_import
 
 
 class EIAData(object):
@@ -29,15 +32,17 @@ class UsefulVars(object):
         aeo_metadata (str): File name for the custom AEO metadata JSON.
         pivot_year (int): The pivot year is the value that should be
             added to the year numbers reported in KDBOUT to convert
-            the values to actual calendar years.
+            the values to actual calendar years; a class attribute, such
+            that it is available without creating an instance.
     """
 
+    pivot_year = 1989
+
     def __init__(self):
         self.json_in = 'mseg_res_cdiv.json'
         self.json_out = 'mseg_res_com_cdiv.json'
         self.com_tloads = 'Com_TLoads_Final.txt'
         self.aeo_metadata = 'metadata.json'
-        self.pivot_year = 1989
 
 
 class CommercialTranslationDicts(object):
@@ -138,6 +143,21 @@ class CommercialTranslationDicts(object):
                                 }
 
 
+# Translation dicts shared by all of the functions that convert between
+# the JSON strings and numeric indices, built once and made read-only
+# since they are not expected to change after this module is imported
+translation_dicts = CommercialTranslationDicts()
+for attr_name, attr_dict in vars(translation_dicts).items():
+    setattr(translation_dicts, attr_name, MappingProxyType(attr_dict))
+
+
+# Columns used to select data from the KDBOUT, KSDOUT, and thermal load
+# arrays, in the order in which they are matched
+catg_index_cols = ['Label', 'Division', 'BldgType', 'EndUse', 'Fuel']
+serv_index_cols = ['r', 'b', 's', 'f']
+load_index_cols = ['CDIV', 'BLDG', 'ENDUSE']
+
+
 def json_interpreter(key_series):
     """Convert strings in JSON database into codes for data extraction.
 
@@ -163,11 +183,30 @@ def json_interpreter(key_series):
         specifying the census division, building type, fuel type,
         and end use, with a fifth position occupied by a string or
         number in the case of demand or MELs data, respectively.
+
+    Note:
+        The interpreted values are cached for each unique set of keys,
+        since the same keys are interpreted for many leaf nodes; a new
+        list is returned on each call such that the list returned can
+        be modified by the caller without affecting the cached values.
     """
+    return list(interpret_key_tuple(tuple(key_series)))
 
-    # Create an instance of the commercial data translation dicts object
-    # to be able to use the translation dicts
-    cd = CommercialTranslationDicts()
+
+@functools.lru_cache(maxsize=None)
+def interpret_key_tuple(key_series):
+    """Convert a tuple of strings from the JSON database into codes.
+
+    Args:
+        key_series (tuple): A tuple of strings representing the
+            definition of a leaf node in the microsegments JSON data
+            structure (see 'json_interpreter').
+
+    Returns:
+        A tuple of the numbers and (sometimes) strings that are used
+        to extract data from the relevant files.
+    """
+    cd = translation_dicts
 
     # Separate handling for key_series for square footage data, where
     # key_series has only three entries, and complete microsegments,
@@ -184,7 +223,7 @@ def json_interpreter(key_series):
     else:
         # Create a copy of key_series that can be modified without
         # changing the original contents in key_series
-        keys = key_series.copy()
+        keys = list(key_series)
 
         # Since the JSON database is formatted with fuel type before
         # end use, switch the order of the end use and fuel type
@@ -215,7 +254,80 @@ def json_interpreter(key_series):
         # Interpret the MEL type specified and append to the list
         interpreted_values.append(cd.mels_techdict[keys[4]])
 
-    return interpreted_values
+    return tuple(interpreted_values)
+
+
+@functools.lru_cache(maxsize=None)
+def sd_tech_name(description):
+    """Obtain the technology name from a service demand data description.
+
+    The 'Description' field in KSDOUT gives the technology name
+    followed by scenario-specific text like '2003 installed base'; the
+    technology name is the text that appears before that year.
+
+    Args:
+        description (str): A 'Description' entry from KSDOUT.
+
+    Returns:
+        The technology name (str), or None for placeholder rows. The
+        name is cached for each unique description, such that each
+        description is interpreted only once.
+    """
+    # Identify the technology name using a regex set up to match any
+    # text '.+?' that appears before the first occurrence of one or
+    # more spaces followed by a 2 and three other numbers (i.e., 2009
+    # or 2035)
+    tech_name = re.search('.+?(?=\\s+2[0-9]{3})', description)
+
+    # If the regex matched, use the matching text, which describes the
+    # technology without scenario-specific text; else check to see if
+    # the description indicates a placeholder row, which should be
+    # excluded from the data; else check for a special case where the
+    # technology name is so long that the year number is partially
+    # truncated at the end of the string; implicitly, if the text
+    # does not match any regex, it is used as-is
+    if tech_name:
+        return tech_name.group(0)
+    elif 'placeholder' in description:
+        return None
+    else:
+        exc_tech_name = re.search('.+?(?=\\s+2[0-9]{1,2}$)', description)
+        if exc_tech_name:
+            return exc_tech_name.group(0)
+        else:
+            return description
+
+
+def tech_name_codes(descriptions, name_fn):
+    """Encode technology descriptions as integer technology codes.
+
+    Each unique description is converted into a technology name once
+    (rather than once for each row in which it appears), and each row
+    is then assigned the integer code of its technology name.
+
+    Args:
+        descriptions (numpy.ndarray): Technology descriptions, one for
+            each row of a data array.
+        name_fn (function): Function that converts a description into
+            a technology name, or None for rows that should be excluded.
+
+    Returns:
+        A numpy array of the technology code for each entry in
+        'descriptions', with -1 for excluded rows, and a list of the
+        technology names (in sorted order) indexed by those codes.
+    """
+    uniq_desc, desc_codes = np.unique(descriptions, return_inverse=True)
+    uniq_names = [name_fn(x) for x in uniq_desc.tolist()]
+
+    # Build the lookup table of technology names and convert the codes
+    # for the unique descriptions into the technology name codes
+    technames = sorted(set(x for x in uniq_names if x is not None))
+    name_codes = {name: idx for idx, name in enumerate(technames)}
+    uniq_codes = np.array(
+        [name_codes[x] if x is not None else -1 for x in uniq_names],
+        dtype=int)
+
+    return uniq_codes[desc_codes], technames
 
 
 def sd_mseg_percent(sd_array, sel, yrs):
@@ -228,16 +340,18 @@ def sd_mseg_percent(sd_array, sel, yrs):
     but rather using a regex search of the 'Description' field in the
     data, since the technology type numbers are sometimes used for
     multiple technologies, based on an inspection of the technology
-    description text (this is especially true with lighting). This
+    description text (this is especially true with lighting). Each
+    unique description is searched only once (see 'sd_tech_name'). This
     function is called for unique combinations of census divisions,
     building types, end uses, and fuel types, but only in the cases
     where the end use has available service demand data.
 
     Args:
-        sd_array (numpy.ndarray): Service demand data for commercial
-            building equipment, specified by technology, building
-            vintage, performance level, and the other microsegment
-            parameters that appear in 'sel'.
+        sd_array (numpy.ndarray or RowGroupIndex): Service demand
+            data for commercial building equipment, specified by
+            technology, building vintage, performance level, and the
+            other microsegment parameters that appear in 'sel', or an
+            index of those data on 'serv_index_cols'.
         sel (list): A list of integers that specifies the desired
             census division, building type, end use, and fuel type.
         yrs (list): A list of integers representing the range of years
@@ -255,80 +369,36 @@ def sd_mseg_percent(sd_array, sel, yrs):
 
     # Filter service demand data based on the specified census
     # division, building type, end use, and fuel type
-    filtered = sd_array[np.all([sd_array['r'] == sel[0],
-                                sd_array['b'] == sel[1],
-                                sd_array['s'] == sel[2],
-                                sd_array['f'] == sel[3]], axis=0)]
-
-    # Initialize list of rows to remove from 'filtered' based on a
-    # regex search of the 'Description' text
-    rows_to_remove = []
-
-    # Replace technology descriptions in the array 'filtered' with
-    # generalized names, removing any text describing the vintage or
-    # efficiency level and preparing to delete placeholder rows
-    # (placeholder rows are in the data as imported)
-    for idx, row in enumerate(filtered):
-
-        # Identify the technology name from the 'Description' column in
-        # the data using a regex set up to match any text '.+?' that
-        # appears before the first occurrence of one or more spaces
-        # followed by a 2 and three other numbers (i.e., 2009 or 2035)
-        tech_name = re.search('.+?(?=\s+2[0-9]{3})', row['Description'])
-
-        # Also check the special case where the technology name is so
-        # long that the year number is partially truncated at the end
-        # of the string
-        exc_tech_name = re.search('.+?(?=\s+2[0-9]{1,2}$)', row['Description'])
-
-        # If the regex matched, overwrite the original description with
-        # the matching text, which describes the technology without
-        # scenario-specific text like '2003 installed base'
-        if tech_name:
-            filtered['Description'][idx] = tech_name.group(0)
-        # Else check to see if the description indicates a placeholder
-        # row, which should be deleted before the technologies are
-        # summarized and returned from this function
-        elif re.search('placeholder', row['Description']):
-            rows_to_remove.append(idx)
-        # Else check for a special case where the year in the
-        # technology name sought by the tech_name regex didn't match
-        # because the year in the name is partially truncated at
-        # the end of the technology name string
-        elif exc_tech_name:
-            filtered['Description'][idx] = exc_tech_name.group(0)
-        # Implicitly, if the text does not match either regex, it
-        # is assumed that it does not need to be edited or removed
-
-    # Delete the placeholder rows from the filtered array
-    filtered = np.delete(filtered, rows_to_remove, 0)
-
-    # Because different technologies are sometimes coded with the same
+    filtered = eia_import.row_group_index(
+        sd_array, serv_index_cols).select(sel[:4])
+
+    # Convert the technology descriptions into integer codes based on
+    # the technology name in each description, which excludes any text
+    # describing the vintage or efficiency level, dropping placeholder
+    # rows (placeholder rows are in the data as imported); note that
+    # different technologies are sometimes coded with the same
     # technology type number (especially in lighting, where lighting
     # types are often differentiated by vintage and technology type
-    # numbers), technologies must be identified using the simplified
-    # names now recorded in the 'Description' field
-    technames = list(np.unique(filtered['Description']))
+    # numbers), so technologies must be identified using these names
+    tech_codes, technames = tech_name_codes(
+        filtered['Description'], sd_tech_name)
+    keep = tech_codes >= 0
 
     # Truncate the technology names to 43 characters to match the
-    # truncated strings used for the cost, performance, and lifetime data
-    trunc_technames = [entry[:43] for entry in technames]
-
-    # Set up numpy array to store restructured data, in which each row
-    # will correspond to a single technology
+    # truncated strings used for the cost, performance, and lifetime
+    # data, and obtain the code of the truncated name for each row
+    trunc_technames, trunc_codes = np.unique(
+        [entry[:43] for entry in technames], return_inverse=True)
+    trunc_technames = trunc_technames.tolist()
+    row_codes = trunc_codes[tech_codes[keep]].astype(int)
+
+    # Combine the data recorded for each unique technology by summing
+    # each year column over the rows for each technology, giving a
+    # numpy array in which each row corresponds to a single technology
     tval = np.zeros((len(trunc_technames), len(yrs)))
-
-    # Combine the data recorded for each unique technology
-    for idx, name in enumerate(trunc_technames):
-
-        # Extract entries for a given technology type number
-        entries = filtered[filtered['Description'] == name]
-
-        # Calculate the sum of all year columns and write it to the
-        # appropriate row in the tval array (note that the .view()
-        # function converts the structured array into a standard
-        # numpy array, which allows the use of the .sum() function)
-        tval[idx, ] = np.sum(entries[yrs].view(('<f8', len(yrs))), axis=0)
+    for idx, yr in enumerate(yrs):
+        tval[:, idx] = np.bincount(row_codes, weights=filtered[yr][keep],
+                                   minlength=len(trunc_technames))
 
     # If at least one entry in tval is non-zero (tval.any() == True),
     # suppress any divide by zero warnings and calculate the percentage
@@ -353,10 +423,11 @@ def catg_data_selector(db_array, sel, section_label, yrs):
     if applicable, end use/MEL type, and fuel type.
 
     Args:
-        db_array (numpy.ndarray): An array of commercial building data,
-            including total energy use by end use/fuel type and all
-            MELs types, new and surviving square footage, and other
-            parameters.
+        db_array (numpy.ndarray or RowGroupIndex): An array of
+            commercial building data, including total energy use by end
+            use/fuel type and all MELs types, new and surviving square
+            footage, and other parameters, or an index of those data
+            on 'catg_index_cols'.
         sel (list): A list of integers that specifies the desired
             census division, building type, end use, and fuel type.
         section_label (str): The name of the particular data to be extracted.
@@ -374,19 +445,16 @@ def catg_data_selector(db_array, sel, section_label, yrs):
     # division, building type, end use, and fuel type - unless the
     # section_label indicates square footage data, which are specified
     # by only census division and building type
+    db_index = eia_import.row_group_index(db_array, catg_index_cols)
     if 'SurvFloorTotal' in section_label or 'CMNewFloorSpace' in section_label:
-        filtered = db_array[np.all([db_array['Label'] == section_label,
-                                    db_array['Division'] == sel[0],
-                                    db_array['BldgType'] == sel[1]], axis=0)]
+        filtered = db_index.select([section_label] + list(sel[:2]))
     else:
-        filtered = db_array[np.all([db_array['Label'] == section_label,
-                                    db_array['Division'] == sel[0],
-                                    db_array['BldgType'] == sel[1],
-                                    db_array['EndUse'] == sel[2],
-                                    db_array['Fuel'] == sel[3]], axis=0)]
+        filtered = db_index.select([section_label] + list(sel[:4]))
 
-    # Adjust years reported based on the pivot year
-    filtered['Year'] = filtered['Year'] + UsefulVars().pivot_year
+    # Adjust years reported based on the pivot year (on a copy of the
+    # selected rows, leaving the indexed data unchanged)
+    filtered = filtered.copy()
+    filtered['Year'] = filtered['Year'] + UsefulVars.pivot_year
 
     # Further reduce the data by including only those years that are
     # common to all AEO data (based on the custom AEO metadata JSON)
@@ -421,17 +489,19 @@ def data_handler(db_array, sd_array, load_array, key_series, sd_end_uses, yrs):
     TBTU (10^12 BTU) to MMBTU (10^6 BTU.)
 
     Args:
-        db_array (numpy.ndarray): An array of commercial building data,
-            including total energy use by end use/fuel type and all
-            MELs types, new and surviving square footage, and other
-            parameters.
-        sd_array (numpy.ndarray): Service demand data for commercial
-            building equipment, given by technology and performance level.
-        load_array (numpy.ndarray): Thermal load components data
-            (i.e., energy exchange between buildings and their
-            surroundings through walls, foundations, etc.) for
-            commercial buildings, specified by census division,
-            building type, and heating/cooling season.
+        db_array (numpy.ndarray or RowGroupIndex): An array of
+            commercial building data, including total energy use by end
+            use/fuel type and all MELs types, new and surviving square
+            footage, and other parameters (or an index of those data).
+        sd_array (numpy.ndarray or RowGroupIndex): Service demand
+            data for commercial building equipment, given by technology
+            and performance level (or an index of those data).
+        load_array (numpy.ndarray or RowGroupIndex): Thermal load
+            components data (i.e., energy exchange between buildings
+            and their surroundings through walls, foundations, etc.)
+            for commercial buildings, specified by census division,
+            building type, and heating/cooling season (or an index of
+            those data).
         key_series (list): The set of strings that describe the
             current terminal node in the JSON database for which data
             should be generated.
@@ -478,11 +548,9 @@ def data_handler(db_array, sd_array, load_array, key_series, sd_end_uses, yrs):
         # and building type (note that in the case of these thermal
         # load microsegments, the final field in idx_series has the
         # text to select the correct thermal load component column)
-        tl_multiplier = load_array[np.all([
-            load_array['CDIV'] == idx_series[0],
-            load_array['BLDG'] == idx_series[1],
-            load_array['ENDUSE'] == idx_series[2]],
-                                 axis=0)][idx_series[-1]]
+        tl_multiplier = eia_import.row_group_index(
+            load_array, load_index_cols).select(
+                idx_series[:3])[idx_series[-1]]
         # N.B. tl_multiplier is a 1x1 numpy array
 
         # Multiply together the thermal load multiplier and energy use
@@ -586,7 +654,7 @@ def walk(db_array, sd_array, load_array, sd_end_uses, json_db,
         # so, finish constructing the key list for the current location
         # and obtain the data to update the dict
         else:
-            if key_list[1] in CommercialTranslationDicts().bldgtypedict.keys():
+            if key_list[1] in translation_dicts.bldgtypedict:
                 leaf_node_keys = key_list + [key]
 
                 # Extract data from original data sources
@@ -691,6 +759,7 @@ def data_import(data_file_path, dtype_list, delim_char=',', hl=None, cols=[]):
     file. If specified, skip lines at the beginning of the file, for the
     case where informational content appears there instead. Also support
     capture of only the specified columns from the original data file.
+    The file is read in a single pass (see 'eia_import').
 
     Args:
         data_file_path (str): The full path to the data file to be imported.
@@ -709,71 +778,36 @@ def data_import(data_file_path, dtype_list, delim_char=',', hl=None, cols=[]):
         columns specified by dtype_list.
     """
 
-    # Open the target CSV formatted data file
-    with open(data_file_path) as thefile:
+    # Read the rows of the data file (with any NULL characters removed)
+    filecont = eia_import.text_rows(data_file_path, delim_char)
 
-        # This use of csv.reader assumes that the default setting of
-        # quotechar '"' is appropriate; the skipinitialspace option
-        # ensures proper reading of double-quoted text strings in the
-        # AEO data that have the delimiter inside them (e.g., cooking
-        # equipment descriptions); the loop which csv.reader is called
-        # is used to detect NULL characters and act appropriately (by
-        # removing them prior to converting to a csv.reader object)
-        # if they are encountered
-        if '\0' in open(data_file_path).read():  # NULL bytes detected
-            filecont = csv.reader((x.replace('\0', '') for x in thefile),
-                                  delimiter=delim_char, skipinitialspace=True)
-        else:  # No NULL bytes, proceed normally
-            filecont = csv.reader(thefile,
-                                  delimiter=delim_char, skipinitialspace=True)
-
-        # Create list to be populated with tuples of each row of data
-        # from the data file
-        data = []
-
-        # Skip first line of the file
-        next(filecont)
-
-        # If a number of header lines to skip (variable 'hl') is
-        # specified, skip those lines, plus one to accommodate
-        # the empty line between the header line and the first
-        # row of data in the ktek file (which is the intended
-        # target for these lines of code).
-        if hl:
-            for i in range(0, hl+1):
-                next(filecont)
+    # Skip first line of the file
+    next(filecont)
 
-        # Import the data, skipping lines that are not the correct length
-        for row in filecont:
-            if len(tuple(row)) == len(dtype_list):
-                data.append(tuple(row))
-            # If there are specific columns of interest specified, select
-            # only those columns from the row of data and append the result
-            elif cols:
-                shorter = [row[i] for i in cols]
-                data.append(tuple(shorter))
-
-        # Convert data into numpy structured array, using the
-        # try/catch in the case where the data include the string 'NA',
-        # which has to be changed to an 'nan' to be able to be coerced
-        # to a float or integer by np.array
-        try:
-            final_struct = np.array(data, dtype=dtype_list)
-        # Targeted error "ValueError: could not convert string to float: 'NA'"
-        except ValueError:
-            for i, row in enumerate(data):
-                row = list(row)  # Make row mutable
-                for k, entry in enumerate(row):
-                    # Replace 'NA' with 'nan'
-                    if entry == 'NA':
-                        row[k] = 'nan'
-                # Overwrite existing tuple with new tuple
-                data[i] = tuple(row)
-            # With the 'NA' strings replaced, create the numpy array as
-            # originally desired
-            final_struct = np.array(data, dtype=dtype_list)
-
-        return final_struct
+    # If a number of header lines to skip (variable 'hl') is
+    # specified, skip those lines, plus one to accommodate
+    # the empty line between the header line and the first
+    # row of data in the ktek file (which is the intended
+    # target for these lines of code).
+    if hl:
+        for i in range(0, hl+1):
+            next(filecont)
+
+    # Import the data, skipping lines that are not the correct length;
+    # if there are specific columns of interest specified, select only
+    # those columns from each row (skipping lines that are too short to
+    # include all of those columns)
+    if cols:
+        rows = (row for row in filecont if len(row) > max(cols))
+    else:
+        rows = (row for row in filecont if len(row) == len(dtype_list))
+
+    # Convert data into numpy structured array, converting the string
+    # 'NA' in the data to 'nan' to be able to be coerced to a float
+    final_struct = eia_import.rows_to_array(
+        rows, dtype_list, usecols=cols or None, na_values=['NA'])
+
+    return final_struct
 
 
 def str_cleaner(data_array, column_name):
@@ -868,17 +902,20 @@ def main():
 
     # Import EIA AEO 'KSDOUT' service demand file
     serv_dtypes = dtype_array(eiadata.serv_dmd)
-    serv_data = data_import(eiadata.serv_dmd, serv_dtypes)
+    serv_data = eia_import.cached_import(
+        data_import, eiadata.serv_dmd, serv_dtypes)
     serv_data = str_cleaner(serv_data, 'Description')
 
     # Import EIA AEO 'KDBOUT' additional data file
     catg_dtypes = dtype_array(eiadata.catg_dmd)
-    catg_data = data_import(eiadata.catg_dmd, catg_dtypes)
+    catg_data = eia_import.cached_import(
+        data_import, eiadata.catg_dmd, catg_dtypes)
     catg_data = str_cleaner(catg_data, 'Label')
 
     # Import thermal loads data
     load_dtypes = dtype_array(handyvars.com_tloads, '\t')
-    load_data = data_import(handyvars.com_tloads, load_dtypes, '\t')
+    load_data = eia_import.cached_import(
+        data_import, handyvars.com_tloads, load_dtypes, '\t')
 
     # Not all end uses are broken down by equipment type and vintage in
     # KSDOUT; determine which end uses are present so that the service
@@ -886,6 +923,14 @@ def main():
     # available for a particular end use
     serv_data_end_uses = np.unique(serv_data['s'])
 
+    # Index each of the imported data arrays on the columns used to
+    # select data for each leaf node in the microsegments JSON, such
+    # that the data for a leaf node are found without scanning the
+    # entire array
+    catg_index = eia_import.RowGroupIndex(catg_data, catg_index_cols)
+    serv_index = eia_import.RowGroupIndex(serv_data, serv_index_cols)
+    load_index = eia_import.RowGroupIndex(load_data, load_index_cols)
+
     # Import metadata generated based on EIA AEO data files
     with open(handyvars.aeo_metadata, 'r') as metadata:
         metajson = json.load(metadata)
@@ -900,7 +945,7 @@ def main():
             msjson = json.load(jsi)
 
             # Proceed recursively through database structure
-            result = walk(catg_data, serv_data, load_data,
+            result = walk(catg_index, serv_index, load_index,
                           serv_data_end_uses, msjson, years)
 
             # Write the updated dict of data to a new JSON file
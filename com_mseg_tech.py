@@ -3,13 +3,14 @@
 # Import commercial microsegments code to use some of its data
 # reading and processing functions
 import com_mseg as cm
+import eia_import
 
 import numpy as np
 import numpy.lib.recfunctions as recfn
 import re
+import functools
 import warnings
 import json
-import csv
 
 
 class EIAData(object):
@@ -164,33 +165,26 @@ def sd_data_selector(sd_data, sel, years):
 
     # Filter service demand data based on the specified census
     # division, building type, end use, and fuel type
-    filtered = sd_data[np.all([sd_data['r'] == sel[0],
-                               sd_data['b'] == sel[1],
-                               sd_data['s'] == sel[2],
-                               sd_data['f'] == sel[3]], axis=0)]
+    filtered = eia_import.row_group_index(
+        sd_data, cm.serv_index_cols).select(sel[:4])
 
     # Identify each technology and performance level using the text
     # in the description field since the technology type and vintage
     # numeric codes are not well-matched to individual technology and
-    # performance levels
-    technames = list(np.unique(filtered['Description']))
-
-    # Set up numpy array to store restructured data, in which each row
-    # will correspond to a single technology
+    # performance levels, and obtain the position of each row's
+    # technology name in the list of names
+    technames, name_codes = np.unique(filtered['Description'],
+                                      return_inverse=True)
+    technames = technames.tolist()
+
+    # Combine the service demand for the three markets ['d'] in the
+    # data by summing each year column over the rows for each
+    # technology, giving an array in which each row corresponds to a
+    # single technology
     sd = np.zeros((len(technames), len(years)))
-
-    # Combine the service demand for the three markets ['d'] in the data
-    for idx, name in enumerate(technames):
-
-        # Extract entries for a given technology name
-        entries = filtered[filtered['Description'] == name]
-
-        # Calculate the sum of all year columns and write it to the
-        # appropriate row in the sd array (note that the .view()
-        # function converts the structured array into a standard
-        # numpy array, which allows the use of the .sum() function)
-        sd[idx, ] = np.sum(
-            entries[list(map(str, years))].view(('<f8', len(years))), axis=0)
+    for idx, yr in enumerate(years):
+        sd[:, idx] = np.bincount(name_codes, weights=filtered[str(yr)],
+                                 minlength=len(technames))
 
     # Note that each row in sd corresponds to a single performance
     # level for a single technology and the rows are in the same order
@@ -198,6 +192,36 @@ def sd_data_selector(sd_data, sel, years):
     return sd, technames
 
 
+@functools.lru_cache(maxsize=None)
+def ktek_tech_name(name):
+    """Obtain the technology name from a technology characteristics name.
+
+    Args:
+        name (str): A 'technology name' entry from the EIA technology
+            characteristics data, which might include scenario-specific
+            details like "2020 high" or "2009 installed base".
+
+    Returns:
+        The technology name (str) without scenario-specific details, or
+        None for placeholder rows. The name is cached for each unique
+        entry, such that each entry is interpreted only once.
+    """
+    # Identify the technology name using a regex set up to match any
+    # text '.+?' that appears before the first occurrence of a space
+    # followed by a 2 and three other numbers (e.g., 2009 or 2035)
+    tech_name = re.search('.+?(?=\\s2[0-9]{3})', name)
+
+    # If the regex matched, use the matching text; else, if the
+    # technology name is not from a placeholder row, use the entire
+    # name text (the technology might not have a year in its name)
+    if tech_name:
+        return tech_name.group(0)
+    elif 'placeholder' in name:
+        return None
+    else:
+        return name
+
+
 def single_tech_selector(tech_array, specific_name):
     """Extracts a single technology from tech data for an entire microsegment.
 
@@ -221,39 +245,16 @@ def single_tech_selector(tech_array, specific_name):
         indicated by specific_name.
     """
 
-    # Initialize a list of rows to remove from the numpy array
-    # that do not correspond to the specified technology
-    rows_to_remove = []
-
-    for idx, row in enumerate(tech_array):
-        # Identify the technology name from the 'technology name' column
-        # in the data using a regex set up to match any text '.+?' that
-        # appears before the first occurrence of a space followed by a
-        # 2 and three other numbers (i.e., 2009 or 2035)
-        tech_name = re.search('.+?(?=\s2[0-9]{3})', row['technology name'])
-
-        # If the regex returned a match, and the first group of the
-        # match (i.e., the part before the numeric year) is not the
-        # the same as the name passed to the function, remove the row
-        if tech_name:
-            if tech_name.group(0) != specific_name:
-                rows_to_remove.append(idx)
-        # If there's no match, the technology might not have a year
-        # included as part of its name, but it nonetheless should be
-        # checked to see if it matches the name passed to the function
-        # and removed if there is not a match
-        elif row['technology name'] != specific_name:
-            rows_to_remove.append(idx)
-        # Else check to see if the description indicates a placeholder
-        # row, which should be deleted before the technologies are
-        # summarized and returned from this function
-        elif re.search('placeholder', row['technology name']):
-            rows_to_remove.append(idx)
-        # Implicitly, if the text does not match any regex, it is
-        # assumed that it does not need to be edited or removed
-
-    # Delete the placeholder rows
-    result = np.delete(tech_array, rows_to_remove, 0)
+    # Convert the technology names into integer codes based on the
+    # technology name without scenario-specific text (see
+    # 'ktek_tech_name') and keep only the rows for the technology
+    # specified, excluding placeholder rows
+    tech_codes, technames = cm.tech_name_codes(
+        tech_array['technology name'], ktek_tech_name)
+    if specific_name in technames:
+        result = tech_array[tech_codes == technames.index(specific_name)]
+    else:
+        result = tech_array[np.zeros(len(tech_array), dtype=bool)]
 
     return result
 
@@ -524,31 +525,123 @@ def tech_names_extractor(tech_array):
         details like "2020 high" or "2009 installed base".
     """
 
-    # Create empty list to be populated with technology names
-    technames = []
-
-    for row in tech_array:
-        # Identify the technology name from the 'technology name' column
-        # in the data using a regex set up to match any text '.+?' that
-        # appears before the first occurrence of a space followed by a
-        # 2 and three other numbers (e.g., 2009 or 2035)
-        tech_name = re.search('.+?(?=\s2[0-9]{3})', row['technology name'])
-
-        # If the regex matched, add the matching text, which describes
-        # the technology without scenario-specific text like '2003
-        # installed base', to the technames list
-        if tech_name:
-            technames.append(tech_name.group(0))
-        # Else, if the technology name is not from a placeholder row,
-        # add the entire name text to the technames list
+    # Obtain the unique technology names, excluding placeholder rows,
+    # from the lookup table of technology names for the rows in the data
+    technames = cm.tech_name_codes(
+        tech_array['technology name'], ktek_tech_name)[1]
+
+    return technames
+
+
+class TechnologyTable(object):
+    """Index the EIA technology data by microsegment and technology name.
+
+    The technology data are sorted once on the columns used to select
+    the data for a microsegment (see 'tech_data_selector') and on the
+    technology name (see 'ktek_tech_name'), such that the names of the
+    technologies in a microsegment and the data for each technology can
+    be found by dict look-up instead of scanning all of the data for
+    each microsegment.
+
+    Attributes:
+        data (numpy.ndarray): The technology data, sorted on the 'r',
+            's', and 'f' columns and technology name (stable, such that
+            the rows for each technology are in their original order),
+            excluding placeholder rows.
+        techs (dict): For each ('r', 's', 'f') combination in the data,
+            a dict of the (start, stop) positions in 'data' of the rows
+            for each technology, keyed by technology name.
+    """
+
+    def __init__(self, tech_data):
+        # Convert the technology names into integer codes, dropping the
+        # placeholder rows, and sort the rows on the selection columns
+        # and the technology name codes
+        tech_codes, technames = cm.tech_name_codes(
+            tech_data['technology name'], ktek_tech_name)
+        keep = np.flatnonzero(tech_codes >= 0)
+        tech_codes = tech_codes[keep]
+        order = np.lexsort([tech_codes, tech_data['f'][keep],
+                            tech_data['s'][keep], tech_data['r'][keep]])
+        self.data = tech_data[keep[order]]
+        tech_codes = tech_codes[order]
+
+        # Find the rows for each technology in each microsegment (each
+        # run of rows with the same selection column values and code)
+        n_rows = len(self.data)
+        new_group = np.ones(n_rows, dtype=bool)
+        new_group[1:] = np.any([
+            self.data['r'][1:] != self.data['r'][:-1],
+            self.data['s'][1:] != self.data['s'][:-1],
+            self.data['f'][1:] != self.data['f'][:-1],
+            tech_codes[1:] != tech_codes[:-1]], axis=0)
+        starts = np.flatnonzero(new_group)
+        stops = np.append(starts[1:], n_rows)
+        self.techs = {}
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            key = (self.data['r'][start].item(), self.data['s'][start].item(),
+                   self.data['f'][start].item())
+            self.techs.setdefault(key, {})[
+                technames[tech_codes[start]]] = (start, stop)
+
+    def key(self, sel):
+        """Convert a microsegment into the selection column values.
+
+        Args:
+            sel (list): A list of integers indicating the microsegment.
+
+        Returns:
+            A tuple of the 'r', 's', and 'f' values for the microsegment.
+        """
+        # Data are given by building type for ventilation, lighting,
+        # and refrigeration, and by census division otherwise
+        if sel[2] in [4, 6, 7]:
+            return (sel[1], sel[2], sel[3])
         else:
-            if not re.search('placeholder', row['technology name']):
-                technames.append(row['technology name'])
+            return (sel[0], sel[2], sel[3])
 
-    # Reduce the list to only the unique entries
-    technames = list(np.unique(technames))
+    def tech_names(self, sel):
+        """Obtain the names of the technologies in a microsegment.
 
-    return technames
+        Args:
+            sel (list): A list of integers indicating the microsegment.
+
+        Returns:
+            A sorted list of the technology names in the microsegment,
+            as given by 'tech_names_extractor'.
+        """
+        return sorted(self.techs.get(self.key(sel), {}).keys())
+
+    def single_tech(self, sel, specific_name):
+        """Obtain the data for a single technology in a microsegment.
+
+        Args:
+            sel (list): A list of integers indicating the microsegment.
+            specific_name (str): The name of the technology.
+
+        Returns:
+            A numpy structured array of the rows for the technology in
+            the microsegment, as given by 'single_tech_selector'.
+        """
+        start, stop = self.techs.get(self.key(sel), {}).get(
+            specific_name, (0, 0))
+        return self.data[start:stop]
+
+
+def technology_table(tech_data):
+    """Obtain an index of the technology data, building it if needed.
+
+    Args:
+        tech_data (numpy.ndarray or TechnologyTable): The EIA technology
+            data or an existing index of the technology data.
+
+    Returns:
+        A TechnologyTable of the technology data.
+    """
+    if isinstance(tech_data, TechnologyTable):
+        return tech_data
+    else:
+        return TechnologyTable(tech_data)
 
 
 def cost_conversion_factor(sf_data, sd_data, sel, years):
@@ -562,11 +655,13 @@ def cost_conversion_factor(sf_data, sd_data, sel, years):
     cost data for each year for a given microsegment.
 
     Args:
-        sf_data (numpy.ndarray): Imported EIA data including square
-            footage data as a function of census division and
-            building type. (Includes the full data file contents.)
-        sd_data (numpy.ndarray): Imported EIA service demand data specified
-            over the same efficiency levels for each technology.
+        sf_data (numpy.ndarray or RowGroupIndex): Imported EIA data
+            including square footage data as a function of census
+            division and building type (includes the full data file
+            contents), or an index of those data (see com_mseg).
+        sd_data (numpy.ndarray or RowGroupIndex): Imported EIA service
+            demand data specified over the same efficiency levels for
+            each technology (or an index of those data, see com_mseg).
         tpp_data (numpy.ndarray): A numpy structured array of the
             EIA commercial market time preference premium data.
         sel (list): A list of integers indicating the microsegment.
@@ -601,16 +696,14 @@ def cost_conversion_factor(sf_data, sd_data, sel, years):
 
     # Extract the service demand data applicable to the specified
     # census division, building type, and end use
-    sd_cut = sd_data[np.all([sd_data['r'] == sel[0],
-                             sd_data['b'] == sel[1],
-                             sd_data['s'] == sel[2]], axis=0)]
+    sd_cut = eia_import.row_group_index(
+        sd_data, cm.serv_index_cols).select(sel[:3])
 
     # In the service demand data, each year of data is represented by
     # a separate column; obtain the total service demand for each year
     # in the list of years provided by summing the columns of the
     # reduced service demand array
-    sd = np.sum(
-            sd_cut[list(map(str, years))].view(('<f8', len(years))), axis=0)
+    sd = np.array([np.sum(sd_cut[str(yr)]) for yr in years])
 
     # For end uses other than lighting and ventilation, service demand
     # is given as 1e12 BTU, which requires dividing by 1e3 to get the
@@ -661,9 +754,9 @@ def tpp_handler(tpp_data, sel, years):
     # be a problem
     end_use_num = sel[2]
     end_use_dict_loc = list(
-        cm.CommercialTranslationDicts().endusedict.values()).index(end_use_num)
+        cm.translation_dicts.endusedict.values()).index(end_use_num)
     end_use_json_str = list(
-        cm.CommercialTranslationDicts().endusedict.keys())[end_use_dict_loc]
+        cm.translation_dicts.endusedict.keys())[end_use_dict_loc]
     end_use_kprem_string = UsefulDicts().kprem_endusedict[end_use_json_str]
 
     # Obtain the time preference data associated with the end use
@@ -721,16 +814,19 @@ def mseg_technology_handler(tech_data, sd_data, tpp_data, sf_data, sel, years):
     electronics, and "other").
 
     Args:
-        tech_data (numpy.ndarray): Imported EIA technology characteristics
-            data, with multiple efficiency levels for each technology,
-            including technology cost, performance, and service lifetime.
-        sd_data (numpy.ndarray): Imported EIA service demand data specified
-            over the same efficiency levels for each technology.
+        tech_data (numpy.ndarray or TechnologyTable): Imported EIA
+            technology characteristics data, with multiple efficiency
+            levels for each technology, including technology cost,
+            performance, and service lifetime (or an index of those data).
+        sd_data (numpy.ndarray or RowGroupIndex): Imported EIA service
+            demand data specified over the same efficiency levels for
+            each technology (or an index of those data, see com_mseg).
         tpp_data (numpy.ndarray): A numpy structured array of the
             EIA commercial market time preference premium data.
-        sf_data (numpy.ndarray): Imported EIA data including square
-            footage data as a function of census division and
-            building type. (Includes the full data file contents.)
+        sf_data (numpy.ndarray or RowGroupIndex): Imported EIA data
+            including square footage data as a function of census
+            division and building type (includes the full data file
+            contents), or an index of those data (see com_mseg).
         sel (list): A list of integers indicating the microsegment.
         years (list): A list of integers representing the range of years
             in the data, precalculated for speed.
@@ -747,9 +843,10 @@ def mseg_technology_handler(tech_data, sd_data, tpp_data, sf_data, sel, years):
     # Instantiate a master dict for this microsegment
     complete_mseg_tech_data = {}
 
-    # From the imported EIA data, extract the technology and service
-    # demand data for the microsegment identified by 'sel'
-    filtered_tech_data = tech_data_selector(tech_data, sel)
+    # From the imported EIA data, obtain the index of the technology
+    # data and extract the service demand data for the microsegment
+    # identified by 'sel'
+    tech_table = technology_table(tech_data)
     (filtered_sd_data, sd_names_list) = sd_data_selector(sd_data, sel, years)
 
     # Use the 'units_id' function to extract the performance units for
@@ -763,7 +860,7 @@ def mseg_technology_handler(tech_data, sd_data, tpp_data, sf_data, sel, years):
 
     # Identify the names (as strings) of all of the technologies
     # included in this microsegment
-    tech_names_list = tech_names_extractor(filtered_tech_data)
+    tech_names_list = tech_table.tech_names(sel)
 
     # Preallocate a list of non-matching technology names for this microsegment
     mseg_non_matching_names = []
@@ -775,7 +872,7 @@ def mseg_technology_handler(tech_data, sd_data, tpp_data, sf_data, sel, years):
     for tech in tech_names_list:
         # Extract the cost, performance, and lifetime data specific
         # to a single technology, given by 'tech'
-        single_tech_data = single_tech_selector(filtered_tech_data, tech)
+        single_tech_data = tech_table.single_tech(sel, tech)
 
         # Extract the cost data in a dict format with 'typical' and
         # 'best' cost cases
@@ -855,18 +952,21 @@ def walk(tech_data, serv_data, tpp_data, db_data, years, json_db,
     that function and calling json_interpreter within the function.
 
     Args:
-        tech_data (numpy.ndarray): A numpy structured array of the
-            EIA technology data, including the cost, performance,
-            and lifetime of individual technologies.
-        serv_data (numpy.ndarray): A numpy structured array of the
-            EIA service demand data.
+        tech_data (numpy.ndarray or TechnologyTable): A numpy structured
+            array of the EIA technology data, including the cost,
+            performance, and lifetime of individual technologies, or an
+            index of those data.
+        serv_data (numpy.ndarray or RowGroupIndex): A numpy structured
+            array of the EIA service demand data, or an index of those
+            data on 'serv_index_cols' (see com_mseg).
         tpp_data (numpy.ndarray): A numpy structured array of the
             EIA commercial market time preference premium data.
-        db_data (numpy.ndarray): An array of commercial building data,
-            including total energy use by end use/fuel type and all
-            MELs types, new and surviving square footage, and other
-            parameters. Square footage data are specified as a
-            function of census division and building type.
+        db_data (numpy.ndarray or RowGroupIndex): An array of
+            commercial building data, including total energy use by end
+            use/fuel type and all MELs types, new and surviving square
+            footage, and other parameters, or an index of those data on
+            'catg_index_cols' (see com_mseg). Square footage data are
+            specified as a function of census division and building type.
         years (list): A list of the years (YYYY) of data to be converted.
         json_db (dict): The nested dict structure of the empty or
             partially complete database to be populated with new data.
@@ -897,7 +997,7 @@ def walk(tech_data, serv_data, tpp_data, db_data, years, json_db,
         # list for the current location and obtain the data to update
         # the dict
         else:
-            cd = cm.CommercialTranslationDicts()  # Shortens if statement below
+            cd = cm.translation_dicts  # Shortens if statement below
             if key_list[1] in cd.bldgtypedict.keys() and len(key_list) > 2:
                 leaf_node_keys = key_list + [key]
 
@@ -947,36 +1047,33 @@ def kprem_import(data_file_path, dtype_list, hl):
         columns specified by dtype_list.
     """
 
-    # Open the target CSV formatted data file
-    with open(data_file_path) as thefile:
-        # Open the file contents as a csv reader object
-        filecont = csv.reader(thefile, delimiter='\t')
-
-        # Create list to be populated with tuples for each row of data
-        # from the data file
-        data = []
+    # Read the rows of the data file as a csv reader object
+    filecont = eia_import.text_rows(data_file_path, '\t',
+                                    skipinitialspace=False)
 
-        # Skip the specified number of header lines in the file
-        for i in range(0, hl):
-            next(filecont)
+    # Skip the specified number of header lines in the file
+    for i in range(0, hl):
+        next(filecont)
 
-        # Record data type length for later repeated reference
-        dtypelen = len(dtype_list)
+    # Record data type length for later repeated reference
+    dtypelen = len(dtype_list)
 
-        # Import the data, reconstructing the line if it is missing data
+    def data_rows():
+        """Reconstruct the rows of the data that are missing data."""
+        prev_row = None
         for row in filecont:
-            rowlen = len(tuple(row))  # Record current row length
+            rowlen = len(row)  # Record current row length
 
             # If the current row and the data type lengths match,
-            # append the data to the list
+            # use the row as-is
             if rowlen == dtypelen:
-                data.append(tuple(row))
+                prev_row = row
 
             # If the length of the current row is greater than zero but
             # less than the length of the dtype, and is not an empty
             # row (which appears as a list with two empty strings when
             # imported), use the missing columns from the previous row
-            # to complete the row entry and append to the data list
+            # to complete the row entry
             elif rowlen > 0 and rowlen < dtypelen and row != ['', '']:
                 # Determine the number of missing columns of data
                 diff = dtypelen - rowlen
@@ -984,15 +1081,17 @@ def kprem_import(data_file_path, dtype_list, hl):
                 # Construct this line by appending (making a flat list
                 # using extend instead of append) any missing columns
                 # from the previous line
-                row.extend(list(data[len(data)-1][diff:]))
+                row.extend(prev_row[diff:])
+                prev_row = row
+            else:
+                continue
 
-                # Append constructed line, as a tuple, to the data
-                data.append(tuple(row))
+            yield row
 
-        # Convert data into numpy structured array
-        final_struct = np.array(data, dtype=dtype_list)
+    # Convert data into numpy structured array
+    final_struct = eia_import.rows_to_array(data_rows(), dtype_list)
 
-        return final_struct
+    return final_struct
 
 
 def dtype_reducer(the_dtype, wanted_cols):
@@ -1075,23 +1174,34 @@ def main():
     col_indices, tech_dtypes = dtype_reducer(tech_dtypes,
                                              handyvars.columns_to_keep)
     tech_dtypes[8] = ('Life', 'f8')  # Manual correction of lifetime data type
-    tech_data = cm.data_import(eiadata.cpl_data, tech_dtypes, ',',
-                               handyvars.cpl_data_skip_lines, col_indices)
+    tech_data = eia_import.cached_import(
+        cm.data_import, eiadata.cpl_data, tech_dtypes, ',',
+        handyvars.cpl_data_skip_lines, col_indices)
     tech_data = cm.str_cleaner(tech_data, 'technology name')
 
     # Import EIA AEO 'KSDOUT' service demand data
     serv_dtypes = cm.dtype_array(cm.EIAData().serv_dmd)
-    serv_data = cm.data_import(cm.EIAData().serv_dmd, serv_dtypes)
+    serv_data = eia_import.cached_import(
+        cm.data_import, cm.EIAData().serv_dmd, serv_dtypes)
     serv_data = cm.str_cleaner(serv_data, 'Description')
 
     # Import EIA AEO 'KDBOUT' additional data file
     catg_dtypes = cm.dtype_array(cm.EIAData().catg_dmd)
-    catg_data = cm.data_import(cm.EIAData().catg_dmd, catg_dtypes)
+    catg_data = eia_import.cached_import(
+        cm.data_import, cm.EIAData().catg_dmd, catg_dtypes)
     catg_data = cm.str_cleaner(catg_data, 'Label')
 
     # Import EIA AEO 'kprem' time preference premium data
-    tpp_data = kprem_import(eiadata.tpp_data, handyvars.tpp_dtypes,
-                            handyvars.tpp_data_skip_lines)
+    tpp_data = eia_import.cached_import(
+        kprem_import, eiadata.tpp_data, handyvars.tpp_dtypes,
+        handyvars.tpp_data_skip_lines)
+
+    # Index the technology, service demand, and square footage data
+    # such that the data for each microsegment are found by look-up
+    # rather than by scanning all of the data for every microsegment
+    tech_table = TechnologyTable(tech_data)
+    serv_index = eia_import.RowGroupIndex(serv_data, cm.serv_index_cols)
+    catg_index = eia_import.RowGroupIndex(catg_data, cm.catg_index_cols)
 
     # Import metadata generated based on EIA AEO data files
     with open(handyvars.aeo_metadata, 'r') as metadata:
@@ -1107,8 +1217,8 @@ def main():
             msjson = json.load(jsi)
 
             # Proceed recursively through database structure
-            result, nmtn = walk(tech_data, serv_data, tpp_data, catg_data,
-                                years, msjson)
+            result, nmtn = walk(tech_table, serv_index, tpp_data,
+                                catg_index, years, msjson)
 
             # Print warning message to the standard out with a unique
             # (i.e., non-repeating) list of technologies that didn't have
@@ -2,6 +2,8 @@
 
 # Import code to be tested
 import com_mseg_tech as cmt
+import com_mseg as cm
+import eia_import
 
 # Import packages
 import unittest
@@ -3994,6 +3996,38 @@ class TechnologyNameListExtractorTest(CommonUnitTest):
                 self.tech_names[idx])
 
 
+class TechnologyTableTest(CommonUnitTest):
+    """ Test the index of the technology data that is used to obtain
+    the technology names and the data for each technology for a
+    microsegment without selecting the data for the microsegment """
+
+    @classmethod
+    def setUpClass(self):
+        self.tech_table = cmt.TechnologyTable(self.tech_data)
+
+    # Test that the names of the technologies in each microsegment
+    # match those found in the data selected for the microsegment
+    def test_technology_names_from_index(self):
+        for idx, sel in enumerate(self.data_to_select):
+            self.assertEqual(
+                self.tech_table.tech_names(sel),
+                cmt.tech_names_extractor(self.selected_tech_data[idx]))
+
+    # Test that the data for a single technology match those selected
+    # from the data for the microsegment, and that no data are found
+    # for technologies not in the microsegment
+    def test_single_technology_from_index(self):
+        for idx, sel in enumerate(self.data_to_select):
+            np.testing.assert_array_equal(
+                self.tech_table.single_tech(sel, self.tmp_names[idx]),
+                self.reduced_tech_data[idx])
+            self.assertEqual(
+                len(self.tech_table.single_tech(sel, 'Not A Technology')),
+                0)
+        self.assertIs(cmt.technology_table(self.tech_table),
+                      self.tech_table)
+
+
 class TechnologyDataHandlerTest(CommonUnitTest):
     """ Test the combined performance of several functions within a
     single overarching function that produces a formatted dict of
@@ -4021,6 +4055,26 @@ class TechnologyDataHandlerTest(CommonUnitTest):
                 self.tmp_yrs)
             self.dict_check(mseg_dict, self.tech_master_dict[idx])
 
+    # Test that the same dicts are generated from the indexed data
+    def test_conversion_of_indexed_data_to_restructured_dict(self):
+        tech_table = cmt.TechnologyTable(self.tech_data)
+        sd_index = eia_import.RowGroupIndex(self.sd_data, cm.serv_index_cols)
+        db_index = eia_import.RowGroupIndex(self.db_data, cm.catg_index_cols)
+        unique_data_to_select = []
+        for an_mseg in self.data_to_select:
+            if an_mseg not in unique_data_to_select:
+                unique_data_to_select.append(an_mseg)
+
+        for idx, selected in enumerate(unique_data_to_select):
+            mseg_dict, non_matched_names = cmt.mseg_technology_handler(
+                tech_table,
+                sd_index,
+                self.prem_data,
+                db_index,
+                selected,
+                self.tmp_yrs)
+            self.dict_check(mseg_dict, self.tech_master_dict[idx])
+
 
 class ChoiceModelParametersExtractionTest(CommonUnitTest):
     """ Test the successful extraction of the time preference premiums
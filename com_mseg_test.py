@@ -4,6 +4,7 @@
 
 # Import code to be tested
 import com_mseg as cm
+import eia_import
 
 # Import needed packages
 import unittest
@@ -874,6 +875,37 @@ class JSONInterpretationTest(CommonUnitTest):
             with self.assertRaises(KeyError):
                 cm.json_interpreter(a_key_list)
 
+    # Test that modifying the converted keys returned does not change
+    # the conversion of the same keys in subsequent calls
+    def test_repeated_key_conversion(self):
+        for idx, a_key_list in enumerate(self.sample_keys):
+            converted = cm.json_interpreter(a_key_list)
+            converted[0] = 'modified'
+            self.assertEqual(cm.json_interpreter(a_key_list),
+                             self.sample_keys_converted[idx])
+
+
+class TechnologyNameCodingTest(unittest.TestCase):
+    """ Test the conversion of service demand technology descriptions
+    into integer codes for the technology names in the descriptions """
+
+    # Test that descriptions with scenario-specific text are coded as
+    # the same technology and placeholder rows are excluded
+    def test_technology_name_codes(self):
+        descriptions = np.array([
+            'rooftop_AC 2013 current standard',
+            'comm_GSHP-heat 2003 installed base',
+            'rooftop_AC 2020 high',
+            'res_type_gasHP-heat placeholder to reconcile',
+            'Commercial Refrigerated Vending Machines 201',
+            'comm_GSHP-heat 2003 installed base'])
+        codes, technames = cm.tech_name_codes(descriptions,
+                                              cm.sd_tech_name)
+        self.assertEqual(technames, [
+            'Commercial Refrigerated Vending Machines', 'comm_GSHP-heat',
+            'rooftop_AC'])
+        np.testing.assert_array_equal(codes, [2, 1, 2, -1, 0, 1])
+
 
 class PercentageCalculationTest(CommonUnitTest):
     """ Test function that converts service demand data from the EIA
@@ -955,6 +987,40 @@ class CommercialDataSelectionTest(CommonUnitTest):
                                       self.years),
                 self.expected_selection[idx])
 
+    # Test selection from a pre-built index of the data array
+    def test_data_selection_from_index(self):
+        db_index = eia_import.RowGroupIndex(self.sample_db_array,
+                                            cm.catg_index_cols)
+        for idx, the_keys in enumerate(self.sample_keys):
+
+            catg_code = self.sample_keys_converted[idx]
+
+            # Select the data for the same cases as in the previous test
+            if self.MEL_status[idx]:
+                label_str = 'MiscElConsump'
+                select_indices = [catg_code[0], catg_code[1], catg_code[4],
+                                  catg_code[3], catg_code[4]]
+            elif 'new square footage' in the_keys:
+                label_str = 'CMNewFloorSpace'
+                select_indices = catg_code
+            elif 'total square footage' in the_keys:
+                label_str = 'SurvFloorTotal'
+                select_indices = catg_code
+            else:
+                label_str = 'EndUseConsump'
+                select_indices = catg_code
+
+            np.testing.assert_array_equal(
+                cm.catg_data_selector(db_index, select_indices,
+                                      label_str, self.years),
+                self.expected_selection[idx])
+
+        # The indexed data should not be modified by the selection
+        self.assertEqual(len(db_index.data), len(self.sample_db_array))
+        np.testing.assert_array_equal(
+            np.sort(db_index.data['Year']),
+            np.sort(self.sample_db_array['Year']))
+
 
 class DataToFinalDictAtLeafNodeRestructuringTest(CommonUnitTest):
     """ Test function that handles selection of the appropriate data
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+"""Catalog the ECM definition files in a folder
+
+This module maintains an index of the ECM definition JSON files in a
+folder that records, for each file, the name of the ECM it defines, a
+hash of the file contents, and the baseline market fields of the ECM
+definition. Tools that need to know which ECMs exist, which ECMs have
+changed, or which ECMs apply to a given baseline market can use the
+index instead of opening and parsing every ECM definition.
+
+The index can be stored in a JSON file between runs, in which case
+only the ECM definitions that are new or have been modified since the
+index was last updated are read again. ECM definitions that must be
+read are read concurrently.
+"""
+
+import json
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ECMCatalog(object):
+    """Index the ECM definition JSON files in a folder.
+
+    Attributes:
+        market_fields (list): Keys in the ECM definitions for the baseline
+            market parameters that are recorded in the index.
+        ecm_folder (str): Path to the folder with the ECM JSON files.
+        index_file (str): Path to the JSON file in which the index is
+            stored between runs; if None, the index is not stored.
+        entries (dict): Index entries for each ECM JSON file in the folder,
+            keyed by file name; each entry gives the ECM name, the file
+            modification time, size, and contents hash, and the values of
+            the baseline market fields in the ECM definition.
+        definitions (dict): ECM definitions read in while updating the
+            index, keyed by file name.
+    """
+
+    market_fields = [
+        "climate_zone", "bldg_type", "structure_type", "fuel_type",
+        "end_use", "technology"]
+
+    def __init__(self, ecm_folder, index_file=None):
+        self.ecm_folder = ecm_folder
+        self.index_file = index_file
+        self.entries = {}
+        self.definitions = {}
+        self.update()
+
+    def update(self):
+        """Bring the index up to date with the ECM JSON files in the folder.
+
+        Note:
+            Entries for files that have not been modified since the index
+            was last updated (i.e., files with unchanged modification time
+            and size) are reused as-is; all other files are read in
+            concurrently, and their index entries are rebuilt unless the
+            hash of the file contents is unchanged (e.g., for files that
+            were touched but not edited), in which case only the file
+            modification time and size in the entry are updated.
+        """
+        # Import the previously stored index entries, if any; entries
+        # stored for a different ECM folder are not reused
+        entries_prev = {}
+        if self.index_file is not None and os.path.isfile(self.index_file):
+            with open(self.index_file, 'r') as fobj:
+                try:
+                    index_prev = json.load(fobj)
+                except ValueError:
+                    index_prev = {}
+            if index_prev.get("ecm_folder") == os.path.abspath(
+                    self.ecm_folder):
+                entries_prev = index_prev.get("entries", {})
+
+        # Get list of ECM JSON files in the folder
+        file_list = [
+            x for x in os.listdir(self.ecm_folder) if x.endswith('.json')]
+
+        # Determine which files must be read in, i.e., those without an
+        # index entry or whose modification time or size has changed
+        entries = {}
+        file_list_read = []
+        for ecm_file in file_list:
+            entry_prev = entries_prev.get(ecm_file)
+            if entry_prev is not None:
+                file_stat = os.stat(os.path.join(self.ecm_folder, ecm_file))
+                if file_stat.st_mtime == entry_prev["mtime"] and \
+                        file_stat.st_size == entry_prev["size"]:
+                    entries[ecm_file] = entry_prev
+                    continue
+            file_list_read.append(ecm_file)
+
+        # Read in the new or modified files and build their index entries;
+        # files whose contents hash matches that of the previous index
+        # entry are not parsed, and only their entry's modification time
+        # and size are updated
+        hashes_prev = [entries_prev.get(x, {}).get("hash")
+                       for x in file_list_read]
+        for ecm_file, ecm_file_data in zip(
+                file_list_read, self.read(file_list_read, hashes_prev)):
+            if ecm_file_data[3] is None:
+                entries[ecm_file] = dict(
+                    entries_prev[ecm_file], mtime=ecm_file_data[0],
+                    size=ecm_file_data[1])
+                continue
+            entries[ecm_file] = self.index_entry(*ecm_file_data)
+            self.definitions[ecm_file] = ecm_file_data[3]
+
+        # Keep the index entries in the order the files were listed
+        self.entries = {x: entries[x] for x in file_list}
+
+        # Store the updated index if any of its entries have changed
+        if self.index_file is not None and (
+                len(file_list_read) > 0 or
+                len(entries_prev) != len(self.entries)):
+            with open(self.index_file, 'w') as fobj:
+                json.dump({"ecm_folder": os.path.abspath(self.ecm_folder),
+                           "entries": self.entries}, fobj, indent=2)
+
+    def index_entry(self, mtime, size, contents_hash, ecm_dict):
+        """Build the index entry for an ECM definition.
+
+        Args:
+            mtime (float): Modification time of the ECM JSON file.
+            size (int): Size of the ECM JSON file.
+            contents_hash (str): Hash of the ECM JSON file contents.
+            ecm_dict (dict): ECM definition.
+
+        Returns:
+            Dict with the ECM name, file modification time, size, and
+            contents hash, and the ECM baseline market field values;
+            the name and market field values are None for JSON files that
+            do not define a single ECM (e.g., the package ECMs file).
+        """
+        if not isinstance(ecm_dict, dict):
+            ecm_dict = {}
+        entry = {"name": ecm_dict.get("name"), "mtime": mtime,
+                 "size": size, "hash": contents_hash}
+        for field in self.market_fields:
+            entry[field] = ecm_dict.get(field)
+
+        return entry
+
+    def read(self, file_list, hashes_prev=None):
+        """Read in ECM JSON files in the folder concurrently.
+
+        Args:
+            file_list (list): Names of the ECM JSON files to read.
+            hashes_prev (list): Optional previously recorded contents hash
+                for each file in 'file_list' (None where not recorded).
+
+        Returns:
+            List with the output of 'read_ecm_file' for each file, in the
+            same order as the file names in 'file_list'.
+        """
+        file_paths = [os.path.join(self.ecm_folder, x) for x in file_list]
+        if hashes_prev is None:
+            hashes_prev = [None] * len(file_paths)
+        if len(file_paths) > 1:
+            with ThreadPoolExecutor() as executor:
+                return list(executor.map(
+                    read_ecm_file, file_paths, hashes_prev))
+        else:
+            return [read_ecm_file(x, y)
+                    for x, y in zip(file_paths, hashes_prev)]
+
+    def load(self, file_list):
+        """Get the ECM definitions in a set of ECM JSON files.
+
+        Args:
+            file_list (list): Names of the ECM JSON files to load.
+
+        Returns:
+            List of ECM definition dicts in the same order as the file
+            names in 'file_list'; definitions already read in while
+            updating the index are not read again.
+        """
+        # Read in the definitions not yet read while updating the index
+        file_list_read = [x for x in file_list if x not in self.definitions]
+        for ecm_file, ecm_file_data in zip(
+                file_list_read, self.read(file_list_read)):
+            self.definitions[ecm_file] = ecm_file_data[3]
+
+        return [self.definitions[x] for x in file_list]
+
+
+def read_ecm_file(file_path, hash_prev=None):
+    """Read in and parse an ECM JSON file.
+
+    Args:
+        file_path (str): Path to the ECM JSON file.
+        hash_prev (str): Optional previously recorded hash of the file
+            contents; if the contents hash matches it, the file is not
+            parsed.
+
+    Returns:
+        Tuple with the modification time and size of the file, a hash of
+        the file contents, and the ECM definition dict (None if the file
+        contents hash matches 'hash_prev').
+
+    Raises:
+        ValueError: If the file contents cannot be parsed as JSON.
+    """
+    # Note that the file is checked before it is read in, such that a file
+    # modified while being read will be treated as modified next time
+    file_stat = os.stat(file_path)
+    with open(file_path, 'r') as fobj:
+        contents = fobj.read()
+    contents_hash = hashlib.sha256(contents.encode()).hexdigest()
+    if contents_hash == hash_prev:
+        return (file_stat.st_mtime, file_stat.st_size, contents_hash, None)
+    try:
+        ecm_dict = json.loads(contents)
+    except ValueError as e:
+        raise ValueError(
+            "Error reading in ECM '" + os.path.basename(file_path) + "': " +
+            str(e)) from None
+
+    return (file_stat.st_mtime, file_stat.st_size, contents_hash, ecm_dict)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+""" Tests for the ECM definition catalog """
+
+# Import code to be tested
+import ecm_catalog
+
+# Import needed packages
+import unittest
+from unittest.mock import patch
+import tempfile
+import json
+import os
+
+
+class ECMCatalogTest(unittest.TestCase):
+    """Test cataloging of a folder of ECM definitions.
+
+    Verify that the catalog records each ECM's name and baseline market
+    fields, reuses stored index entries for unmodified ECM definitions,
+    and reads modified or invalid ECM definitions in again.
+
+    Attributes:
+        ecm1 (dict): Sample residential ECM definition.
+        ecm2 (dict): Sample commercial ECM definition.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Define objects/variables for use across all class functions."""
+        cls.ecm1 = {
+            "name": "ENERGY STAR Air Source HP v. 5.0",
+            "climate_zone": "all",
+            "bldg_type": "all residential",
+            "structure_type": "existing",
+            "end_use": ["cooling", "heating"],
+            "fuel_type": "electricity",
+            "technology": "ASHP",
+            "market_entry_year": 2015}
+        cls.ecm2 = {
+            "name": "Commercial Gas Boiler, 90.1 c. 2013",
+            "climate_zone": ["AIA_CZ3", "AIA_CZ4"],
+            "bldg_type": "all commercial",
+            "structure_type": "all",
+            "end_use": "heating",
+            "fuel_type": "natural gas",
+            "technology": "gas_boiler",
+            "market_entry_year": 2013}
+
+    def write_ecms(self, ecm_dir, ecms):
+        """Write ECM definitions to JSON files in a folder."""
+        for ecm_file, ecm in ecms.items():
+            with open(os.path.join(ecm_dir, ecm_file), 'w') as jso:
+                json.dump(ecm, jso)
+
+    def test_catalog_entries(self):
+        """Test the catalog entries recorded for each ECM definition."""
+        with tempfile.TemporaryDirectory() as ecm_dir:
+            self.write_ecms(ecm_dir, {
+                "ecm1.json": self.ecm1, "ecm2.json": self.ecm2})
+            # Files that are not JSONs should be skipped
+            with open(os.path.join(ecm_dir, "notes.txt"), 'w') as txt:
+                txt.write("not an ECM")
+            catalog = ecm_catalog.ECMCatalog(ecm_dir)
+            self.assertEqual(
+                sorted(catalog.entries.keys()), ["ecm1.json", "ecm2.json"])
+            for ecm_file, ecm in zip(
+                    ["ecm1.json", "ecm2.json"], [self.ecm1, self.ecm2]):
+                self.assertEqual(catalog.entries[ecm_file]["name"],
+                                 ecm["name"])
+                for field in catalog.market_fields:
+                    self.assertEqual(catalog.entries[ecm_file][field],
+                                     ecm[field])
+            self.assertEqual(
+                catalog.load(["ecm2.json", "ecm1.json"]),
+                [self.ecm2, self.ecm1])
+
+    def test_catalog_index_reuse(self):
+        """Test that stored index entries are reused for unmodified ECMs."""
+        with tempfile.TemporaryDirectory() as ecm_dir, \
+                tempfile.TemporaryDirectory() as index_dir:
+            index_file = os.path.join(index_dir, "ecm_catalog.json")
+            self.write_ecms(ecm_dir, {
+                "ecm1.json": self.ecm1, "ecm2.json": self.ecm2})
+            catalog = ecm_catalog.ECMCatalog(ecm_dir, index_file)
+            self.assertTrue(os.path.isfile(index_file))
+            # Modify one ECM definition (setting a later modification time
+            # to ensure the modification is detected) and re-catalog
+            ecm2_mod = dict(self.ecm2, climate_zone="all")
+            self.write_ecms(ecm_dir, {"ecm2.json": ecm2_mod})
+            ecm2_stat = os.stat(os.path.join(ecm_dir, "ecm2.json"))
+            os.utime(os.path.join(ecm_dir, "ecm2.json"), (
+                ecm2_stat.st_atime, ecm2_stat.st_mtime + 10))
+            with patch.object(ecm_catalog, "read_ecm_file",
+                              wraps=ecm_catalog.read_ecm_file) as read_ecm:
+                catalog_upd = ecm_catalog.ECMCatalog(ecm_dir, index_file)
+                # Only the modified ECM definition should have been read
+                self.assertEqual(
+                    [os.path.basename(x[0][0]) for x in
+                     read_ecm.call_args_list], ["ecm2.json"])
+            self.assertEqual(catalog_upd.entries["ecm1.json"],
+                             catalog.entries["ecm1.json"])
+            self.assertEqual(
+                catalog_upd.entries["ecm2.json"]["climate_zone"], "all")
+            self.assertNotEqual(catalog_upd.entries["ecm2.json"]["hash"],
+                                catalog.entries["ecm2.json"]["hash"])
+
+    def test_catalog_touched_unchanged(self):
+        """Test that touched but unchanged ECMs are not parsed again."""
+        with tempfile.TemporaryDirectory() as ecm_dir, \
+                tempfile.TemporaryDirectory() as index_dir:
+            index_file = os.path.join(index_dir, "ecm_catalog.json")
+            self.write_ecms(ecm_dir, {
+                "ecm1.json": self.ecm1, "ecm2.json": self.ecm2})
+            catalog = ecm_catalog.ECMCatalog(ecm_dir, index_file)
+            # Set a later modification time for one ECM definition without
+            # changing its contents and re-catalog
+            ecm1_stat = os.stat(os.path.join(ecm_dir, "ecm1.json"))
+            os.utime(os.path.join(ecm_dir, "ecm1.json"), (
+                ecm1_stat.st_atime, ecm1_stat.st_mtime + 10))
+            catalog_upd = ecm_catalog.ECMCatalog(ecm_dir, index_file)
+            # The ECM definition should not have been parsed, and only the
+            # modification time in its index entry should have changed
+            self.assertEqual(catalog_upd.definitions, {})
+            self.assertEqual(catalog_upd.entries["ecm1.json"], dict(
+                catalog.entries["ecm1.json"],
+                mtime=ecm1_stat.st_mtime + 10))
+            # The updated modification time should have been stored
+            with open(index_file, 'r') as fobj:
+                self.assertEqual(json.load(fobj)["entries"],
+                                 catalog_upd.entries)
+
+    def test_catalog_invalid_json(self):
+        """Test that an invalid ECM definition raises a ValueError."""
+        with tempfile.TemporaryDirectory() as ecm_dir:
+            with open(os.path.join(ecm_dir, "ecm_bad.json"), 'w') as jso:
+                jso.write('{"name": ')
+            with self.assertRaisesRegex(ValueError, "ecm_bad.json"):
+                ecm_catalog.ECMCatalog(ecm_dir)
+
+
+# Offer external code execution (include all lines below this point in all
+# test files)
+def main():
+    """Trigger default behavior of running all test fixtures in the file."""
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,8 @@ import numpy
 import re
 import itertools
 import json
-from collections import OrderedDict
-from os import listdir, getcwd, stat, path
+from collections import OrderedDict, Counter
+from os import listdir, getcwd, stat, path, makedirs
 from os.path import isfile, join
 import copy
 import warnings
@@ -14,6 +14,9 @@ import pickle
 from functools import reduce  # forward compatibility for Python 3
 import operator
 from optparse import OptionParser
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+import ecm_catalog
 
 
 class MyEncoder(json.JSONEncoder):
@@ -40,7 +43,12 @@ class UsefulInputFiles(object):
         cbecs_sf_byvint (string): Commercial sq.ft. by vintage data.
         ecm_packages (string): Measure package data.
         ecm_prep (string): Prepared measure attributes data for use in the
-            analysis engine.
+            analysis engine (as previously written to a single file).
+        ecm_prep_store (string): Directory of prepared measure attributes
+            data for use in the analysis engine, with one file per measure
+            and a manifest file listing all measure names.
+        ecm_catalog (string): Index of individual measure definition names,
+            file hashes, and baseline market attributes.
         ecm_compete_data (string): Contributing microsegment data needed
             to run measure competition in the analysis engine.
         run_setup (string): Names of active measures that should be run in
@@ -70,6 +78,8 @@ class UsefulInputFiles(object):
         self.indiv_ecms = "ecm_definitions"
         self.ecm_packages = ("ecm_definitions", "package_ecms.json")
         self.ecm_prep = ("supporting_data", "ecm_prep.json")
+        self.ecm_prep_store = ("supporting_data", "ecm_prep")
+        self.ecm_catalog = ("supporting_data", "ecm_catalog.json")
         self.ecm_compete_data = ("supporting_data", "ecm_competition_data")
         self.run_setup = "run_setup.json"
         self.cpi_data = ("supporting_data", "convert_data", "cpi.csv")
@@ -111,6 +121,12 @@ class UsefulVars(object):
             the building sector categories used in summarizing measure outputs.
         out_break_enduses (OrderedDict): Maps measure end use names to
             the end use categories used in summarizing measure outputs.
+        out_break_czones_map (dict): Maps climate zone names to output
+            climate zone categories.
+        out_break_bldgtypes_map (dict): Maps building type and structure
+            type names to output building sector categories.
+        out_break_enduses_map (dict): Maps end use and technology type (or,
+            for 'freezers', technology) names to output end use categories.
         out_break_in (OrderedDict): Breaks out key measure results by
             climate zone, building sector, and end use.
         cconv_topkeys_map (dict): Maps measure cost units to top-level keys in
@@ -511,6 +527,14 @@ class UsefulVars(object):
             ('Other', [
                 "cooking", "drying", "ceiling fan", "fans & pumps",
                 "MELs", "other (grid electric)"])])
+        # Invert the above output category definitions such that the output
+        # breakout categories for a given climate zone, building type and
+        # structure type, and end use and technology type/technology can be
+        # looked up directly rather than found by scanning each category
+        (self.out_break_czones_map, self.out_break_bldgtypes_map,
+         self.out_break_enduses_map) = out_break_maps(
+            self.out_break_czones, self.out_break_bldgtypes,
+            self.out_break_enduses)
         # Use the above output categories to establish a dictionary with blank
         # values at terminal leaf nodes; this dict will eventually store
         # partitioning fractions needed to breakout the measure results
@@ -725,9 +749,12 @@ class EPlusGlobals(object):
         eplus_vintages (list): EnergyPlus building vintage types.
         eplus_vintage_weights (dicts): Square-footage-based weighting factors
             for EnergyPlus vintages.
+        eplus_data (dict): Parsed EnergyPlus simulation output arrays, keyed
+            by file path, with row indices for each EnergyPlus measure name
+            and for the completed baseline ('none') simulation runs.
     """
 
-    def __init__(self, eplus_dir, cbecs_sf_byvint):
+    def __init__(self, eplus_dir, cbecs_sf_byvint, cache_dir=None):
         # Set building vintage square footage data from CBECS
         self.vintage_sf = cbecs_sf_byvint
         self.eplus_coltypes = [
@@ -771,16 +798,59 @@ class EPlusGlobals(object):
         self.eplus_perf_files = [
             f for f in listdir(eplus_dir) if
             isfile(join(eplus_dir, f)) and '_scout_' in f]
-        # Import the first of the EnergyPlus measure performance files and use
-        # it to establish EnergyPlus vintage categories
-        eplus_file = numpy.genfromtxt(
-            (eplus_dir + '/' + self.eplus_perf_files[0]), names=True,
-            dtype=self.eplus_coltypes, delimiter=",", missing_values='')
+        # Import all of the EnergyPlus measure performance files once, in
+        # parallel across files, such that measures referencing the same
+        # files need not re-parse them
+        self.eplus_data = self.import_eplus_files(eplus_dir, cache_dir)
+        # Use the first of the EnergyPlus measure performance files to
+        # establish EnergyPlus vintage categories
+        eplus_file = self.eplus_data[
+            eplus_dir + '/' + self.eplus_perf_files[0]]["array"]
         self.eplus_vintages = numpy.unique(eplus_file['template'])
         # Determine appropriate weights for mapping EnergyPlus vintages to the
         # 'new' and 'retrofit' building structure types of Scout
         self.eplus_vintage_weights = self.find_vintage_weights()
 
+    def import_eplus_files(self, eplus_dir, cache_dir):
+        """Import all EnergyPlus performance files and index their rows.
+
+        Note:
+            Files are parsed in parallel. Each parsed file's rows are indexed
+            by EnergyPlus measure name, and the completed baseline ('none')
+            simulation runs are indexed separately, such that the rows
+            relevant to a given Scout measure may be selected directly.
+
+        Args:
+            eplus_dir (string): Directory of EnergyPlus performance files.
+            cache_dir (string): Optional directory in which to store parsed
+                EnergyPlus arrays as '.npy' files for reuse across runs.
+
+        Returns:
+            Dict of parsed EnergyPlus arrays and row indices, keyed by
+            EnergyPlus file path.
+        """
+        eplus_paths = [eplus_dir + '/' + f for f in self.eplus_perf_files]
+        with ProcessPoolExecutor() as executor:
+            eplus_arrays = list(executor.map(
+                import_eplus_file, eplus_paths,
+                itertools.repeat(self.eplus_coltypes),
+                itertools.repeat(cache_dir)))
+        eplus_data = {}
+        for f, eplus_file in zip(eplus_paths, eplus_arrays):
+            # Group row indices by measure name, preserving row order
+            meas_names, meas_inds = numpy.unique(
+                eplus_file['measure'], return_inverse=True)
+            meas_rows = numpy.split(
+                numpy.argsort(meas_inds, kind='mergesort'),
+                numpy.cumsum(numpy.bincount(meas_inds))[:-1])
+            eplus_data[f] = {
+                "array": eplus_file,
+                "measure_rows": dict(zip(meas_names, meas_rows)),
+                "base_rows": numpy.flatnonzero(
+                    (eplus_file['measure'] == 'none') &
+                    (eplus_file['status'] == 'completed normal'))}
+        return eplus_data
+
     def find_vintage_weights(self):
         """Find square-footage-based weighting factors for building vintages.
 
@@ -1009,7 +1079,7 @@ class Measure(object):
                 yr: 0 for yr in self.handyvars.aeo_years}
 
     def fill_eplus(self, msegs, eplus_dir, eplus_coltypes,
-                   eplus_files, vintage_weights, base_cols):
+                   eplus_files, vintage_weights, base_cols, eplus_data=None):
         """Fill in measure performance with EnergyPlus simulation results.
 
         Note:
@@ -1025,6 +1095,9 @@ class Measure(object):
             eplus_files (list): EnergyPlus performance file names.
             vintage_weights (dict): Square-footage-derived weighting factors
                 for each EnergyPlus building vintage type.
+            base_cols (list): Variable columns that should never be removed.
+            eplus_data (dict): Optional previously parsed EnergyPlus arrays
+                and row indices, keyed by file path.
 
         Returns:
             Updated Measure energy_efficiency, energy_efficiency_source, and
@@ -1050,7 +1123,8 @@ class Measure(object):
         # of measure performance data
         if len(eplus_perf_in) > 0:
             # Assemble the EnergyPlus data into a record array
-            eplus_perf_array = self.build_array(eplus_coltypes, eplus_perf_in)
+            eplus_perf_array = self.build_array(
+                eplus_coltypes, eplus_perf_in, eplus_data)
             # Create a measure performance dictionary, zeroed out, to
             # be updated with data from EnergyPlus array
             perf_dict_empty = self.create_perf_dict(msegs)
@@ -1171,8 +1245,11 @@ class Measure(object):
         # they do not indicate additional equipment purchases (and thus do not
         # affect stock, stock costs, or equipment lifetime calculations)
 
-        # Determine "primary" microsegment key chains
-        ms_iterable, ms_lists = self.create_keychain("primary")
+        # Determine "primary" microsegment key chains. Key chains are
+        # generated only where they are found in the baseline data; a count
+        # of all candidate key chains is kept to report the number dropped
+        ms_iterable, ms_lists, keys_cand = self.create_keychain(
+            "primary", msegs, msegs_cpl)
 
         # If needed, fill out any secondary microsegment fuel type, end use,
         # and/or technology input attributes marked 'all' by users. Determine
@@ -1182,9 +1259,10 @@ class Measure(object):
         # gain" thermal load component microsegments to represent secondary
         # end use effects of the lighting measure
         if self.end_use["secondary"] is not None:
-            ms_iterable_second, ms_lists_second = self.create_keychain(
-                "secondary")
-            ms_iterable.extend(ms_iterable_second)
+            ms_iterable_second, ms_lists_second, keys_cand_second = \
+                self.create_keychain("secondary", msegs, msegs_cpl)
+            ms_iterable = itertools.chain(ms_iterable, ms_iterable_second)
+            keys_cand += keys_cand_second
         elif "lighting" in self.end_use["primary"] and \
             any([x not in ["single family home", "multi family home",
                            "mobile home"] for x in self.bldg_type]):
@@ -1214,13 +1292,21 @@ class Measure(object):
 
                     # Determine secondary microsegment key chains and add to
                     # the primary microsegment key chain list
-                    ms_iterable_second, ms_lists_second = self.create_keychain(
-                        "secondary")
-                    ms_iterable.extend(ms_iterable_second)
-
+                    ms_iterable_second, ms_lists_second, keys_cand_second = \
+                        self.create_keychain("secondary", msegs, msegs_cpl)
+                    ms_iterable = itertools.chain(
+                        ms_iterable, ms_iterable_second)
+                    keys_cand += keys_cand_second
+
+        # Initialize a counter of key chains found in the baseline data and
+        # the microsegment type of the previous key chain
+        keys_found = 0
+        mseg_type_prev = None
         # Loop through discovered key chains to find needed performance/cost
         # and stock/energy information for measure
         for ind, mskeys in enumerate(ms_iterable):
+            # Update count of key chains found in the baseline data
+            keys_found += 1
 
             # Set building sector for the current microsegment
             if mskeys[2] in [
@@ -1254,12 +1340,13 @@ class Measure(object):
             # (relevant to cost only). * Note: cost/lifetime/sub-market
             # information is not updated for "secondary" microsegments, which
             # do not pertain to these variables; lifetime units are in years
-            if ind == 0 or (ms_iterable[ind][0] != ms_iterable[ind - 1][0]) \
+            if ind == 0 or (mskeys[0] != mseg_type_prev) \
                or isinstance(self.energy_efficiency, dict):
                 perf_meas = self.energy_efficiency
-            if ind == 0 or (ms_iterable[ind][0] != ms_iterable[ind - 1][0]) \
+            if ind == 0 or (mskeys[0] != mseg_type_prev) \
                or isinstance(self.energy_efficiency_units, dict):
                 perf_units = self.energy_efficiency_units
+            mseg_type_prev = mskeys[0]
             if mskeys[0] == "secondary":
                 cost_meas, life_meas = (0 for n in range(2))
                 cost_units = "NA"
@@ -2306,39 +2393,20 @@ class Measure(object):
                     # applies
 
                     # Establish applicable climate zone breakout
-                    for cz in self.handyvars.out_break_czones.items():
-                        if mskeys[1] in cz[1]:
-                            out_cz = cz[0]
+                    out_cz = self.handyvars.out_break_czones_map.get(
+                        mskeys[1])
                     # Establish applicable building type breakout
-                    for bldg in self.handyvars.out_break_bldgtypes.items():
-                        if all([x in bldg[1] for x in [
-                                mskeys[2], mskeys[-1]]]):
-                            out_bldg = bldg[0]
-                    # Establish applicable end use breakout
-                    for eu in self.handyvars.out_break_enduses.items():
-                        # * Note: The 'other (grid electric)' microsegment end
-                        # use may map to either the 'Refrigeration' output
-                        # breakout or the 'Other' output breakout, depending on
-                        # the technology type specified in the measure
-                        # definition. Also note that 'supply' side
-                        # heating/cooling microsegments map to the
-                        # 'Heating (Equip.)'/'Cooling (Equip.)' end uses, while
-                        # 'demand' side heating/cooling microsegments map to
-                        # the 'Envelope' end use
-                        if mskeys[4] == "other (grid electric)":
-                            if mskeys[5] == "freezers":
-                                out_eu = "Refrigeration"
-                            else:
-                                out_eu = "Other"
-                        elif mskeys[4] in eu[1]:
-                            if (eu[0] in ["Heating (Equip.)",
-                                          "Cooling (Equip.)"] and
-                                mskeys[5] == "supply") or (
-                                eu[0] == "Envelope" and
-                                mskeys[5] == "demand") or (
-                                eu[0] not in ["Heating (Equip.)",
-                                              "Cooling (Equip.)", "Envelope"]):
-                                out_eu = eu[0]
+                    out_bldg = self.handyvars.out_break_bldgtypes_map.get(
+                        (mskeys[2], mskeys[-1]))
+                    # Establish applicable end use breakout; heating/cooling
+                    # microsegments are keyed by their technology type
+                    # ('supply' or 'demand'), 'other (grid electric)'
+                    # microsegments may be keyed by their technology, and all
+                    # other microsegments are keyed by their end use alone
+                    out_eu = self.handyvars.out_break_enduses_map.get(
+                        (mskeys[4], mskeys[5]),
+                        self.handyvars.out_break_enduses_map.get(
+                            (mskeys[4], None)))
 
                     # Given the contributing microsegment's applicable climate
                     # zone, building type, and end use categories, add the
@@ -2418,7 +2486,8 @@ class Measure(object):
                             str(contrib_mseg_key)] = self.add_keyvals(
                                 self.markets[adopt_scheme]["mseg_adjust"][
                                     "contributing mseg keys and values"][
-                                    str(contrib_mseg_key)], add_dict)
+                                    str(contrib_mseg_key)], add_dict,
+                                skip_keys=("sub-market scaling",))
                     # Record the sub-market scaling fraction associated with
                     # the current contributing microsegment
                     self.markets[adopt_scheme]["mseg_adjust"][
@@ -2533,7 +2602,7 @@ class Measure(object):
         if not verbose:
             # Missing baseline stock and energy data, cost, performance, and
             # lifetime data and consumer data summaries are blank
-            bstk_msg, bcpl_msg, bcc_msg = ("" for n in range(3))
+            bkc_msg, bstk_msg, bcpl_msg, bcc_msg = ("" for n in range(4))
             # If one or more conversion to ECM unit cost has been made, note
             # this in the update message
             if cost_converts == 0:
@@ -2541,6 +2610,15 @@ class Measure(object):
             else:
                 cc_msg = " (cost units converted)"
         else:
+            # Summarize number of candidate key chains that were dropped
+            # because they are not found in the baseline data (if any)
+            if keys_found == keys_cand or self.remove is True:
+                bkc_msg = ""
+            else:
+                bkc_msg = "\n" + " - " + str(keys_cand - keys_found) + \
+                    " of " + str(keys_cand) + " candidate baseline" + \
+                    " microsegments were not found in the baseline data" + \
+                    " and skipped"
             # Summarize percentage of baseline stock and energy
             # data that were missing (if any)
             if valid_keys_stk_energy == valid_keys:
@@ -2577,10 +2655,11 @@ class Measure(object):
         # Print message to console; if in verbose mode, print to new line,
         # otherwise append to existing message on the console
         if not verbose:
-            print(" Success" + bstk_msg + bcpl_msg + bcc_msg + cc_msg)
+            print(" Success" + bkc_msg + bstk_msg + bcpl_msg + bcc_msg +
+                  cc_msg)
         else:
             print("ECM '" + self.name + "' successfully updated" +
-                  bstk_msg + bcpl_msg + bcc_msg + cc_msg)
+                  bkc_msg + bstk_msg + bcpl_msg + bcc_msg + cc_msg)
 
     def convert_costs(self, convert_data, bldg_sect, mskeys, cost_meas,
                       cost_meas_units, cost_base_units, verbose):
@@ -3783,16 +3862,27 @@ class Measure(object):
                                      e in torig for torig in map_tech_orig if
                                      'all ' in torig])) or e in map_tech_orig]
 
-    def create_keychain(self, mseg_type):
-        """Create list of dictionary keys used to find baseline microsegments.
+    def create_keychain(self, mseg_type, msegs=None, msegs_cpl=None):
+        """Create iterator of dict keys used to find baseline microsegments.
+
+        Note:
+            When baseline stock/energy and cost/performance/lifetime data are
+            provided, only those key chains that exist in both sets of data are
+            generated; key chains that cannot yield baseline data are pruned
+            as soon as one of their keys is missing from the baseline data.
 
         Args:
             mseg_type (string): Identifies the type of baseline microsegments
                 to generate keys for ('primary' or 'secondary').
+            msegs (dict): Baseline microsegment stock and energy (optional).
+            msegs_cpl (dict): Baseline technology cost, performance, and
+                lifetime (optional).
 
         Returns:
-            List of key chains to use in retreiving data for the measure's
-            applicable baseline market microsegments.
+            Iterator of key chains to use in retreiving data for the measure's
+            applicable baseline market microsegments, the lists of candidate
+            keys at each key chain level, and the total number of candidate
+            key chains (before any pruning against the baseline data).
         """
         # Ensure that all variables relevant to forming key chains are lists
         self.climate_zone, self.bldg_type, self.fuel_type[mseg_type], \
@@ -3810,6 +3900,9 @@ class Measure(object):
         # envelope air sealing for the latter).
         ht_cl_euses = ["heating", "secondary heating", "cooling"]
 
+        # Initialize a list of key level lists, each of which is expanded
+        # into the key chains that share that set of levels
+        ms_lists_all = []
         # Case with heating and/or cooling microsegments
         if any([x in ht_cl_euses for x in self.end_use[mseg_type]]):
             # Format measure end use attribute as numpy array
@@ -3826,23 +3919,16 @@ class Measure(object):
                 self.climate_zone, self.bldg_type, self.fuel_type[mseg_type],
                 eu_hc, self.technology_type[mseg_type],
                 self.technology[mseg_type]]
-            # Generate a list of all possible combinations of the elements
-            # in 'ms_lists' above
-            ms_iterable_init = list(itertools.product(*ms_lists))
+            ms_lists_all.append(list(ms_lists))
             # If there are also non-heating/cooling microsegments, set
             # a list including all measure microsegment attributes,
             # constraining the 'end_use' attribute to only non-heating/cooling
-            # end uses
+            # end uses, also adding this list to 'ms_lists'
             if len(eu_non_hc) > 0:
                 ms_lists_add = [self.climate_zone, self.bldg_type,
                                 self.fuel_type[mseg_type], eu_non_hc,
                                 self.technology[mseg_type]]
-                # Generate a list of all possible combinations of the
-                # elements in 'ms_lists_add' above and add this list
-                # to 'ms_iterable_init', also adding 'ms_lists_add'
-                # to 'ms_lists'
-                ms_iterable_init.extend(
-                    list(itertools.product(*ms_lists_add)))
+                ms_lists_all.append(ms_lists_add)
                 ms_lists.extend(ms_lists_add)
 
         # Case without heating or cooling microsegments
@@ -3851,34 +3937,76 @@ class Measure(object):
             ms_lists = [self.climate_zone, self.bldg_type,
                         self.fuel_type[mseg_type], self.end_use[mseg_type],
                         self.technology[mseg_type]]
-            # Generate a list of all possible combinations of the elements
-            # in 'ms_lists' above
-            ms_iterable_init = list(itertools.product(*ms_lists))
+            ms_lists_all.append(ms_lists)
 
         # Add primary or secondary microsegment type indicator to beginning
         # of each key chain and the applicable structure type (new or existing)
-        # to the end of each key chain
-
-        # Case where measure applies to both new and existing structures
-        # (final ms_iterable list length is double that of ms_iterable_init)
-        if len(self.structure_type) > 1:
-            ms_iterable1, ms_iterable2 = ([] for n in range(2))
-            for i in range(0, len(ms_iterable_init)):
-                ms_iterable1.append((mseg_type,) + ms_iterable_init[i] +
-                                    (self.structure_type[0], ))
-                ms_iterable2.append((mseg_type,) + ms_iterable_init[i] +
-                                    (self.structure_type[1], ))
-            ms_iterable = ms_iterable1 + ms_iterable2
-        # Case where measure applies to only new or existing structures
-        # (final ms_iterable list length is same as that of ms_iterable_init)
-        else:
-            ms_iterable = []
-            for i in range(0, len(ms_iterable_init)):
-                ms_iterable.append(((mseg_type, ) + ms_iterable_init[i] +
-                                    (self.structure_type[0], )))
+        # to the end of each key chain. Where the measure applies to both new
+        # and existing structures, all key chains for the first structure type
+        # are generated before those for the second structure type
+        ms_iterable = (
+            (mseg_type,) + kc + (st,) for st in self.structure_type
+            for kc in itertools.chain.from_iterable(
+                self.find_keychains(x, msegs, msegs_cpl)
+                for x in ms_lists_all))
+
+        # Count all candidate key chains (used to report the number of key
+        # chains dropped for not being found in the baseline data)
+        keys_cand = sum([reduce(operator.mul, [len(y) for y in x], 1) for
+                         x in ms_lists_all]) * len(self.structure_type)
+
+        # Output iterator of key chains
+        return ms_iterable, ms_lists, keys_cand
+
+    def find_keychains(self, ms_lists, msegs, msegs_cpl):
+        """Yield the key chains in a set of key levels found in baseline data.
+
+        Note:
+            The baseline stock/energy and cost/performance/lifetime dicts are
+            walked as tries alongside the key levels, such that a branch of
+            candidate key chains is skipped entirely once one of its keys is
+            missing from the baseline data. 'None' keys (technologies not
+            broken out further in the baseline data) do not descend a level.
+            A key chain is yielded only if its terminal baseline stock/energy
+            node includes both 'stock' and 'energy' keys.
+
+        Args:
+            ms_lists (list): Candidate keys for each level of the key chain.
+            msegs (dict): Baseline microsegment stock and energy use; if None,
+                all combinations of the candidate keys are yielded.
+            msegs_cpl (dict): Baseline technology cost, performance, and
+                lifetime.
+
+        Yields:
+            Key chains (tuples) that exist in the baseline data.
+        """
+        # Without baseline data to check against, yield all key combinations
+        if msegs is None or msegs_cpl is None:
+            yield from itertools.product(*ms_lists)
+            return
+
+        def descend(level, mseg, base_cpl):
+            # Terminal level reached; check for stock and energy data
+            if level == len(ms_lists):
+                if isinstance(mseg, dict) and all([
+                        x in mseg.keys() for x in ["stock", "energy"]]):
+                    yield ()
+                return
+            for key in ms_lists[level]:
+                # 'None' keys do not correspond to a level of the baseline data
+                if key is None:
+                    mseg_next, base_cpl_next = mseg, base_cpl
+                # Move down a level in both sets of baseline data
+                elif isinstance(mseg, dict) and isinstance(base_cpl, dict) \
+                        and key in mseg.keys() and key in base_cpl.keys():
+                    mseg_next, base_cpl_next = mseg[key], base_cpl[key]
+                # Key is missing from the baseline data; prune the branch
+                else:
+                    continue
+                for kc in descend(level + 1, mseg_next, base_cpl_next):
+                    yield (key,) + kc
 
-        # Output list of key chains
-        return ms_iterable, ms_lists
+        yield from descend(0, msegs, msegs_cpl)
 
     def find_scnd_overlp(self, vint_frac, ss_conv, dict1, energy_tot):
         """Find total lighting energy for climate, building, and structure type.
@@ -3921,7 +4049,50 @@ class Measure(object):
 
         return energy_tot
 
-    def add_keyvals(self, dict1, dict2):
+    def flatten_keyvals(self, dict1, dict2=None, skip_keys=()):
+        """Collect references to the terminal values of nested dict(s).
+
+        Note:
+            The dict(s) are walked with an explicit stack rather than by
+            recursion, and keys are not sorted; each terminal value is
+            returned as a (parent dict, key) pair so that it may be
+            updated in place. Where a second dict is given, it is
+            walked in lockstep with the first and must contain all of
+            the first dict's keys (extra keys in the second dict are
+            ignored).
+
+        Args:
+            dict1 (dict): Dict to collect terminal values for.
+            dict2 (dict): Optional dict structured identically to dict1.
+            skip_keys (tuple): Keys to exclude at any level of the dict(s).
+
+        Returns:
+            List of (parent dict, key) pairs for the terminal values in
+            dict1 and, if dict2 is given, a matching list for dict2.
+
+        Raises:
+            KeyError: When a key in dict1 is not present in dict2.
+        """
+        leaves1, leaves2 = [], []
+        stack = [(dict1, dict2)]
+        while stack:
+            d1, d2 = stack.pop()
+            for k, i in d1.items():
+                if k in skip_keys:
+                    continue
+                i2 = d2[k] if d2 is not None else None
+                if isinstance(i, dict):
+                    stack.append((i, i2))
+                else:
+                    leaves1.append((d1, k))
+                    if d2 is not None:
+                        leaves2.append((d2, k))
+        if dict2 is None:
+            return leaves1
+        else:
+            return leaves1, leaves2
+
+    def add_keyvals(self, dict1, dict2, skip_keys=()):
         """Add key values of two dicts together.
 
         Note:
@@ -3930,6 +4101,7 @@ class Measure(object):
         Args:
             dict1 (dict): First dictionary to add.
             dict2 (dict): Second dictionary to add.
+            skip_keys (tuple): Keys whose values should not be added.
 
         Returns:
             Single dictionary of combined values.
@@ -3937,21 +4109,18 @@ class Measure(object):
         Raises:
             KeyError: When added dict keys do not match.
         """
-        for (k, i), (k2, i2) in zip(
-                sorted(dict1.items()), sorted(dict2.items())):
-            if k == k2:
-                if isinstance(i, dict):
-                    self.add_keyvals(i, i2)
-                else:
-                    if dict1[k] is None:
-                        dict1[k] = copy.deepcopy(dict2[k2])
-                    else:
-                        dict1[k] = dict1[k] + dict2[k]
+        try:
+            leaves1, leaves2 = self.flatten_keyvals(dict1, dict2, skip_keys)
+        except KeyError:
+            raise KeyError("When adding together two dicts "
+                           "for ECM '" + self.name +
+                           "' update, dict key structures "
+                           "do not match")
+        for (d1, k), (d2, k2) in zip(leaves1, leaves2):
+            if d1[k] is None:
+                d1[k] = copy.deepcopy(d2[k2])
             else:
-                raise KeyError("When adding together two dicts "
-                               "for ECM '" + self.name +
-                               "' update, dict key structures "
-                               "do not match")
+                d1[k] = d1[k] + d2[k2]
         return dict1
 
     def add_keyvals_restrict(self, dict1, dict2):
@@ -3976,24 +4145,7 @@ class Measure(object):
         Raises:
             KeyError: When added dict keys do not match.
         """
-        for (k, i), (k2, i2) in zip(
-                sorted(dict1.items()), sorted(dict2.items())):
-            if k == k2 and k == "lifetime":
-                continue
-            elif k == k2 and k != "lifetime":
-                if isinstance(i, dict):
-                    self.add_keyvals(i, i2)
-                else:
-                    if dict1[k] is None:
-                        dict1[k] = copy.deepcopy(dict2[k2])
-                    else:
-                        dict1[k] = dict1[k] + dict2[k]
-            else:
-                raise KeyError("When adding together two dicts "
-                               "for ECM '" + self.name +
-                               "' update, dict key structures "
-                               "do not match")
-        return dict1
+        return self.add_keyvals(dict1, dict2, skip_keys=("lifetime",))
 
     def div_keyvals(self, dict1, dict2):
         """Divide key values of one dict by analogous values of another.
@@ -4013,16 +4165,16 @@ class Measure(object):
             An updated version of the first dict with all original
             values divided by the analogous values in the second dict.
         """
-        for (k, i) in dict1.items():
-            if isinstance(i, dict):
-                self.div_keyvals(i, dict2)
+        # Handle total energy use of zero; determine which divisors are
+        # valid once rather than for every terminal value of the first dict
+        valid = {k: ((type(v) == numpy.ndarray and all(v) != 0) or
+                     (type(v) != numpy.ndarray and v != 0))
+                 for k, v in dict2.items()}
+        for d1, k in self.flatten_keyvals(dict1):
+            if valid[k]:
+                d1[k] = d1[k] / dict2[k]
             else:
-                # Handle total energy use of zero
-                if ((type(dict2[k]) == numpy.ndarray and all(dict2[k]) != 0) or
-                        (type(dict2[k]) != numpy.ndarray and dict2[k] != 0)):
-                    dict1[k] = dict1[k] / dict2[k]
-                else:
-                    dict1[k] = 0
+                d1[k] = 0
         return dict1
 
     def div_keyvals_float(self, dict1, reduce_num):
@@ -4037,18 +4189,15 @@ class Measure(object):
             number.
 
         """
-        for (k, i) in dict1.items():
-            if isinstance(i, dict):
-                self.div_keyvals_float(i, reduce_num)
+        # Handle zero values
+        valid = ((type(reduce_num) == numpy.ndarray and
+                  all(reduce_num) != 0) or (
+                    type(reduce_num) != numpy.ndarray and reduce_num != 0))
+        for d1, k in self.flatten_keyvals(dict1):
+            if valid:
+                d1[k] = d1[k] / reduce_num
             else:
-                # Handle zero values
-                if ((type(reduce_num) == numpy.ndarray and
-                     all(reduce_num) != 0) or (
-                        type(reduce_num) != numpy.ndarray and
-                        reduce_num != 0)):
-                    dict1[k] = dict1[k] / reduce_num
-                else:
-                    dict1[k] = 0
+                d1[k] = 0
         return dict1
 
     def div_keyvals_float_restrict(self, dict1, reduce_num):
@@ -4070,17 +4219,11 @@ class Measure(object):
             An updated dict with all non-restricted original values divided
             by the number.
         """
-        for (k, i) in dict1.items():
-            # Do not divide any energy, carbon, lifetime, or sub-market
-            # scaling information
-            if (k == "energy" or k == "carbon" or k == "lifetime" or
-                    k == "sub-market scaling"):
-                continue
-            else:
-                if isinstance(i, dict):
-                    self.div_keyvals_float_restrict(i, reduce_num)
-                else:
-                    dict1[k] = dict1[k] / reduce_num
+        # Do not divide any energy, carbon, lifetime, or sub-market
+        # scaling information
+        for d1, k in self.flatten_keyvals(dict1, skip_keys=(
+                "energy", "carbon", "lifetime", "sub-market scaling")):
+            d1[k] = d1[k] / reduce_num
         return dict1
 
     def rand_list_gen(self, distrib_info, nsamples):
@@ -4275,58 +4418,47 @@ class Measure(object):
                         "Invalid performance dict key for ECM '" +
                         self.name + "'")
 
-                # Separate filtered array into the rows representing measure
-                # consumption and those representing baseline consumption
-                updated_perf_array_m, updated_perf_array_b = [
-                    updated_perf_array[updated_perf_array[
-                        'measure'] != 'none'],
-                    updated_perf_array[updated_perf_array[
-                        'measure'] == 'none']]
+                # Flag the rows of the filtered array representing measure
+                # consumption (all others represent baseline consumption)
+                row_m = (updated_perf_array['measure'] != 'none')
                 # Ensure that a baseline consumption row exists for every
                 # measure consumption row retrieved
-                if len(updated_perf_array_m) != len(updated_perf_array_b):
+                if numpy.sum(row_m) != numpy.sum(~row_m):
                     raise ValueError(
                         "Lengths of ECM and baseline EPlus data arrays "
                         "are unequal for ECM '" + self.name + "'")
-                # Initialize total measure and baseline consumption values
-                val_m, val_b = (0 for n in range(2))
+                # Find the weighting factor for each row of the filtered array
+                # given its building type and vintage; weights are looked up
+                # once per unique building type/vintage rather than per row
+                row_wts = numpy.ones(len(updated_perf_array))
+                for col, wt_dict in [("building_type", eplus_bldg_types),
+                                     ("template", vintage_weights)]:
+                    col_names, col_inds = numpy.unique(
+                        updated_perf_array[col], return_inverse=True)
+                    row_wts *= numpy.array(
+                        [wt_dict[x] for x in col_names], dtype=float)[
+                        col_inds]
+                # Sum the remaining columns with consumption data by row
+                cons_cols = [
+                    n for n in eplus_header if
+                    updated_perf_array.dtype[n].char not in ['S', 'U']]
+                row_vals = numpy.zeros(len(updated_perf_array))
+                for n in cons_cols:
+                    row_vals += updated_perf_array[n]
 
                 # Weight and combine the measure/baseline consumption values
                 # left in the EnergyPlus arrays; subtract total measure
                 # consumption from baseline consumption and divide by baseline
                 # consumption to reach relative savings value for the current
                 # dictionary branch
-                for ind in range(0, len(updated_perf_array_m)):
-                    row_m, row_b = [
-                        updated_perf_array_m[ind], updated_perf_array_b[ind]]
-                    # Loop through remaining columns with consumption data
-                    for n in eplus_header:
-                        if row_m[n].dtype.char != 'S' and \
-                                row_m[n].dtype.char != 'U':
-                            # Find appropriate building type to weight
-                            # consumption data points by
-                            eplus_bldg_type_wt_row_m, \
-                                eplus_bldg_type_wt_row_b = [
-                                    eplus_bldg_types[row_m['building_type']],
-                                    eplus_bldg_types[row_b['building_type']]]
-                            # Weight consumption data points by factors for
-                            # appropriate building type and vintage
-                            row_m_val, row_b_val = [(
-                                row_m[n] * eplus_bldg_type_wt_row_m *
-                                vintage_weights[row_m['template'].copy()]),
-                                (row_b[n] * eplus_bldg_type_wt_row_b *
-                                 vintage_weights[row_b['template'].copy()])]
-                            # Add weighted measure consumption data point to
-                            # total measure consumption
-                            val_m += row_m_val
-                            # Add weighted baseline consumption data point to
-                            # total base consumption
-                            val_b += row_b_val
-                    # Find relative savings if total baseline use != zero
-                    if val_b != 0:
-                        end_key_val = (val_b - val_m) / val_b
-                    else:
-                        end_key_val = 0
+                val_m, val_b = [
+                    numpy.sum(row_vals[x] * row_wts[x]) for x in [
+                        row_m, ~row_m]]
+                # Find relative savings if total baseline use != zero
+                if val_b != 0:
+                    end_key_val = (val_b - val_m) / val_b
+                else:
+                    end_key_val = 0
 
                 # Update the current dictionary branch value to the final
                 # measure relative savings value derived above
@@ -4455,35 +4587,42 @@ class Measure(object):
 
         return output_dict
 
-    def build_array(self, eplus_coltyp, files_to_build):
+    def build_array(self, eplus_coltyp, files_to_build, eplus_data=None):
         """Assemble EnergyPlus data from one or more CSVs into a record array.
 
         Args:
             eplus_coltypes (list): Expected EnergyPlus variable data types.
             files_to_build (CSV objects): CSV files of EnergyPlus energy
                 consumption information under measure and baseline cases.
+            eplus_data (dict): Optional previously parsed EnergyPlus arrays
+                and row indices, keyed by file path; files not found here are
+                parsed directly.
 
         Returns:
             Structured array of EnergyPlus energy savings information for the
             Measure.
         """
-        # Loop through CSV file objects and import/add to record array
-        for ind, f in enumerate(files_to_build):
-            # Read in CSV file to array
-            eplus_file = numpy.genfromtxt(f, names=True, dtype=eplus_coltyp,
-                                          delimiter=",", missing_values='')
-            # Find only those rows in the array that represent
-            # completed simulation runs for the measure of interest
-            eplus_file = eplus_file[(eplus_file[
-                'measure'] == self.energy_efficiency['EnergyPlus file']) |
-                (eplus_file['measure'] == 'none') &
-                (eplus_file['status'] == 'completed normal')]
-            # Initialize or add to a master array that covers all CSV data
-            if ind == 0:
-                eplus_perf_array = eplus_file
+        eplus_meas = self.energy_efficiency['EnergyPlus file']
+        eplus_perf_arrays = []
+        # Loop through CSV files and find only those rows that represent
+        # completed simulation runs for the measure of interest
+        for f in files_to_build:
+            # Select rows using the index of previously parsed file data
+            if eplus_data is not None and f in eplus_data:
+                eplus_file = eplus_data[f]["array"][numpy.union1d(
+                    eplus_data[f]["measure_rows"].get(
+                        eplus_meas, numpy.array([], dtype=int)),
+                    eplus_data[f]["base_rows"])]
+            # Otherwise read in CSV file to array and filter rows
             else:
-                eplus_perf_array = \
-                    numpy.concatenate((eplus_perf_array, eplus_file))
+                eplus_file = import_eplus_file(f, eplus_coltyp)
+                eplus_file = eplus_file[
+                    (eplus_file['measure'] == eplus_meas) |
+                    (eplus_file['measure'] == 'none') &
+                    (eplus_file['status'] == 'completed normal')]
+            eplus_perf_arrays.append(eplus_file)
+        # Assemble a master array that covers all CSV data
+        eplus_perf_array = numpy.concatenate(eplus_perf_arrays)
 
         return eplus_perf_array
 
@@ -4528,7 +4667,9 @@ class MeasurePackage(Measure):
 
     def __init__(self, measure_list_package, p, bens, handyvars):
         self.handyvars = handyvars
-        self.contributing_ECMs = copy.deepcopy(measure_list_package)
+        # * Note: contributing measures are not copied; their data are only
+        # read in merging them into the package
+        self.contributing_ECMs = measure_list_package
         self.name = p
         # Check to ensure that measure name is proper length for plotting
         if len(self.name) > 40:
@@ -4636,6 +4777,15 @@ class MeasurePackage(Measure):
             Updated 'markets' attribute for a packaged measure that combines
             the 'markets' attributes of multiple individual measures.
         """
+        # Count the number of measures in the package that share each
+        # contributing microsegment, for use in removing overlaps between
+        # the markets of the measures below
+        overlap_cts = {
+            adopt_scheme: Counter(itertools.chain.from_iterable(
+                m.markets[adopt_scheme]["mseg_adjust"][
+                    "contributing mseg keys and values"].keys() for
+                m in self.contributing_ECMs)) for
+            adopt_scheme in self.handyvars.adopt_schemes}
         # Loop through each measure and add its attributes to the merged
         # measure definition
         for ind, m in enumerate(self.contributing_ECMs):
@@ -4684,11 +4834,11 @@ class MeasurePackage(Measure):
                     # the purpose of accurate output breakout calculations
                     if k == "contributing mseg keys and values":
                         for cm in msegs_meas[k].keys():
-                            msegs_pkg[k], msegs_meas[k][cm], \
-                                mseg_out_break_adj = \
+                            msegs_pkg[k], mseg_out_break_adj = \
                                 self.merge_contrib_msegs(
                                     msegs_pkg[k], msegs_meas[k][cm],
-                                    cm, m.measure_type, adopt_scheme,
+                                    cm, m.measure_type,
+                                    overlap_cts[adopt_scheme][cm],
                                     mseg_out_break_adj)
                     # Add all other contributing microsegment data for
                     # the measure
@@ -4757,10 +4907,15 @@ class MeasurePackage(Measure):
                              self.out_break_norm[adopt_scheme])
 
     def merge_contrib_msegs(
-            self, msegs_pkg, msegs_meas, cm_key, meas_typ, adopt_scheme,
+            self, msegs_pkg, msegs_meas, cm_key, meas_typ, overlap_ct,
             mseg_out_break_adj):
         """Add a measure's contributing microsegment data to a packaged measure.
 
+        Note:
+            The individual measure's contributing microsegment data are not
+            modified; any scaling of these data for the package is applied
+            to a copy of the data's dict structure.
+
         Args:
             msegs_pkg (dict): Existing contributing microsegment data for the
                 packaged measure.
@@ -4769,25 +4924,26 @@ class MeasurePackage(Measure):
             cm_key (tuple): Microsegment key describing the contributing
                 microsegment currently being added (e.g. czone->bldg, etc.)
             meas_typ (string): Individual measure type (full service / add-on).
-            adopt_scheme (string): Assumed consumer adoption scenario.
+            overlap_ct (int): Number of measures in the package that share
+                the contributing microsegment.
             mseg_out_break_adj (dict): Total energy use data for the
                 individual measure, used to breakout results by climate zone,
                 building class, and end use.
 
         Returns:
             Updated contributing microsegment information for the package that
-            incorporates the measure's contributing microsegment data.
+            incorporates the measure's contributing microsegment data, and
+            the updated total energy use data for the individual measure.
         """
-        # Determine what other measures in the package share the current
-        # contributing microsegment for the individual measure
-        overlap_meas = [
-            x for x in self.contributing_ECMs if cm_key in x.markets[
-                adopt_scheme]["mseg_adjust"][
-                "contributing mseg keys and values"].keys()]
+        # Copy the structure of the individual measure's contributing
+        # microsegment data such that values updated for the package below
+        # do not overwrite those of the individual measure (the copy's
+        # terminal values are replaced, never modified in place)
+        msegs_meas = self.copy_keyvals(msegs_meas)
 
         # Update the contributing microsegment data for the individual measure
         # if the microsegment is shared with other measures in the package
-        if len(overlap_meas) > 1:
+        if overlap_ct > 1:
             # Scale contributing microsegment energy, carbon and associated
             # cost data, as well as lifetime and sub-market fraction data,
             # by total number of overlapping measures in the package
@@ -4798,12 +4954,12 @@ class MeasurePackage(Measure):
                 # by climate zone, building class, and end use
                 if k == "energy":
                     # Set total pre-scaled contributing microsegment energy
-                    total_energy_orig = copy.deepcopy(
+                    total_energy_orig = dict(
                         msegs_meas[k]["total"]["baseline"])
                     # Scale down contributing microsegment energy based on
                     # number of overlapping measures
                     self.div_keyvals_float(
-                        msegs_meas[k], len(overlap_meas))
+                        msegs_meas[k], overlap_ct)
                     # Adjust the measure's total energy use to reflect
                     # the scaled down contributing microsegment energy use
                     mseg_out_break_adj = {yr: mseg_out_break_adj[yr] - (
@@ -4815,13 +4971,13 @@ class MeasurePackage(Measure):
                     # Scale down contributing microsegment data based on
                     # number of overlapping measures
                     self.div_keyvals_float(
-                        msegs_meas[k], len(overlap_meas))
+                        msegs_meas[k], overlap_ct)
                 # Scale down cost data
                 if k in ["stock", "energy", "carbon"]:
                     msegs_meas["cost"][k] = self.div_keyvals_float(
-                        msegs_meas["cost"][k], len(overlap_meas))
+                        msegs_meas["cost"][k], overlap_ct)
             # Scale down sub-market fraction
-            msegs_meas["sub-market scaling"] /= len(overlap_meas)
+            msegs_meas["sub-market scaling"] /= overlap_ct
 
         # Check for additional energy savings and/or installed cost benefits
         # from packaging and apply these benefits if applicable
@@ -4835,7 +4991,20 @@ class MeasurePackage(Measure):
         else:
             msegs_pkg[cm_key] = self.add_keyvals(msegs_pkg[cm_key], msegs_meas)
 
-        return msegs_pkg, msegs_meas, mseg_out_break_adj
+        return msegs_pkg, mseg_out_break_adj
+
+    def copy_keyvals(self, dict1):
+        """Copy the nested structure of a dict without copying its values.
+
+        Args:
+            dict1 (dict): Dict to copy.
+
+        Returns:
+            A dict with the same nested structure as the input dict, whose
+            terminal values are the same objects as those of the input dict.
+        """
+        return {k: self.copy_keyvals(i) if isinstance(i, dict) else i
+                for k, i in dict1.items()}
 
     def update_dict(self, dict1, dict2):
         """Merge data from one dict into another dict.
@@ -4892,52 +5061,61 @@ class MeasurePackage(Measure):
         if energy_ben not in [None, 0]:
             for x in ["energy", "carbon"]:
                 for cs in ["competed", "total"]:
-                    # Set short variable names for baseline and efficient
-                    # energy and carbon data
-                    base = msegs_meas[x][cs]["baseline"]
-                    eff = msegs_meas[x][cs]["efficient"]
                     # Apply the additional energy savings % benefit to the
-                    # efficient energy and carbon data (disallow result
-                    # below zero)
-                    msegs_meas[x][cs]["efficient"] = {
-                        key: 0 if (
-                            not isinstance(eff[key], numpy.ndarray) and
-                            eff[key] > 0 and (base[key] - eff[key]) *
-                            energy_ben > eff[key]) or (
-                            isinstance(eff[key], numpy.ndarray) and
-                            all([x > 0 for x in eff[key]]) and
-                            all(((base[key] - x) * energy_ben > x) for
-                                x in eff[key]))
-                        else eff[key] - (base[key] - eff[key]) * energy_ben
-                        for key in self.handyvars.aeo_years}
-                    # Set short variable names for baseline and efficient
+                    # efficient energy and carbon data and to the efficient
                     # energy and carbon cost data
-                    base_c = msegs_meas["cost"][x][cs]["baseline"]
-                    eff_c = msegs_meas["cost"][x][cs]["efficient"]
-                    # Apply the additional energy savings % benefit to the
-                    # efficient energy and carbon cost data (disallow result
-                    # below zero)
-                    msegs_meas["cost"][x][cs]["efficient"] = {
-                        key: 0 if (
-                            not isinstance(eff_c[key], numpy.ndarray) and
-                            eff_c[key] > 0 and (base_c[key] - eff_c[key]) *
-                            energy_ben > eff_c[key]) or (
-                            isinstance(eff_c[key], numpy.ndarray) and
-                            all([x > 0 for x in eff_c[key]]) and
-                            all(((base_c[key] - x) * energy_ben > x) for
-                                x in eff_c[key]))
-                        else eff_c[key] - (base_c[key] - eff_c[key]) *
-                        energy_ben for key in self.handyvars.aeo_years}
+                    for ms in [msegs_meas[x][cs], msegs_meas["cost"][x][cs]]:
+                        ms["efficient"] = self.apply_pkg_energy_ben(
+                            ms["baseline"], ms["efficient"], energy_ben)
         # If additional installed cost benefits are not None and are non-zero,
         # apply them to the measure's stock cost
         if cost_ben not in [None, 0]:
             for cs in ["competed", "total"]:
-                msegs_meas["cost"]["stock"][cs]["efficient"] = {
-                    key: msegs_meas["cost"]["stock"][cs]["efficient"][key] *
-                    (1 - cost_ben) for key in self.handyvars.aeo_years}
+                eff_c = msegs_meas["cost"]["stock"][cs]["efficient"]
+                eff_c_arr = numpy.array(
+                    [eff_c[yr] for yr in self.handyvars.aeo_years],
+                    dtype=float) * (1 - cost_ben)
+                msegs_meas["cost"]["stock"][cs]["efficient"] = dict(
+                    zip(self.handyvars.aeo_years, eff_c_arr))
 
         return msegs_meas
 
+    def apply_pkg_energy_ben(self, base, eff, energy_ben):
+        """Apply an additional energy savings % to efficient energy data.
+
+        Note:
+            The benefit is applied to the data for all years (and, if
+            applicable, all samples) at once. For years in which the result
+            would fall below zero (across all samples, if applicable), the
+            efficient value is set to zero.
+
+        Args:
+            base (dict): Baseline energy, carbon, or cost data by year.
+            eff (dict): Efficient energy, carbon, or cost data by year.
+            energy_ben (float): Additional energy savings % benefit.
+
+        Returns:
+            Updated efficient energy, carbon, or cost data by year.
+        """
+        # Stack the data for all years into arrays with a year dimension
+        # (and a sample dimension, if applicable)
+        eff_arr = numpy.array(
+            [eff[yr] for yr in self.handyvars.aeo_years], dtype=float)
+        base_arr = numpy.array(
+            [base[yr] for yr in self.handyvars.aeo_years], dtype=float)
+        if base_arr.ndim < eff_arr.ndim:
+            base_arr = base_arr[:, numpy.newaxis]
+        # Determine the years in which the benefit would take the efficient
+        # value below zero (disallow these results)
+        clip_zero = (eff_arr > 0) & ((base_arr - eff_arr) * energy_ben >
+                                     eff_arr)
+        if clip_zero.ndim > 1:
+            clip_zero = numpy.all(clip_zero, axis=1)
+        eff_upd = eff_arr - (base_arr - eff_arr) * energy_ben
+
+        return {yr: 0 if clip_zero[ind] else eff_upd[ind] for ind, yr in
+                enumerate(self.handyvars.aeo_years)}
+
     def merge_out_break(self, pkg_brk, meas_brk, meas_brk_unnorm):
         """Merge output breakout data for an individual measure into a package.
 
@@ -4994,8 +5172,82 @@ class MeasurePackage(Measure):
         return pkg_brk
 
 
+def import_eplus_file(eplus_file_path, eplus_coltyp, cache_dir=None):
+    """Read an EnergyPlus performance CSV into a structured array.
+
+    Note:
+        If a cache directory is given, the parsed array is stored there as a
+        '.npy' file and reused in place of the CSV until the CSV is modified.
+
+    Args:
+        eplus_file_path (string): EnergyPlus performance file path.
+        eplus_coltyp (list): Expected EnergyPlus variable data types.
+        cache_dir (string): Optional directory for parsed '.npy' files.
+
+    Returns:
+        Structured array of EnergyPlus simulation results.
+    """
+    if cache_dir is not None:
+        cache_file = path.join(
+            cache_dir, path.basename(eplus_file_path) + '.npy')
+        if path.isfile(cache_file) and (
+                path.getmtime(cache_file) >= path.getmtime(eplus_file_path)):
+            eplus_file = numpy.load(cache_file)
+            if eplus_file.dtype == numpy.dtype(eplus_coltyp):
+                return eplus_file
+    eplus_file = numpy.genfromtxt(
+        eplus_file_path, names=True, dtype=eplus_coltyp, delimiter=",",
+        missing_values='')
+    if cache_dir is not None:
+        makedirs(cache_dir, exist_ok=True)
+        numpy.save(cache_file, eplus_file)
+    return eplus_file
+
+
+def out_break_maps(out_break_czones, out_break_bldgtypes, out_break_enduses):
+    """Invert the output breakout categories into direct lookup tables.
+
+    Args:
+        out_break_czones (OrderedDict): Maps measure climate zone names to
+            the climate zone categories used in summarizing measure outputs.
+        out_break_bldgtypes (OrderedDict): Maps measure building type names
+            to the building sector categories used in summarizing measure
+            outputs; each value is a structure type followed by building types.
+        out_break_enduses (OrderedDict): Maps measure end use names to the
+            end use categories used in summarizing measure outputs.
+
+    Returns:
+        Dicts mapping climate zone names, (building type, structure type)
+        pairs, and (end use, technology type or technology) pairs to the
+        output breakout categories they fall under.
+    """
+    czones_map = {cz: cz_out for cz_out, cz in out_break_czones.items()}
+    bldgtypes_map = {}
+    for bldg_out, bldg in out_break_bldgtypes.items():
+        for b in bldg[1:]:
+            bldgtypes_map[(b, bldg[0])] = bldg_out
+    # * Note: 'supply' side heating/cooling microsegments map to the
+    # 'Heating (Equip.)'/'Cooling (Equip.)' end uses, while 'demand'
+    # side heating/cooling microsegments map to the 'Envelope' end use;
+    # all other end uses are keyed with a technology type of None. The
+    # 'other (grid electric)' end use maps to the 'Refrigeration' output
+    # breakout for 'freezers' and to the 'Other' output breakout otherwise
+    enduses_map = {}
+    for eu_out, eu in out_break_enduses.items():
+        if eu_out in ["Heating (Equip.)", "Cooling (Equip.)"]:
+            tech_type = "supply"
+        elif eu_out == "Envelope":
+            tech_type = "demand"
+        else:
+            tech_type = None
+        for e in eu:
+            enduses_map[(e, tech_type)] = eu_out
+    enduses_map[("other (grid electric)", "freezers")] = "Refrigeration"
+    return czones_map, bldgtypes_map, enduses_map
+
+
 def prepare_measures(measures, convert_data, msegs, msegs_cpl, handyvars,
-                     cbecs_sf_byvint, base_dir, verbose):
+                     cbecs_sf_byvint, base_dir, verbose, eplus_cache=None):
     """Finalize measure markets for subsequent use in the analysis engine.
 
     Note:
@@ -5015,6 +5267,8 @@ def prepare_measures(measures, convert_data, msegs, msegs_cpl, handyvars,
         base_dir (string): Base directory.
         verbose (bool or NoneType): Determines whether to print all
             user warnings and messages.
+        eplus_cache (string): Optional directory in which to cache parsed
+            EnergyPlus performance files.
 
     Returns:
         A list of dicts, each including a set of measure attributes that has
@@ -5035,12 +5289,15 @@ def prepare_measures(measures, convert_data, msegs, msegs_cpl, handyvars,
         # Set default directory for EnergyPlus simulation output files
         eplus_dir = base_dir + '/ecm_definitions/energyplus_data'
         # Set EnergyPlus global variables
-        handyeplusvars = EPlusGlobals(eplus_dir, cbecs_sf_byvint)
+        handyeplusvars = EPlusGlobals(
+            eplus_dir, cbecs_sf_byvint, eplus_cache)
         # Fill in EnergyPlus-based measure performance information
         [m.fill_eplus(
             msegs, eplus_dir, handyeplusvars.eplus_coltypes,
-            handyeplusvars.eplus_files, handyeplusvars.eplus_vintage_weights,
-            handyeplusvars.eplus_basecols) for m in meas_update_objs
+            handyeplusvars.eplus_perf_files,
+            handyeplusvars.eplus_vintage_weights,
+            handyeplusvars.eplus_basecols,
+            handyeplusvars.eplus_data) for m in meas_update_objs
             if 'EnergyPlus file' in m.energy_efficiency.keys()]
 
     # Finalize 'markets' attribute for all Measure objects
@@ -5054,20 +5311,44 @@ def prepare_packages(packages, meas_update_objs, meas_summary,
                      handyvars, handyfiles, base_dir):
     """Combine multiple measures into a single packaged measure.
 
+    Note:
+        Contributing measures that have not already been initialized as
+        objects are loaded once and shared across all packages they
+        contribute to. Packages that do not include other packages being
+        prepared are merged concurrently in a pool of worker processes;
+        any remaining packages are then merged one at a time, each after
+        the packages it includes.
+
     Args:
         packages (dict): Names of packages and measures that comprise them.
-        measures (dict): Attributes of individual efficiency measures.
+        meas_update_objs (list): Previously prepared measure objects.
+        meas_summary (list): High-level summary data for all measures.
+        handyvars (object): Global variables of use across Measure methods.
+        handyfiles (object): File paths.
+        base_dir (string): Base directory.
 
     Returns:
         A dict with packaged measure attributes that can be added to the
         existing measures database.
     """
-    # Run through each unique measure package and merge the measures that
-    # contribute to this package
-    for p in packages:
-        # Notify user that measure is being updated
-        print("Updating ECM '" + p["name"] + "'...", end="", flush=True)
+    # Index high-level summary data by measure name
+    meas_summary_byname = {}
+    for x in meas_summary:
+        meas_summary_byname.setdefault(x["name"], []).append(x)
+    # Initialize contributing measure objects that are loaded from existing
+    # summary and competition data, shared across packages
+    meas_loaded = {}
+
+    def find_contrib_meas(p):
+        """Find the contributing measure objects for a package.
+
+        Args:
+            p (dict): Package name, contributing measure names, and benefits.
 
+        Returns:
+            List of contributing measure objects for the package, or None
+            if any of the contributing measures is invalid.
+        """
         # Establish a list of names for measures that contribute to the
         # package
         package_measures = p["contributing_ECMs"]
@@ -5079,89 +5360,245 @@ def prepare_packages(packages, meas_update_objs, meas_summary,
         # initialized as objects
         measures_to_add = [mc for mc in package_measures if mc not in [
             x.name for x in measure_list_package]]
-        # Initialize any missing contributing measure objects and add to
-        # the existing list of contributing measure objects for the package
+        # Initialize any missing contributing measure objects (or reuse
+        # those already initialized for another package) and add to the
+        # existing list of contributing measure objects for the package
         for m in measures_to_add:
-            # Load and set high level summary data for the missing measure
-            meas_summary_data = [x for x in meas_summary if x["name"] == m]
-            if len(meas_summary_data) == 1:
-                # Initialize the missing measure as an object
-                meas_obj = Measure(handyvars, **meas_summary_data[0])
-                # Reset measure technology type and total energy (used to
-                # normalize output breakout fractions) to their values in the
-                # high level summary data (reformatted during initialization)
-                meas_obj.technology_type = meas_summary_data[0][
-                    "technology_type"]
-                meas_obj.out_break_norm = meas_summary_data[0][
-                    "out_break_norm"]
-                # Assemble folder path for measure competition data
-                meas_folder_name = path.join(*handyfiles.ecm_compete_data)
-                # Assemble file name for measure competition data
-                meas_file_name = meas_obj.name + ".pkl.gz"
-                # Load and set competition data for the missing measure object
-                with gzip.open(path.join(base_dir, meas_folder_name,
-                                         meas_file_name), 'r') as zp:
-                    try:
-                        meas_comp_data = pickle.load(zp)
-                    except Exception as e:
-                        raise Exception(
-                            "Error reading in competition data of " +
-                            "contributing ECM '" + meas_obj.name +
-                            "' for package '" + p["name"] + "': " +
-                            str(e)) from None
-                for adopt_scheme in handyvars.adopt_schemes:
-                    meas_obj.markets[adopt_scheme]["master_mseg"] = \
-                        meas_summary_data[0]["markets"][adopt_scheme][
-                            "master_mseg"]
-                    meas_obj.markets[adopt_scheme]["mseg_adjust"] = \
-                        meas_comp_data[adopt_scheme]
-                    meas_obj.markets[adopt_scheme]["mseg_out_break"] = \
-                        meas_summary_data[0]["markets"][adopt_scheme][
-                            "mseg_out_break"]
-                # Add missing measure object to the existing list
-                measure_list_package.append(meas_obj)
-            # Raise an error if no existing data exist for the missing
-            # contributing measure
-            elif len(meas_summary_data) == 0:
-                raise ValueError(
-                    "Contributing ECM '" + m +
-                    "' cannot be added to package '" + p["name"] +
-                    "' due to missing attribute data for this ECM")
-            else:
-                raise ValueError(
-                    "More than one set of attribute data for " +
-                    "contributing ECM '" + m + "'; ECM cannot be added to" +
-                    "package '" + p["name"])
-
-        # Determine which (if any) measure objects that contribute to
-        # the package are invalid due to unacceptable input data sourcing
-        measure_list_package_rmv = [
-            x for x in measure_list_package if x.remove is True]
-
-        # Warn user of no valid measures to package
-        if len(measure_list_package_rmv) > 0:
+            if m not in meas_loaded:
+                meas_loaded[m] = load_contrib_meas(
+                    m, meas_summary_byname.get(m, []), p["name"],
+                    handyvars, handyfiles, base_dir)
+            measure_list_package.append(meas_loaded[m])
+
+        # Warn user of no valid measures to package if any measure objects
+        # that contribute to the package are invalid due to unacceptable
+        # input data sourcing
+        if any([x.remove is True for x in measure_list_package]):
+            print("Updating ECM '" + p["name"] + "'...", end="", flush=True)
             warnings.warn("WARNING (CRITICAL): Package '" + p["name"] +
                           "' removed due to invalid contributing ECM(s)")
-            packaged_measure = False
-        # Update package if valid contributing measures are available
+            return None
         else:
-            # Instantiate measure package object based on packaged measure
-            # subset above
-            packaged_measure = MeasurePackage(
-                measure_list_package, p["name"], p["benefits"], handyvars)
-            # Merge measures in the package object
-            packaged_measure.merge_measures()
-            # Print update on measure status
+            return measure_list_package
+
+    # Order the packages such that each package follows any packages it
+    # includes; packages that include other packages being prepared must be
+    # merged after those packages, while all other packages may be merged
+    # concurrently
+    pkg_names = [p["name"] for p in packages]
+    packages = sort_packages(packages)
+    pkgs_concurrent = [p for p in packages if not any([
+        x in pkg_names for x in p["contributing_ECMs"]])]
+    pkgs_sequential = [p for p in packages if not any([
+        p is x for x in pkgs_concurrent])]
+
+    # Determine the contributing measure objects for each package that may
+    # be merged concurrently
+    pkgs_to_merge = []
+    for p in pkgs_concurrent:
+        measure_list_package = find_contrib_meas(p)
+        if measure_list_package is not None:
+            pkgs_to_merge.append((measure_list_package, p))
+    # Instantiate measure package objects based on the packaged measure
+    # subsets above and merge the measures in each package object; only the
+    # contributing measure data needed to merge each package are passed to
+    # the worker processes
+    if len(pkgs_to_merge) > 1:
+        with ProcessPoolExecutor() as executor:
+            pkgs_merged = executor.map(
+                merge_package,
+                [[package_contrib_data(m) for m in x[0]] for
+                 x in pkgs_to_merge], [x[1] for x in pkgs_to_merge],
+                itertools.repeat(handyvars))
+            # Add the new packaged measures to the measure list for further
+            # evaluation like any other regular measure
+            for packaged_measure in pkgs_merged:
+                # Print update on measure status
+                print("Updating ECM '" + packaged_measure.name +
+                      "'...Success")
+                meas_update_objs.append(packaged_measure)
+    else:
+        pkgs_sequential = [x[1] for x in pkgs_to_merge] + pkgs_sequential
+
+    # Merge the remaining packages one at a time, adding each package to
+    # the measure list before determining the contributing measure objects
+    # for the next package, which may include it
+    for p in pkgs_sequential:
+        measure_list_package = find_contrib_meas(p)
+        if measure_list_package is not None:
+            print("Updating ECM '" + p["name"] + "'...", end="", flush=True)
+            meas_update_objs.append(
+                merge_package(measure_list_package, p, handyvars))
             print("Success")
 
-        # Add the new packaged measure to the measure list (if it exists)
-        # for further evaluation like any other regular measure
-        if packaged_measure is not False:
-            meas_update_objs.append(packaged_measure)
-
     return meas_update_objs
 
 
+def sort_packages(packages):
+    """Order packages such that each package follows the packages it includes.
+
+    Args:
+        packages (list): Package dicts with names and contributing measures.
+
+    Returns:
+        List of the package dicts, ordered such that any package included
+        in another package precedes that package; packages that do not
+        include one another are kept in their original order.
+
+    Raises:
+        ValueError: If a package includes itself (directly or through
+            the packages it includes).
+    """
+    pkgs_byname = {p["name"]: p for p in packages}
+    pkgs_sorted, pkgs_visiting, pkgs_visited = [], [], []
+
+    def visit(p):
+        """Add a package to the ordered list after the packages it includes.
+        """
+        if any([p is x for x in pkgs_visited]):
+            return
+        elif any([p is x for x in pkgs_visiting]):
+            raise ValueError(
+                "Package '" + p["name"] + "' cannot include itself")
+        pkgs_visiting.append(p)
+        for x in p["contributing_ECMs"]:
+            if x in pkgs_byname.keys():
+                visit(pkgs_byname[x])
+        pkgs_visiting.remove(p)
+        pkgs_visited.append(p)
+        pkgs_sorted.append(p)
+
+    for p in packages:
+        visit(p)
+
+    return pkgs_sorted
+
+
+def load_contrib_meas(m, meas_summary_data, pkg_name, handyvars, handyfiles,
+                      base_dir):
+    """Initialize a contributing measure from existing prepared data.
+
+    Args:
+        m (string): Contributing measure name.
+        meas_summary_data (list): High-level summary data matching the
+            contributing measure name.
+        pkg_name (string): Name of the package the measure contributes to.
+        handyvars (object): Global variables of use across Measure methods.
+        handyfiles (object): File paths.
+        base_dir (string): Base directory.
+
+    Returns:
+        Contributing measure object with high-level summary and competition
+        data set.
+
+    Raises:
+        ValueError: If there is not exactly one set of high-level summary
+            data for the contributing measure.
+    """
+    if len(meas_summary_data) == 1:
+        # Initialize the missing measure as an object
+        meas_obj = Measure(handyvars, **meas_summary_data[0])
+        # Reset measure technology type and total energy (used to
+        # normalize output breakout fractions) to their values in the
+        # high level summary data (reformatted during initialization)
+        meas_obj.technology_type = meas_summary_data[0]["technology_type"]
+        meas_obj.out_break_norm = meas_summary_data[0]["out_break_norm"]
+        # Assemble folder path for measure competition data
+        meas_folder_name = path.join(*handyfiles.ecm_compete_data)
+        # Assemble file name for measure competition data
+        meas_file_name = meas_obj.name + ".pkl.gz"
+        # Load and set competition data for the missing measure object
+        with gzip.open(path.join(base_dir, meas_folder_name,
+                                 meas_file_name), 'r') as zp:
+            try:
+                meas_comp_data = pickle.load(zp)
+            except Exception as e:
+                raise Exception(
+                    "Error reading in competition data of " +
+                    "contributing ECM '" + meas_obj.name +
+                    "' for package '" + pkg_name + "': " +
+                    str(e)) from None
+        for adopt_scheme in handyvars.adopt_schemes:
+            meas_obj.markets[adopt_scheme]["master_mseg"] = \
+                meas_summary_data[0]["markets"][adopt_scheme][
+                    "master_mseg"]
+            meas_obj.markets[adopt_scheme]["mseg_adjust"] = \
+                meas_comp_data[adopt_scheme]
+            meas_obj.markets[adopt_scheme]["mseg_out_break"] = \
+                meas_summary_data[0]["markets"][adopt_scheme][
+                    "mseg_out_break"]
+    # Raise an error if no existing data exist for the missing
+    # contributing measure
+    elif len(meas_summary_data) == 0:
+        raise ValueError(
+            "Contributing ECM '" + m +
+            "' cannot be added to package '" + pkg_name +
+            "' due to missing attribute data for this ECM")
+    else:
+        raise ValueError(
+            "More than one set of attribute data for " +
+            "contributing ECM '" + m + "'; ECM cannot be added to" +
+            "package '" + pkg_name)
+
+    return meas_obj
+
+
+def merge_package(measure_list_package, p, handyvars):
+    """Instantiate a measure package and merge its contributing measures.
+
+    Args:
+        measure_list_package (list): Contributing measure objects (or the
+            contributing measure data yielded by 'package_contrib_data').
+        p (dict): Package name, contributing measure names, and benefits.
+        handyvars (object): Global variables of use across Measure methods.
+
+    Returns:
+        Measure package object with merged markets data, with the names
+        of the contributing measures in place of the contributing measure
+        objects (which are not needed once merged).
+    """
+    # Instantiate measure package object based on packaged measure subset
+    packaged_measure = MeasurePackage(
+        measure_list_package, p["name"], p["benefits"], handyvars)
+    # Merge measures in the package object
+    packaged_measure.merge_measures()
+    # Replace the contributing measures with their names
+    packaged_measure.contributing_ECMs = [
+        x.name for x in measure_list_package]
+
+    return packaged_measure
+
+
+def package_contrib_data(m):
+    """Reduce a contributing measure to the data needed to package it.
+
+    Note:
+        Only the attributes of a contributing measure read in merging it
+        into a package are kept, such that the contributing measure's
+        other data (e.g., its master microsegments) are not copied to the
+        worker processes that merge packages concurrently.
+
+    Args:
+        m (object): Contributing measure object.
+
+    Returns:
+        Object with the contributing measure attributes needed to merge it
+        into a package; attribute values are shared with the measure.
+    """
+    return SimpleNamespace(
+        name=m.name, handyvars=m.handyvars, remove=m.remove,
+        market_entry_year=m.market_entry_year,
+        market_exit_year=m.market_exit_year, measure_type=m.measure_type,
+        climate_zone=m.climate_zone, bldg_type=m.bldg_type,
+        structure_type=m.structure_type, fuel_type=m.fuel_type,
+        end_use=m.end_use, technology=m.technology,
+        technology_type=m.technology_type, out_break_norm=m.out_break_norm,
+        markets={adopt_scheme: {
+            "mseg_adjust": m.markets[adopt_scheme]["mseg_adjust"],
+            "mseg_out_break": m.markets[adopt_scheme]["mseg_out_break"]} for
+            adopt_scheme in m.handyvars.adopt_schemes})
+
+
 def split_clean_data(meas_prepped_objs):
     """Reorganize and remove data from input Measure objects.
 
@@ -5209,10 +5646,12 @@ def split_clean_data(meas_prepped_objs):
         # analysis engine)
         del m.handyvars
         # For measure packages, replace 'contributing_ECMs'
-        # objects list with a list of these measures' names
+        # objects list with a list of these measures' names (if
+        # not already replaced in merging the package)
         if isinstance(m, MeasurePackage):
             m.contributing_ECMs = [
-                x.name for x in m.contributing_ECMs]
+                x if isinstance(x, str) else x.name for
+                x in m.contributing_ECMs]
         # Append updated measure __dict__ attribute to list of
         # summary data across all measures
         meas_prepped_summary.append(m.__dict__)
@@ -5220,6 +5659,85 @@ def split_clean_data(meas_prepped_objs):
     return meas_prepped_compete, meas_prepped_summary
 
 
+def read_meas_summary(store_dir, summary_file):
+    """Read prepared high-level measure data from the measure summary store.
+
+    Note:
+        The store holds one JSON file per measure, named after the measure,
+        and a manifest file listing the names of all measures in order. If
+        the store does not yet exist, data are read from a single JSON file
+        of all measures as written by previous versions of this routine.
+        This function is shared with the analysis engine ('run.py').
+
+    Args:
+        store_dir (string): Path to the measure summary store directory.
+        summary_file (string): Path to the single JSON file of all measures
+            read if the measure summary store does not exist.
+
+    Returns:
+        List of high-level measure data dicts and the time at which the
+        data were last written (zero if no data exist).
+
+    Raises:
+        ValueError: If a measure summary data file cannot be read.
+    """
+    manifest = path.join(store_dir, "manifest.json")
+    # Set the list of files to read in (measure summary store files or,
+    # if the store does not exist, the single file of all measures)
+    if isfile(manifest):
+        with open(manifest, 'r') as mf:
+            meas_files = [path.join(store_dir, x + ".json") for
+                          x in json.load(mf)]
+        last_written = stat(manifest).st_mtime
+    elif isfile(summary_file):
+        meas_files = [summary_file]
+        last_written = stat(summary_file).st_mtime
+    else:
+        meas_files, last_written = [], 0
+
+    meas_summary = []
+    for f in meas_files:
+        with open(f, 'r') as es:
+            try:
+                meas_data = json.load(es)
+            except ValueError as e:
+                raise ValueError(
+                    "Error reading in '" + f + "': " + str(e)) from None
+        if isinstance(meas_data, list):
+            meas_summary.extend(meas_data)
+        else:
+            meas_summary.append(meas_data)
+
+    return meas_summary, last_written
+
+
+def write_meas_summary(store_dir, meas_summary, meas_names_upd):
+    """Write prepared high-level measure data to the measure summary store.
+
+    Note:
+        Only the files for updated measures (or for all measures, if the
+        store does not yet exist) are rewritten, along with the manifest.
+
+    Args:
+        store_dir (string): Path to the measure summary store directory.
+        meas_summary (list): High-level data for all measures.
+        meas_names_upd (list): Names of measures with updated data.
+    """
+    manifest = path.join(store_dir, "manifest.json")
+    if not isfile(manifest):
+        makedirs(store_dir, exist_ok=True)
+        meas_names_upd = [m["name"] for m in meas_summary]
+    meas_names_upd = set(meas_names_upd)
+    for m in meas_summary:
+        if m["name"] in meas_names_upd:
+            with open(path.join(store_dir, m["name"] + ".json"), "w") as jso:
+                json.dump(m, jso, indent=2, cls=MyEncoder)
+    # Write the manifest last, such that its time stamp reflects the time
+    # at which all measure data were written
+    with open(manifest, "w") as jso:
+        json.dump([m["name"] for m in meas_summary], jso, indent=2)
+
+
 def custom_formatwarning(msg, *a):
     """Given a warning object, return only the warning message."""
     return str(msg) + '\n'
@@ -5267,21 +5785,13 @@ def main(base_dir):
     # Instantiate useful variables object
     handyvars = UsefulVars(base_dir, handyfiles)
 
-    # Import file to write prepared measure attributes data to for
-    # subsequent use in the analysis engine (if file does not exist,
-    # provide empty list as substitute, since file will be created
-    # later when writing ECM data)
-    try:
-        es = open(path.join(base_dir, *handyfiles.ecm_prep), 'r')
-        try:
-            meas_summary = json.load(es)
-        except ValueError as e:
-            raise ValueError(
-                "Error reading in '" + handyfiles.ecm_prep +
-                "': " + str(e)) from None
-        es.close()
-    except FileNotFoundError:
-        meas_summary = []
+    # Import prepared measure attributes data to update for subsequent use
+    # in the analysis engine, and the time at which these data were last
+    # written (if no data exist, provide empty list as substitute, since
+    # data will be created later when writing ECM data)
+    meas_summary, meas_summary_mtime = read_meas_summary(
+        path.join(base_dir, *handyfiles.ecm_prep_store),
+        path.join(base_dir, *handyfiles.ecm_prep))
 
     # Determine which individual and package measure definitions
     # require further preparation for use in the analysis engine
@@ -5290,41 +5800,37 @@ def main(base_dir):
     # not already been fully prepared for use in the analysis engine) or
     # have been edited since last the 'ecm_prep.py' routine was run
 
+    # Index the names of measures with prepared high-level data and the
+    # names of measures with prepared competition data (once, for use in
+    # checking each measure definition below)
+    meas_summary_names = set([x["name"] for x in meas_summary])
+    meas_compete_names = set([
+        x[:-len(".pkl.gz")] for x in listdir(path.join(
+            *handyfiles.ecm_compete_data)) if x.endswith(".pkl.gz")])
+    # Catalog the individual measure JSONs; only those JSONs that are new or
+    # were edited since the catalog was last updated are read in
+    meas_catalog = ecm_catalog.ECMCatalog(
+        path.join(base_dir, handyfiles.indiv_ecms),
+        path.join(base_dir, *handyfiles.ecm_catalog))
     # Determine full list of individual measure JSON names
+    meas_indiv_names = [
+        x for x in meas_catalog.entries.keys() if 'package' not in x]
+    # Determine which measure definitions should be added to the list of
+    # measure definitions to update. Add a measure definition to the list
+    # requiring further prepartion if: a) measure name is not already
+    # included in database of prepared measure attributes (in the
+    # '/supporting_data/ecm_prep' folder); b) measure does not already have
+    # competition data prepared for it (in
+    # '/supporting_data/ecm_competition_data' folder), or c) measure JSON
+    # time stamp indicates it has been modified since the last run of
+    # 'ecm_prep.py'
     meas_toprep_indiv_names = [
-        x for x in listdir(handyfiles.indiv_ecms) if x.endswith(".json") and
-        'package' not in x]
-    # Initialize list of individual measures to prepare
-    meas_toprep_indiv = []
-    # Import all individual measure JSONs
-    for mi in meas_toprep_indiv_names:
-        with open(path.join(base_dir, handyfiles.indiv_ecms, mi), 'r') as jsf:
-            try:
-                # Load each JSON into a dict
-                meas_dict = json.load(jsf)
-                # Determine whether dict should be added to list of measure
-                # definitions to update. Add a measure dict to the list
-                # requiring further prepartion if: a) measure name is not
-                # already included in database of prepared measure attributes
-                # ('ecm_prep.json'); b) measure does not already have
-                # competition data prepared for it (in
-                # '/supporting_data/ecm_competition_data' folder), or
-                # c) measure JSON time stamp indicates it has been modified
-                # since the last run of 'ecm_prep.py'
-                if all([meas_dict["name"] != y["name"] for
-                       y in meas_summary]) or \
-                   all([meas_dict["name"] not in y for y in listdir(
-                        path.join(*handyfiles.ecm_compete_data))]) or \
-                   (stat(path.join(handyfiles.indiv_ecms, mi)).st_mtime >
-                    stat(path.join(
-                        "supporting_data", "ecm_prep.json")).st_mtime):
-                    # Append measure dict to list of measure definitions
-                    # to update if it meets the above criteria
-                    meas_toprep_indiv.append(meas_dict)
-            except ValueError as e:
-                raise ValueError(
-                    "Error reading in ECM '" + mi + "': " +
-                    str(e)) from None
+        mi for mi in meas_indiv_names if
+        meas_catalog.entries[mi]["name"] not in meas_summary_names or
+        meas_catalog.entries[mi]["name"] not in meas_compete_names or
+        meas_catalog.entries[mi]["mtime"] > meas_summary_mtime]
+    # Import the measure definitions to update
+    meas_toprep_indiv = meas_catalog.load(meas_toprep_indiv_names)
 
     # Find package measure definitions that are new or were edited since
     # the last time 'ecm_prep.py' routine was run, or are comprised of
@@ -5341,25 +5847,27 @@ def main(base_dir):
                 "': " + str(e)) from None
     # Initialize list of measure package dicts to prepare
     meas_toprep_package = []
-    # Identify all previously prepared measure packages
-    meas_prepped_pkgs = [
-        mpkg for mpkg in meas_summary if "contributing_ECMs" in mpkg.keys()]
+    # Identify all previously prepared measure packages, indexed by name
+    meas_prepped_pkgs = {}
+    for mpkg in meas_summary:
+        if "contributing_ECMs" in mpkg.keys():
+            meas_prepped_pkgs.setdefault(mpkg["name"], []).append(mpkg)
+    # Set the names of individual measures to prepare
+    meas_toprep_indiv_upd = set([x["name"] for x in meas_toprep_indiv])
     # Loop through each package dict in the current list and determine which
     # of these package measures require further preparation
     for m in meas_toprep_package_init:
         # Determine the subset of previously prepared package measures
         # with the same name as the current package measure
-        m_exist = [
-            me for me in meas_prepped_pkgs if me["name"] == m["name"]]
+        m_exist = meas_prepped_pkgs.get(m["name"], [])
         # Add a package dict to the list requiring further prepartion if:
         # a) any of the package's contributing measures have been updated,
         # b) the package is new, c) package does not already have competition
         # data prepared for it; or d) package "contributing_ECMs" and/or
         # "benefits" parameters have been edited from a previous version
-        if any([x["name"] in m["contributing_ECMs"] for
-                x in meas_toprep_indiv]) or len(m_exist) == 0 or \
-            all([m["name"] not in y for y in listdir(path.join(
-                *handyfiles.ecm_compete_data))]) or (
+        if any([x in meas_toprep_indiv_upd for
+                x in m["contributing_ECMs"]]) or len(m_exist) == 0 or \
+            m["name"] not in meas_compete_names or (
                 len(m_exist) == 1 and any([m[x] != m_exist[0][x] for x in [
                     "contributing_ECMs", "benefits"]])):
             meas_toprep_package.append(m)
@@ -5427,7 +5935,7 @@ def main(base_dir):
         # Prepare new or edited measures for use in analysis engine
         meas_prepped_objs = prepare_measures(
             meas_toprep_indiv, convert_data, msegs, msegs_cpl, handyvars,
-            cbecs_sf_byvint, base_dir, options.verbose)
+            cbecs_sf_byvint, base_dir, options.verbose, options.eplus_cache)
 
         # Prepare measure packages for use in analysis engine (if needed)
         if meas_toprep_package:
@@ -5441,16 +5949,19 @@ def main(base_dir):
         meas_prepped_compete, meas_prepped_summary = split_clean_data(
             meas_prepped_objs)
 
+        # Index existing high-level measure data by measure name
+        meas_summary_byname = {x["name"]: x for x in meas_summary}
         # Add all prepared high-level measure information to existing
         # high-level data and to list of active measures for analysis
         for m in meas_prepped_summary:
             # Measure has been prepared from existing case (replace
             # high-level data for measure)
-            if m["name"] in [x["name"] for x in meas_summary]:
-                [x.update(m) for x in meas_summary if x["name"] == m["name"]]
+            if m["name"] in meas_summary_byname:
+                meas_summary_byname[m["name"]].update(m)
             # Measure is new (add high-level data for measure)
             else:
                 meas_summary.append(m)
+                meas_summary_byname[m["name"]] = m
             # Measure not already in active measures list (add name to list)
             if m["name"] not in run_setup["active"]:
                 run_setup["active"].append(m["name"])
@@ -5471,9 +5982,11 @@ def main(base_dir):
             with gzip.open(path.join(
                     base_dir, meas_folder_name, meas_file_name), 'w') as zp:
                 pickle.dump(meas_prepped_compete[ind], zp, -1)
-        # Write prepared high-level measure attributes data to JSON
-        with open(path.join(base_dir, *handyfiles.ecm_prep), "w") as jso:
-            json.dump(meas_summary, jso, indent=2, cls=MyEncoder)
+        # Write prepared high-level measure attributes data to JSON (only
+        # the data for measures that were prepared are rewritten)
+        write_meas_summary(
+            path.join(base_dir, *handyfiles.ecm_prep_store), meas_summary,
+            [m["name"] for m in meas_prepped_summary])
 
         # Write any newly prepared measure names to the list of active
         # measures to be run in the analysis engine
@@ -5490,6 +6003,9 @@ if __name__ == "__main__":
     parser = OptionParser()
     parser.add_option("-v", action="store_true", dest="verbose",
                       help="print all warnings to stdout")
+    parser.add_option("--eplus_cache", dest="eplus_cache", default=None,
+                      help="directory in which to cache parsed EnergyPlus "
+                           "performance files")
     (options, args) = parser.parse_args()
     # Set current working directory
     base_dir = getcwd()
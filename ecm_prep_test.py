@@ -12,6 +12,7 @@ from collections import OrderedDict
 import warnings
 import copy
 import itertools
+import tempfile
 
 
 class CommonMethods(object):
@@ -115,6 +116,20 @@ class EPlusGlobalsTest(unittest.TestCase, CommonMethods):
             self.eplus_globals_ok.find_vintage_weights(),
             self.ok_out_weights)
 
+    def test_vintageweights_init(self):
+        """Test vintage weights set when EPlusGlobals object is instantiated.
+
+        Note:
+            Ensure the EnergyPlus building vintage weights used to prepare
+            measures are available as an attribute of the EPlusGlobals object.
+
+        Raises:
+            AssertionError: If function yields unexpected results.
+        """
+        self.dict_check(
+            self.eplus_globals_ok.eplus_vintage_weights,
+            self.ok_out_weights)
+
     # Test that an error is raised when unexpected eplus vintages are present
     def test_vintageweights_fail(self):
         """Test find_vintage_weights function given invalid inputs.
@@ -150,6 +165,9 @@ class EPlusUpdateTest(unittest.TestCase, CommonMethods):
         mseg_in (dict): Sample baseline microsegment stock/energy data.
         ok_eplus_vintagewts (dict): Sample EnergyPlus vintage weights.
         ok_eplusfiles_in (list): List of all EnergyPlus simulation file names.
+        eplusfiles_in_fullpaths (list): Full paths of EnergyPlus simulation
+            files that are relevant to the sample measure.
+        cbecs_sf_byvint (dict): Commercial square footage by vintage data.
         ok_perfarray_in (numpy recarray): Valid structured array of
             EnergyPlus-based relative savings data.
         fail_perfarray_in (numpy recarray): Invalid structured array of
@@ -424,13 +442,21 @@ class EPlusUpdateTest(unittest.TestCase, CommonMethods):
             "smallhotel_scout_2016-07-23-16-25-59.csv",
             "hospital_scout_2016-07-23-16-25-59.csv"]
         # Set full paths for EnergyPlus files that are relevant to the measure
-        eplusfiles_in_fullpaths = [cls.eplus_dir + '/' + x for x in [
+        cls.eplusfiles_in_fullpaths = [cls.eplus_dir + '/' + x for x in [
             "secondaryschool_scout_2016-07-23-16-25-59.csv",
             "primaryschool_scout_2016-07-23-16-25-59.csv",
             "hospital_scout_2016-07-23-16-25-59.csv"]]
         # Use 'build_array' to generate test input data for 'fill_eplus'
         cls.ok_perfarray_in = cls.meas.build_array(
-            cls.eplus_coltypes, eplusfiles_in_fullpaths)
+            cls.eplus_coltypes, cls.eplusfiles_in_fullpaths)
+        # Set sample EnergyPlus global variables with previously parsed
+        # EnergyPlus files for use in 'build_array'
+        cls.cbecs_sf_byvint = {
+            '2004 to 2007': 6524.0, '1960 to 1969': 10362.0,
+            '1946 to 1959': 7381.0, '1970 to 1979': 10846.0,
+            '1990 to 1999': 13803.0, '2000 to 2003': 7215.0,
+            'Before 1920': 3980.0, '2008 to 2012': 5726.0,
+            '1920 to 1945': 6020.0, '1980 to 1989': 15185.0}
         cls.fail_perfarray_in = numpy.rec.array([
             ('BA-MixedHumid', 'SecondarySchool', '90.1-2013', 'Success',
              0, 0.5, 0.5, 0.25, 0.25, 0, 0.25, 0.75, 0, -0.1, 0.1, 0.5, -0.2),
@@ -618,6 +644,28 @@ class EPlusUpdateTest(unittest.TestCase, CommonMethods):
             [self.ok_perfarray_in.dtype.names, len(self.ok_perfarray_in)],
             [self.ok_arraynames_out, self.ok_array_length_out])
 
+    def test_array_build_indexed(self):
+        """Test 'build_array' function given previously parsed inputs.
+
+        Note:
+            Ensure that selecting rows from indexed EnergyPlus files, parsed
+            once up front and cached to disk, yields the same array as
+            parsing and filtering each file directly.
+
+        Raises:
+            AssertionError: If function yields unexpected results.
+        """
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Second pass reads the parsed files back from the cache
+            for n in range(2):
+                eplus_data = ecm_prep.EPlusGlobals(
+                    self.eplus_dir, self.cbecs_sf_byvint,
+                    cache_dir).eplus_data
+                numpy.testing.assert_array_equal(
+                    self.meas.build_array(
+                        self.eplus_coltypes, self.eplusfiles_in_fullpaths,
+                        eplus_data), self.ok_perfarray_in)
+
     def test_dict_creation(self):
         """Test 'create_perf_dict' function given valid inputs.
 
@@ -8432,6 +8480,10 @@ class CreateKeyChainTest(unittest.TestCase, CommonMethods):
             be yielded by the function given valid inputs.
         ok_out_secondary (list): Secondary microsegment key chain that
             should be yielded by the function given valid inputs.
+        sample_mseg_in (dict): Sample baseline stock/energy data.
+        sample_cpl_in (dict): Sample baseline cost/performance/lifetime data.
+        ok_out_primary_pruned (list): Primary microsegment key chains that
+            should be yielded by the function given sample baseline data.
     """
 
     @classmethod
@@ -8587,6 +8639,50 @@ class CreateKeyChainTest(unittest.TestCase, CommonMethods):
             ('primary', 'AIA_CZ2', 'single family home',
              'electricity', 'cooling', 'supply', 'room AC',
              'existing')]
+        # Sample baseline data in which only some of the measure's primary
+        # key chains are found
+        cls.sample_mseg_in = {
+            "AIA_CZ1": {
+                "single family home": {
+                    "electricity": {
+                        "heating": {
+                            "supply": {
+                                "resistance heat": {
+                                    "stock": "NA", "energy": {}},
+                                "ASHP": {"stock": "NA", "energy": {}}}},
+                        "cooling": {
+                            "supply": {
+                                "ASHP": {"stock": "NA", "energy": {}},
+                                "room AC": {"stock": "NA"}}}}}},
+            "AIA_CZ2": {
+                "single family home": {
+                    "electricity": {
+                        "cooling": {
+                            "supply": {
+                                "room AC": {
+                                    "stock": "NA", "energy": {}}}}}}}}
+        cls.sample_cpl_in = copy.deepcopy(cls.sample_mseg_in)
+        del cls.sample_cpl_in["AIA_CZ1"]["single family home"][
+            "electricity"]["cooling"]
+        cls.ok_out_primary_pruned = [
+            ('primary', 'AIA_CZ1', 'single family home',
+             'electricity', 'heating', 'supply',
+             'resistance heat', 'new'),
+            ('primary', 'AIA_CZ1', 'single family home',
+             'electricity', 'heating', 'supply', 'ASHP',
+             'new'),
+            ('primary', 'AIA_CZ2', 'single family home',
+             'electricity', 'cooling', 'supply', 'room AC',
+             'new'),
+            ('primary', 'AIA_CZ1', 'single family home',
+             'electricity', 'heating', 'supply',
+             'resistance heat', 'existing'),
+            ('primary', 'AIA_CZ1', 'single family home',
+             'electricity', 'heating', 'supply', 'ASHP',
+             'existing'),
+            ('primary', 'AIA_CZ2', 'single family home',
+             'electricity', 'cooling', 'supply', 'room AC',
+             'existing')]
         cls.ok_out_secondary = [
             ('secondary', 'AIA_CZ1', 'single family home',
              'electricity', 'lighting',
@@ -8611,7 +8707,7 @@ class CreateKeyChainTest(unittest.TestCase, CommonMethods):
             AssertionError: If function yields unexpected results.
         """
         self.assertEqual(
-            self.sample_measure_in.create_keychain("primary")[0],
+            list(self.sample_measure_in.create_keychain("primary")[0]),
             self.ok_out_primary)
 
     # Test the generation of a list of secondary mseg key chains
@@ -8625,9 +8721,25 @@ class CreateKeyChainTest(unittest.TestCase, CommonMethods):
             AssertionError: If function yields unexpected results.
         """
         self.assertEqual(
-            self.sample_measure_in.create_keychain("secondary")[0],
+            list(self.sample_measure_in.create_keychain("secondary")[0]),
             self.ok_out_secondary)
 
+    def test_pruned(self):
+        """Test 'create_keychain' function given baseline data to check.
+
+        Note:
+            Tests that key chains not found in the baseline data are
+            dropped from the generated key chains.
+
+        Raises:
+            AssertionError: If function yields unexpected results.
+        """
+        mskeys_out, ms_lists_out, keys_cand_out = \
+            self.sample_measure_in.create_keychain(
+                "primary", self.sample_mseg_in, self.sample_cpl_in)
+        self.assertEqual(list(mskeys_out), self.ok_out_primary_pruned)
+        self.assertEqual(keys_cand_out, len(self.ok_out_primary))
+
 
 class AddKeyValsTest(unittest.TestCase, CommonMethods):
     """Test 'add_keyvals' and 'add_keyvals_restrict' functions.
@@ -9787,12 +9899,14 @@ class UpdateMeasuresTest(unittest.TestCase, CommonMethods):
 
 
 class MergeMeasuresandApplyBenefitsTest(unittest.TestCase, CommonMethods):
-    """Test 'merge_measures' and 'apply_pkg_benefits' functions.
+    """Test 'merge_measures', 'apply_pkg_benefits', and 'prepare_packages'.
 
     Ensure that the 'merge_measures' function correctly assembles a series of
     attributes for individual measures into attributes for a packaged measure,
-    and that the 'apply_pkg_benefits' function correctly applies additional
-    energy savings and installed cost benefits for a package measure.
+    that the 'apply_pkg_benefits' function correctly applies additional
+    energy savings and installed cost benefits for a package measure, and
+    that the 'prepare_packages' function correctly loads contributing
+    measures and merges packages, including packages of other packages.
 
     Attributes:
         sample_measures_in (list): List of valid sample measure attributes
@@ -14494,6 +14608,101 @@ class MergeMeasuresandApplyBenefitsTest(unittest.TestCase, CommonMethods):
         self.dict_check(
             self.sample_package_in_test1.markets, self.markets_ok_out_test1)
 
+    def test_merge_measure_contrib_unchanged(self):
+        """Test 'merge_measures' function leaves contributing measures as is.
+
+        Raises:
+            AssertionError: If contributing measure markets are modified.
+        """
+        markets_in = [
+            copy.deepcopy(m.markets) for m in self.sample_measures_in]
+        ecm_prep.MeasurePackage(
+            self.sample_measures_in, self.sample_package_name,
+            self.sample_package_in_test1.benefits,
+            self.sample_package_in_test1.handyvars).merge_measures()
+        for ind, m in enumerate(self.sample_measures_in):
+            self.dict_check(m.markets, markets_in[ind])
+
+    def test_prepare_nested_packages(self):
+        """Test 'prepare_packages' function given packages of packages.
+
+        Note:
+            Ensure that contributing measures not yet initialized are loaded
+            from their existing summary and competition data, and that
+            packages including other packages are merged after the packages
+            they include, regardless of the order in which they are listed.
+
+        Raises:
+            AssertionError: If function yields unexpected results.
+        """
+        handyvars = self.sample_package_in_test1.handyvars
+        handyfiles = ecm_prep.UsefulInputFiles()
+        benefits = self.sample_package_in_test1.benefits
+        meas_names = [m.name for m in self.sample_measures_in]
+        # Packages of packages are listed ahead of the packages they include
+        packages = [
+            {"name": "Package 4", "contributing_ECMs": ["Package 3"],
+             "benefits": benefits},
+            {"name": "Package 3", "contributing_ECMs": ["Package 2"],
+             "benefits": benefits},
+            {"name": "Package 2", "contributing_ECMs": meas_names,
+             "benefits": benefits},
+            {"name": "Package 2b", "contributing_ECMs": meas_names,
+             "benefits": benefits}]
+        with tempfile.TemporaryDirectory() as base_dir:
+            # Write existing summary and competition data for the sample
+            # measures, which are not initialized as objects
+            meas_summary = []
+            compete_dir = os.path.join(
+                base_dir, *handyfiles.ecm_compete_data)
+            os.makedirs(compete_dir)
+            for m in self.sample_measures_in:
+                meas_summary.append(copy.deepcopy({
+                    k: v for k, v in m.__dict__.items() if
+                    k != "handyvars"}))
+                with ecm_prep.gzip.open(os.path.join(
+                        compete_dir, m.name + ".pkl.gz"), 'w') as zp:
+                    ecm_prep.pickle.dump({
+                        x: m.markets[x]["mseg_adjust"] for
+                        x in handyvars.adopt_schemes}, zp)
+            meas_objs = ecm_prep.prepare_packages(
+                packages, [], meas_summary, handyvars, handyfiles, base_dir)
+        # Check that each package is merged once, after the packages it
+        # includes, and references its contributing measures by name
+        self.assertEqual(
+            [m.name for m in meas_objs],
+            ["Package 2", "Package 2b", "Package 3", "Package 4"])
+        self.assertEqual(
+            [m.contributing_ECMs for m in meas_objs],
+            [meas_names, meas_names, ["Package 2"], ["Package 3"]])
+        # Check for correct markets for the packages of the sample measures
+        for m in meas_objs[:2]:
+            self.dict_check(m.markets, self.markets_ok_out_test1)
+
+    def test_prepare_packages_fail(self):
+        """Test 'prepare_packages' function given invalid packages.
+
+        Note:
+            Ensure that a ValueError is raised when a package includes a
+            measure without existing data or includes itself.
+
+        Raises:
+            AssertionError: If ValueError is not raised.
+        """
+        handyvars = self.sample_package_in_test1.handyvars
+        benefits = self.sample_package_in_test1.benefits
+        for packages in [
+                [{"name": "Package 5", "contributing_ECMs": ["missing"],
+                  "benefits": benefits}],
+                [{"name": "Package 6", "contributing_ECMs": ["Package 7"],
+                  "benefits": benefits},
+                 {"name": "Package 7", "contributing_ECMs": ["Package 6"],
+                  "benefits": benefits}]]:
+            with self.assertRaises(ValueError):
+                ecm_prep.prepare_packages(
+                    packages, list(self.sample_measures_in), [], handyvars,
+                    ecm_prep.UsefulInputFiles(), os.getcwd())
+
     def test_apply_pkg_benefits(self):
         """Test 'apply_pkg_benefits' function given valid inputs."""
         self.dict_check(
@@ -14501,6 +14710,20 @@ class MergeMeasuresandApplyBenefitsTest(unittest.TestCase, CommonMethods):
                 self.mseg_ok_in_test2),
             self.mseg_ok_out_test2)
 
+    def test_apply_pkg_energy_ben_arrays(self):
+        """Test 'apply_pkg_energy_ben' function given sampled inputs.
+
+        Note:
+            Ensure that efficient values are set to zero only in years where
+            the benefit takes all samples below zero.
+        """
+        eff_out = self.sample_package_in_test2.apply_pkg_energy_ben(
+            {"2009": 10, "2010": 10},
+            {"2009": numpy.array([1, 2]), "2010": numpy.array([8, 9])}, 0.5)
+        self.assertEqual(eff_out["2009"], 0)
+        numpy.testing.assert_array_almost_equal(
+            eff_out["2010"], numpy.array([7, 8.5]))
+
 
 class CleanUpTest(unittest.TestCase, CommonMethods):
     """Test 'split_clean_data' function.
@@ -14653,6 +14876,106 @@ class CleanUpTest(unittest.TestCase, CommonMethods):
                         "contributing_ECMs"], self.sample_pkg_meas_names)
 
 
+class MeasSummaryStoreTest(unittest.TestCase):
+    """Test 'write_meas_summary' and 'read_meas_summary' functions.
+
+    Ensure that high-level measure data are written to and read back from
+    the measure summary store, and that only updated measures are rewritten.
+
+    Attributes:
+        handyfiles (object): File paths.
+        sample_summary_in (list): Sample high-level measure data.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Define variables and objects for use across all class functions."""
+        cls.handyfiles = ecm_prep.UsefulInputFiles()
+        cls.sample_summary_in = [
+            {"name": "sample measure 1", "remove": False,
+             "out_break_norm": {"2009": 1, "2010": numpy.array([2, 3])}},
+            {"name": "sample measure 2", "remove": True,
+             "out_break_norm": {"2009": 4, "2010": 5}}]
+
+    def test_write_read(self):
+        """Test round trip of measure data and partial rewrite of the store.
+
+        Raises:
+            AssertionError: If function yields unexpected results.
+        """
+        with tempfile.TemporaryDirectory() as base_dir:
+            store_dir = os.path.join(base_dir, *self.handyfiles.ecm_prep_store)
+            summary_file = os.path.join(base_dir, *self.handyfiles.ecm_prep)
+            # No existing data
+            self.assertEqual(ecm_prep.read_meas_summary(
+                store_dir, summary_file), ([], 0))
+            meas_summary = copy.deepcopy(self.sample_summary_in)
+            ecm_prep.write_meas_summary(store_dir, meas_summary, [])
+            meas_summary_out, mtime = ecm_prep.read_meas_summary(
+                store_dir, summary_file)
+            self.assertEqual(
+                [m["name"] for m in meas_summary_out],
+                ["sample measure 1", "sample measure 2"])
+            self.assertEqual(meas_summary_out[0]["out_break_norm"],
+                             {"2009": 1, "2010": [2, 3]})
+            self.assertGreater(mtime, 0)
+            # Update the data for both measures, but only flag the second
+            # measure as updated; add a third measure
+            for m in meas_summary:
+                m["remove"] = None
+            meas_summary.append({"name": "sample measure 3"})
+            ecm_prep.write_meas_summary(
+                store_dir, meas_summary,
+                ["sample measure 2", "sample measure 3"])
+            meas_summary_out, mtime = ecm_prep.read_meas_summary(
+                store_dir, summary_file)
+            self.assertEqual(
+                [m.get("remove", "NA") for m in meas_summary_out],
+                [False, None, "NA"])
+
+
+class OutBreakMapsTest(unittest.TestCase):
+    """Test 'out_break_maps' function.
+
+    Ensure that the output breakout categories are correctly inverted into
+    lookup tables keyed by climate zone, building/structure type, and end
+    use/technology type (or technology).
+
+    Attributes:
+        handyvars (object): Global variables, including output breakouts.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Define variables and objects for use across all class functions."""
+        base_dir = os.getcwd()
+        cls.handyvars = ecm_prep.UsefulVars(
+            base_dir, ecm_prep.UsefulInputFiles())
+
+    def test_maps(self):
+        """Test outputs given valid inputs.
+
+        Raises:
+            AssertionError: If function yields unexpected results.
+        """
+        czones_map, bldgtypes_map, enduses_map = ecm_prep.out_break_maps(
+            self.handyvars.out_break_czones,
+            self.handyvars.out_break_bldgtypes,
+            self.handyvars.out_break_enduses)
+        self.assertEqual(czones_map["AIA_CZ1"], "AIA CZ1")
+        self.assertEqual(bldgtypes_map[("single family home", "new")],
+                         "Residential (New)")
+        self.assertEqual(enduses_map[("heating", "supply")],
+                         "Heating (Equip.)")
+        self.assertEqual(enduses_map[("heating", "demand")], "Envelope")
+        self.assertEqual(enduses_map[("lighting", None)], "Lighting")
+        self.assertEqual(
+            enduses_map[("other (grid electric)", "freezers")],
+            "Refrigeration")
+        self.assertEqual(enduses_map[("other (grid electric)", None)],
+                         "Other")
+
+
 # Offer external code execution (include all lines below this point in all
 # test files)
 def main():
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+
+"""Import EIA AEO text data files into numpy structured arrays
+
+This module provides the functions shared by the residential and
+commercial microsegment and technology data scripts to read the EIA
+AEO text data files (e.g., RESDBOUT, KSDOUT, KDBOUT, ktek, and kprem).
+Each file is read in a single pass, in chunks; NULL characters that
+appear in some of the files are removed as each chunk is read, and the
+rows parsed from the file are written into a structured array a block
+of rows at a time, with each column converted to its data type for the
+entire block at once.
+
+The arrays parsed from each data file can also be stored in a cache
+folder, shared by all of the scripts that import the same files, as
+NumPy binary (.npy) files keyed by a hash of the contents of the data
+file and the way it was imported. Parsed arrays found in the cache are
+memory-mapped instead of parsing the data file again.
+
+The rows of the imported arrays can be indexed by the values in a set
+of key columns, such that the rows for each microsegment are found by
+look-up instead of by comparing every row of the array to the values
+for the microsegment.
+"""
+
+import csv
+import os
+import hashlib
+import marshal
+import itertools
+import numpy as np
+
+# Folder in which parsed data arrays are cached; caching is disabled
+# if set to None
+cache_dir = 'eia_cache'
+
+
+def text_lines(data_file_path, chunk_size=2**20):
+    """Read the lines of a text data file, removing any NULL characters.
+
+    Args:
+        data_file_path (str): The full path to the data file to be read.
+        chunk_size (int, optional): The number of characters to read
+            from the file at a time.
+
+    Yields:
+        Each line of the file (str), including the line ending.
+    """
+    with open(data_file_path) as thefile:
+        remainder = ''
+        for chunk in iter(lambda: thefile.read(chunk_size), ''):
+            # Remove any NULL characters and split the chunk into lines,
+            # holding back the last (possibly incomplete) line until the
+            # next chunk has been read
+            lines = (remainder + chunk.replace('\0', '')).split('\n')
+            remainder = lines.pop()
+            for line in lines:
+                yield line + '\n'
+        if remainder:
+            yield remainder
+
+
+def text_rows(data_file_path, delim_char=',', skipinitialspace=True):
+    """Read the rows of a delimited text data file.
+
+    Args:
+        data_file_path (str): The full path to the data file to be read.
+        delim_char (str, optional): The delimiting character, defaults to ','.
+        skipinitialspace (bool, optional): If True, whitespace following
+            a delimiter is ignored, which ensures proper reading of
+            double-quoted text strings in the AEO data that have the
+            delimiter inside them (e.g., cooking equipment descriptions).
+
+    Returns:
+        A csv.reader object that yields each row of the file as a list
+        of strings; the default quotechar '"' is assumed appropriate.
+    """
+    return csv.reader(text_lines(data_file_path), delimiter=delim_char,
+                      skipinitialspace=skipinitialspace)
+
+
+def rows_to_array(rows, dtype_list, usecols=None, na_values=None,
+                  block_size=50000):
+    """Convert rows of text data into a numpy structured array.
+
+    The rows are written into preallocated blocks of the structured
+    array, where each column in a block is converted from text to the
+    data type of the column at once, rather than row by row.
+
+    Args:
+        rows (iterable): Rows of data, each a list of strings (or values
+            that can be coerced to the type of their column).
+        dtype_list (list): A list of tuples with each tuple containing two
+            entries, a column heading string, and a string defining the
+            data type for that column. Formatted as a numpy dtype list.
+        usecols (list, optional): The positions in each row of the values
+            for each column in 'dtype_list'; if not given, the values in
+            each row are taken in order. Values in other positions are
+            never converted or stored.
+        na_values (list, optional): Strings that denote missing values
+            and are converted to nan in the columns with float data.
+        block_size (int, optional): The number of rows in each block.
+
+    Returns:
+        A numpy structured array of the rows with the columns specified
+        by dtype_list.
+
+    Raises:
+        ValueError: If a value cannot be converted to the data type of
+            its column.
+    """
+    dtype = np.dtype(dtype_list)
+    if usecols is None:
+        usecols = list(range(len(dtype.names)))
+    blocks = []
+    block_rows = []
+
+    def convert_block():
+        """Write the current rows into a new block of the array."""
+        block = np.empty(len(block_rows), dtype=dtype)
+        for name, col in zip(dtype.names, usecols):
+            values = [row[col] for row in block_rows]
+            if na_values and dtype[name].kind == 'f':
+                values = ['nan' if x in na_values else x for x in values]
+            block[name] = values
+        blocks.append(block)
+        block_rows.clear()
+
+    for row in rows:
+        block_rows.append(row)
+        if len(block_rows) == block_size:
+            convert_block()
+    if block_rows or not blocks:
+        convert_block()
+
+    if len(blocks) == 1:
+        return blocks[0]
+    else:
+        return np.concatenate(blocks)
+
+
+def cached_import(import_fn, data_file_path, *args, **kwargs):
+    """Import a data file, reusing the cached array if available.
+
+    Args:
+        import_fn (function): The function that imports the data file,
+            called as import_fn(data_file_path, *args, **kwargs) and
+            returning a numpy structured array.
+        data_file_path (str): The full path to the data file to be imported.
+        *args: Additional positional arguments for 'import_fn'.
+        **kwargs: Additional keyword arguments for 'import_fn'.
+
+    Returns:
+        A numpy structured array of the imported data file; arrays
+        loaded from the cache are memory-mapped copy-on-write, such that
+        changes to the array are not written back to the cache.
+
+    Note:
+        The cache key is a hash of the contents of the data file and of
+        the import function (including its code) and its arguments, such
+        that changes to either the data file or the way it is imported
+        result in the data file being parsed again.
+    """
+    if cache_dir is None:
+        return import_fn(data_file_path, *args, **kwargs)
+
+    # Hash the data file contents, read in chunks, and the import
+    # function and arguments
+    key = hashlib.sha256()
+    with open(data_file_path, 'rb') as thefile:
+        for chunk in iter(lambda: thefile.read(2**20), b''):
+            key.update(chunk)
+    key.update(repr((
+        import_fn.__module__, import_fn.__qualname__, args,
+        sorted(kwargs.items()), np.__version__)).encode())
+    key.update(marshal.dumps(import_fn.__code__))
+    cache_file = os.path.join(cache_dir, key.hexdigest() + '.npy')
+
+    if os.path.isfile(cache_file):
+        return np.load(cache_file, mmap_mode='c')
+
+    data = import_fn(data_file_path, *args, **kwargs)
+
+    # Store the parsed array, writing to a temporary file first such
+    # that an interrupted write does not leave a partial cache file;
+    # arrays with Python object data cannot be cached (and empty arrays
+    # cannot be memory-mapped)
+    if data.dtype.hasobject or data.size == 0:
+        return data
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file_tmp = cache_file + '.' + str(os.getpid()) + '.tmp'
+    with open(cache_file_tmp, 'wb') as fobj:
+        np.save(fobj, data, allow_pickle=False)
+    os.replace(cache_file_tmp, cache_file)
+
+    return data
+
+
+class RowGroupIndex(object):
+    """Index the rows of a structured array by the values in key columns.
+
+    The rows are sorted once on the key columns, and for each number of
+    leading key columns, the position of each group of rows sharing the
+    same values in those columns is recorded. The rows for any set of
+    values of the leading key columns can thus be found by dict look-up
+    rather than by comparing every row in the array to those values.
+
+    Attributes:
+        data (numpy.ndarray): The indexed structured array.
+        columns (list): The key columns, in the order they are matched;
+            key columns not present in 'data' are dropped.
+        order (numpy.ndarray): Positions of the rows in 'data' when
+            sorted on the key columns (stable, such that the original
+            row order is kept within each group).
+        groups (list): For each number of leading key columns, a dict
+            of the (start, stop) positions in 'order' of each group of
+            rows, keyed by the tuple of key column values for the group.
+    """
+    def __init__(self, data, columns):
+        self.data = data
+        self.columns = [x for x in columns if x in data.dtype.names]
+        self.order = np.lexsort(
+            [data[x] for x in reversed(self.columns)])
+        data_sorted = data[self.order]
+        n_rows = len(data_sorted)
+
+        # Flag the sorted rows that start a new group, adding one key
+        # column at a time, and record the groups for each set of
+        # leading key columns
+        self.groups = []
+        new_group = np.zeros(n_rows, dtype=bool)
+        new_group[:1] = True
+        for idx, col in enumerate(self.columns):
+            new_group[1:] |= data_sorted[col][1:] != data_sorted[col][:-1]
+            starts = np.flatnonzero(new_group)
+            stops = np.append(starts[1:], n_rows)
+            keys = zip(*[data_sorted[x][starts].tolist()
+                         for x in self.columns[:idx + 1]])
+            self.groups.append(dict(zip(
+                keys, zip(starts.tolist(), stops.tolist()))))
+
+    def select(self, values):
+        """Select the rows matching values for the leading key columns.
+
+        Args:
+            values (list): The values to match for each of the leading
+                key columns, in order; a list or tuple of values for a
+                column matches rows with any of those values.
+
+        Returns:
+            A structured array of the matching rows, in their original
+            order in the indexed array.
+        """
+        groups = self.groups[len(values) - 1]
+        # Find the groups for every combination of the values given
+        bounds = [groups[key] for key in itertools.product(*[
+            x if isinstance(x, (list, tuple)) else [x] for x in values])
+            if key in groups]
+        rows = np.sort(np.concatenate(
+            [self.order[start:stop] for start, stop in bounds] +
+            [np.zeros(0, dtype=self.order.dtype)]))
+
+        return self.data[rows]
+
+
+def row_group_index(data, columns):
+    """Obtain an index of the rows of an array, building it if needed.
+
+    Args:
+        data (numpy.ndarray or RowGroupIndex): A structured array or an
+            existing index of the rows of a structured array.
+        columns (list): The key columns to index on if 'data' is not
+            already indexed.
+
+    Returns:
+        A RowGroupIndex of the rows in 'data'.
+    """
+    if isinstance(data, RowGroupIndex):
+        return data
+    else:
+        return RowGroupIndex(data, columns)
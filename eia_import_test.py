@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+""" Tests for the EIA AEO text data file import functions """
+
+# Import code to be tested
+import eia_import
+
+# Import needed packages
+import unittest
+from unittest.mock import patch
+import numpy as np
+import tempfile
+import csv
+import os
+
+
+class TextDataImportTest(unittest.TestCase):
+    """Test reading of delimited EIA text data into structured arrays.
+
+    Verify that NULL characters are removed from the data as they are
+    read, that double-quoted strings with the delimiter inside them are
+    read as a single value, and that rows are converted correctly when
+    split across blocks of the structured array.
+
+    Attributes:
+        dtype_list (list): Data type definition for the sample data.
+        text (str): Sample delimited text data.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Define objects/variables for use across all class functions."""
+        cls.dtype_list = [('r', 'i4'), ('Description', '<U50'),
+                          ('2019', 'f8'), ('Eff', 'f8')]
+        cls.text = (
+            'r,Description,2019,Eff\n'
+            '1, "Range, Gas 2013 typ\0ical",12.5,0.8\n'
+            '2, "Range, Electric 2013 typical",NA,0.9\n'
+            '3, "Fryer 2020 \0high",4.25,NA\n')
+
+    def test_text_rows(self):
+        """Test reading of rows with NULL characters and quoted strings."""
+        with tempfile.TemporaryDirectory() as data_dir:
+            data_file = os.path.join(data_dir, 'KSDOUT.txt')
+            with open(data_file, 'w') as fobj:
+                fobj.write(self.text)
+            # Use a small chunk size to check handling of lines split
+            # across the chunks read from the file
+            lines = list(eia_import.text_lines(data_file, chunk_size=7))
+            self.assertEqual(lines, self.text.replace('\0', '').splitlines(
+                keepends=True))
+            # Whitespace following the delimiter must be skipped for the
+            # quoted strings to be read as a single value
+            self.assertEqual(list(csv.reader(lines))[1], [
+                '1', ' "Range', ' Gas 2013 typical"', '12.5', '0.8'])
+            self.assertEqual(list(eia_import.text_rows(data_file))[1], [
+                '1', 'Range, Gas 2013 typical', '12.5', '0.8'])
+
+    def test_rows_to_array(self):
+        """Test conversion of rows into blocks of a structured array."""
+        rows = [['1', 'Range, Gas 2013 typical', '12.5', '0.8'],
+                ['2', 'Range, Electric 2013 typical', 'NA', '0.9'],
+                ['3', 'Fryer 2020 high', '4.25', 'NA']]
+        expected = np.array([
+            (1, 'Range, Gas 2013 typical', 12.5, 0.8),
+            (2, 'Range, Electric 2013 typical', np.nan, 0.9),
+            (3, 'Fryer 2020 high', 4.25, np.nan)], dtype=self.dtype_list)
+        data = eia_import.rows_to_array(
+            rows, self.dtype_list, na_values=['NA'], block_size=2)
+        self.assertEqual(data.dtype, expected.dtype)
+        for col in expected.dtype.names:
+            np.testing.assert_array_equal(data[col], expected[col])
+        # Missing values are not converted unless specified
+        with self.assertRaises(ValueError):
+            eia_import.rows_to_array(rows, self.dtype_list)
+
+    def test_rows_to_array_usecols(self):
+        """Test conversion of only selected columns of the rows."""
+        rows = [['x', '1', 'y', '12.5'], ['x', '2', 'y', '3.5']]
+        data = eia_import.rows_to_array(
+            rows, [('2019', 'f8'), ('r', 'i4')], usecols=[3, 1])
+        np.testing.assert_array_equal(data['2019'], [12.5, 3.5])
+        np.testing.assert_array_equal(data['r'], [1, 2])
+
+
+def sample_import(data_file_path, delim_char):
+    """Import a sample data file."""
+    rows = eia_import.text_rows(data_file_path, delim_char)
+    next(rows)
+    return eia_import.rows_to_array(rows, [('r', 'i4'), ('Eff', 'f8')])
+
+
+class ParsedDataCacheTest(unittest.TestCase):
+    """Test caching of the arrays parsed from EIA text data files."""
+
+    def test_cached_import(self):
+        """Test reuse of cached arrays for unmodified data files."""
+        with tempfile.TemporaryDirectory() as data_dir, \
+                patch.object(eia_import, 'cache_dir',
+                             os.path.join(data_dir, 'eia_cache')):
+            data_file = os.path.join(data_dir, 'KSDOUT.txt')
+            with open(data_file, 'w') as fobj:
+                fobj.write('r,Eff\n1,0.8\n2,0.9\n')
+            with patch.object(eia_import, 'rows_to_array',
+                              wraps=eia_import.rows_to_array) as parse:
+                data = eia_import.cached_import(
+                    sample_import, data_file, ',')
+                data_cached = eia_import.cached_import(
+                    sample_import, data_file, ',')
+                # The data file should have been parsed only once
+                self.assertEqual(parse.call_count, 1)
+                np.testing.assert_array_equal(data_cached, data)
+                # Changes to the cached array are not written to the cache
+                data_cached['Eff'] = 0
+                np.testing.assert_array_equal(eia_import.cached_import(
+                    sample_import, data_file, ',')['Eff'], [0.8, 0.9])
+                # The data file should be parsed again if it is modified
+                with open(data_file, 'a') as fobj:
+                    fobj.write('3,1.0\n')
+                data_mod = eia_import.cached_import(
+                    sample_import, data_file, ',')
+                self.assertEqual(parse.call_count, 2)
+                np.testing.assert_array_equal(data_mod['r'], [1, 2, 3])
+
+
+class RowGroupIndexTest(unittest.TestCase):
+    """Test selection of rows from an index of a structured array."""
+
+    data = np.array(
+        [(2, 'EL', 10.), (1, 'GS', 11.), (2, 'GS', 12.), (1, 'EL', 13.),
+         (2, 'EL', 14.)],
+        dtype=[('CDIV', 'i4'), ('FUEL', 'U2'), ('VAL', 'f8')])
+
+    def test_select(self):
+        """Test selection on one or more leading key columns."""
+        index = eia_import.RowGroupIndex(self.data, ['CDIV', 'FUEL', 'EQP'])
+        # Key columns not present in the data are dropped
+        self.assertEqual(index.columns, ['CDIV', 'FUEL'])
+        # Rows are returned in their original order
+        np.testing.assert_array_equal(
+            index.select([2])['VAL'], [10., 12., 14.])
+        np.testing.assert_array_equal(
+            index.select([2, 'EL'])['VAL'], [10., 14.])
+        # Several values can be given for a key column
+        np.testing.assert_array_equal(
+            index.select([(1, 2), 'EL'])['VAL'], [10., 13., 14.])
+        # Values not found in the data select no rows
+        self.assertEqual(len(index.select([3, 'EL'])), 0)
+
+    def test_row_group_index(self):
+        """Test that an existing index is reused."""
+        index = eia_import.row_group_index(self.data, ['CDIV', 'FUEL'])
+        self.assertIsInstance(index, eia_import.RowGroupIndex)
+        self.assertIs(eia_import.row_group_index(index, ['CDIV']), index)
+
+
+# Offer external code execution (include all lines below this point in all
+# test files)
+def main():
+    """Trigger default behavior of running all test fixtures in the file."""
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -24,7 +24,6 @@ script checks for the correct input file and produces an instructive
 error message if the file is missing.
 """
 
-import copy
 import numpy as np
 import json
 import mseg
@@ -101,136 +100,117 @@ class UsefulVars(object):
         self.json_out = 'cpl_res_com_cz.json'
 
 
-def merge_sum(base_dict, add_dict, cd, cz, cd_dict, cd_list,
-              res_convert_array, com_convert_array, cd_to_cz_factor=0):
-    """Calculate values to restructure census division data to climate zones.
-
-    Two dicts with identical structure, 'base_dict' and 'add_dict' are
-    passed to this function and manipulated to effect conversion of the
-    data from a census division (specified by 'cd') to a climate zone
-    (specified by 'cz') basis.
-
-    This function operates recursively, traversing the structure of
-    the input dicts until a list of years is reached. At that point,
-    if the census division specified corresponds to the first census
-    division in the original data (the order is obtained from
-    'cd_list'), the entries in 'base_dict' are overwritten by the same
-    data multiplied by the appropriate conversion factor. If the census
-    division is not the first to appear in the original data,
-    'base_dict' has already been modified, and data from subsequent
-    census divisions should be added to 'base_dict', thus 'add_dict' is
-    modified to the current climate zone using the appropriate
-    conversion factor and added to 'base_dict'.
-
-    This approach to converting the data to a climate zone basis works
-    because this function is called from within nested for loops that
-    cover all of the census divisions for each climate zone.
-    Consequently, the data from each of the census divisions converted
-    to their respective contributions to a single climate zone can be
-    added together to obtain the data in the desired final form.
+def leaf_values(base_dict, add_dict, values, bldg_codes=None,
+                bldg_code=0):
+    """Extract the numeric values from a census division dict.
+
+    The numeric values (including the entries in lists of values) in
+    'add_dict' are appended to 'values', proceeding through the keys
+    at each level of the dict in sorted order, such that the values
+    from the dicts for each census division are appended in the same
+    order, so long as each dict has the same structure as 'base_dict'.
+    Values in 'add_dict' that correspond to strings in 'base_dict' are
+    not extracted, as those entries are copied from 'base_dict' to the
+    data on a climate zone basis (see 'rebuild_leaves').
 
     Args:
         base_dict (dict): A portion of the input JSON database
-            corresponding to the current census division, modified in
-            place to convert the data to a climate zone basis.
-        add_dict (dict): A portion of the input JSON database
-            corresponding to the current census division, copied from
-            the original input data each time this function is called
-            by the clim_converter function. This portion of the data
-            should be structurally identical to 'base_dict', and
-            (generally) corresponds to the data that should be updated
-            and then added to 'base_dict'.
-        cd (int): The census division (1-9) currently being processed.
-            Used as an array row index, so the actual values begin
-            with 0, not 1.
-        cz (int): The climate zone to which the census division data
-            are being added. Used as an array column index where the
-            first (0th) column is not relevant, thus it begins at 1.
-        cd_dict (dict): A dict for translating between census division
-            descriptive strings and their corresponding numeric codes.
-        cd_list (list): A list of the census divisions that are in the
-            input data (the top level keys from the JSON structure),
-            in the order in which they appear.
-        res_convert_array (numpy.ndarray): Coefficients for converting
-            from census divisions to climate zones for residential buildings.
-        com_convert_array (numpy.ndarray): Coefficients for converting
-            from census divisions to climate zones for commercial buildings.
-        cd_to_cz_factor (float): The numeric conversion factor to
-            calculate the contribution from the current census division
-            'cd' to the current climate zone 'cz'.
-
-    Returns:
-        A dict with the same form as base_dict and add_dict, with the
-        values for the particular census division specified in 'cd'
-        converted to the climate zone 'cz'.
+            corresponding to the first census division in the data,
+            which defines the structure that all census divisions
+            should follow.
+        add_dict (dict): The same portion of the input JSON database
+            corresponding to the census division from which values are
+            being extracted.
+        values (list): The values extracted so far, updated in place.
+        bldg_codes (list, optional): If given, updated in place with the
+            building class of each value extracted, where 1 indicates
+            a residential building type, 2 indicates a commercial
+            building type, and 0 indicates a value with no building type.
+        bldg_code (int, optional): The building class of the values in
+            'add_dict', as found from the keys traversed so far.
+
+    Raises:
+        KeyError: If the keys in 'add_dict' do not match those in
+            'base_dict'.
     """
-
-    # Extract lists of strings corresponding to the residential and
-    # commercial building types used to process these inputs
-    res_bldg_types = list(mseg.bldgtypedict.keys())
-    com_bldg_types = list(cm.CommercialTranslationDicts().bldgtypedict.keys())
-
     for (k, i), (k2, i2) in zip(sorted(base_dict.items()),
                                 sorted(add_dict.items())):
-        # Compare the top level/parent keys of the section of the dict
-        # currently being parsed to ensure that both the base_dict
-        # (census division basis) and add_dict (climate zone basis)
-        # are proceeding with the same structure
-        if k == k2:
-            # Identify appropriate census division to climate zone
-            # conversion weighting factor as a function of building type;
-            # k and k2 correspond to the current top level/parent key,
-            # thus k and k2 are equal to a building type immediately
-            # prior to traversing the entire child tree for that
-            # building type, for which the conversion number
-            # cd_to_cz_factor will be the same
-            if k in res_bldg_types or k in com_bldg_types:
-                if k in res_bldg_types:
-                    cd_to_cz_factor = res_convert_array[cd][cz]
-                elif k in com_bldg_types:
-                    cd_to_cz_factor = com_convert_array[cd][cz]
-
-            # Recursively loop through both dicts
-            if isinstance(i, dict):
-                merge_sum(i, i2, cd, cz, cd_dict, cd_list, res_convert_array,
-                          com_convert_array, cd_to_cz_factor)
-            elif type(base_dict[k]) is not str:
-                # Special handling of first dict (no addition of the
-                # second dict, only conversion of the first dict with
-                # the appropriate factor)
-                if (cd == (cd_dict[cd_list[0]] - 1)):
-                    # In the special case of consumer choice/time
-                    # preference premium data, the data are reported
-                    # as a list and must be reprocessed using a list
-                    # comprehension (or comparable looping approach)
-                    if isinstance(base_dict[k], list):
-                        base_dict[k] = [z*cd_to_cz_factor for z
-                                        in base_dict[k]]
-                    else:
-                        base_dict[k] = base_dict[k]*cd_to_cz_factor
-                else:
-                    if isinstance(base_dict[k], list):
-                        base_dict[k] = [sum(y) for y
-                                        in zip(base_dict[k],
-                                        [z*cd_to_cz_factor for z
-                                         in add_dict[k2]])]
-                    else:
-                        base_dict[k] = (base_dict[k] +
-                                        add_dict[k2]*cd_to_cz_factor)
-        else:
+        # Compare the keys of the census division being extracted and
+        # the first census division to ensure that they are proceeding
+        # with the same structure
+        if k != k2:
             raise(KeyError('Merge keys do not match!'))
 
-    # Return a single dict representing sum of values of original two dicts
-    return base_dict
+        # Identify the building class that sets the appropriate census
+        # division to climate zone conversion factors; the building
+        # class applies to the values below the current key and to the
+        # values under any subsequent keys at this level that are not
+        # themselves building types
+        if k in mseg.bldgtypedict:
+            bldg_code = 1
+        elif k in cm.translation_dicts.bldgtypedict:
+            bldg_code = 2
+
+        if isinstance(i, dict):
+            leaf_values(i, i2, values, bldg_codes, bldg_code)
+        elif type(i) is not str:
+            # In the special case of consumer choice/time preference
+            # premium data, the data are reported as a list of values
+            if isinstance(i, list):
+                values.extend(i2)
+                n_values = len(i)
+            else:
+                values.append(i2)
+                n_values = 1
+            if bldg_codes is not None:
+                bldg_codes.extend([bldg_code] * n_values)
+
+
+def rebuild_leaves(base_dict, values):
+    """Rebuild a dict with the structure of 'base_dict' from values.
+
+    This function reverses 'leaf_values', replacing each numeric value
+    (including the entries in lists of values) in 'base_dict' with the
+    next value from 'values', proceeding through the keys at each level
+    of the dict in sorted order. Strings are copied from 'base_dict',
+    and the keys at each level are kept in the order of 'base_dict'.
+
+    Args:
+        base_dict (dict): A portion of the input JSON database
+            corresponding to the first census division in the data.
+        values (iterator): The values, in the order extracted by
+            'leaf_values' from 'base_dict'.
+
+    Returns:
+        A dict with the same structure as 'base_dict' with its numeric
+        values replaced by those from 'values'.
+    """
+    rebuilt_dict = dict.fromkeys(base_dict)
+    for k in sorted(base_dict):
+        i = base_dict[k]
+        if isinstance(i, dict):
+            rebuilt_dict[k] = rebuild_leaves(i, values)
+        elif type(i) is str:
+            rebuilt_dict[k] = i
+        elif isinstance(i, list):
+            rebuilt_dict[k] = [next(values) for z in i]
+        else:
+            rebuilt_dict[k] = next(values)
+
+    return rebuilt_dict
 
 
 def clim_converter(input_dict, res_convert_array, com_convert_array):
     """Convert input data dict from a census division to a climate zone basis.
 
-    This function principally serves to prepare the inputs for, and
-    then call, a function that performs the calculations to convert
-    data in the input_dict database specified for each microsegment
-    from a census division to climate zone basis.
+    The numeric values in the data for each census division, which
+    should have an identical structure, are extracted into a single
+    array with a column for each census division. The data for all
+    of the climate zones are then calculated together by multiplying
+    the values for each building class (residential or commercial) by
+    the corresponding matrix of census division to climate zone
+    conversion factors, and the results for each climate zone are
+    rebuilt into the structure of the input data.
 
     Args:
         input_dict (dict): Data from JSON database, as imported,
@@ -249,10 +229,10 @@ def clim_converter(input_dict, res_convert_array, com_convert_array):
         have been updated to correspond to those climate zones.
     """
 
-    # Create an instance of the CommercialTranslationDicts object from
-    # com_mseg, which contains a dict that translates census division
-    # strings into the corresponding integer codes
-    cd = cm.CommercialTranslationDicts()
+    # Use the commercial translation dicts from com_mseg, which include
+    # a dict that translates census division strings into the
+    # corresponding integer codes
+    cd = cm.translation_dicts
 
     # Obtain list of all climate zone names as strings
     cz_list = res_convert_array.dtype.names[1:]
@@ -260,55 +240,49 @@ def clim_converter(input_dict, res_convert_array, com_convert_array):
     # Obtain list of all census divisions in the input data
     cd_list = list(input_dict.keys())
 
-    # Set up empty dict to be updated with the results for each climate
-    # zone as the data are converted
+    # Obtain the census division numbers from the dict and subtract 1
+    # to make the numbers usable as row indices for the conversion
+    # arrays; raise a KeyError if a census division name is not found
+    # in the dict specified in this function
+    for cd_name in cd_list:
+        if cd_name not in cd.cdivdict.keys():
+            raise(KeyError("Census division name not found in dict keys!"))
+    cd_numbers = [cd.cdivdict[x] - 1 for x in cd_list]
+
+    # Extract the numeric values from the data for each census division
+    # following the structure of the first census division, and record
+    # the building class of each value
+    base_dict = input_dict[cd_list[0]]
+    bldg_codes = []
+    cd_values = []
+    for cd_name in cd_list:
+        values = []
+        leaf_values(base_dict, input_dict[cd_name], values,
+                    bldg_codes if cd_name == cd_list[0] else None)
+        if len(values) != len(bldg_codes):
+            raise(KeyError('Merge keys do not match!'))
+        cd_values.append(values)
+    cd_values = np.array(cd_values, dtype=float)
+    bldg_codes = np.array(bldg_codes, dtype=int)
+
+    # Calculate the values for all climate zones from the values for all
+    # census divisions for each building class; values not associated
+    # with a building type are set to zero
+    cz_values = np.zeros((len(bldg_codes), len(cz_list)))
+    for code, convert_array in [(1, res_convert_array),
+                                (2, com_convert_array)]:
+        cd_to_cz_factors = np.array(
+            [convert_array[x] for x in cz_list], dtype=float).T[cd_numbers]
+        code_values = bldg_codes == code
+        cz_values[code_values] = np.einsum(
+            'dv,dz->vz', cd_values[:, code_values], cd_to_cz_factors)
+
+    # Rebuild the data for each climate zone into the structure of the
+    # input data, using the climate zone string name as the key
     converted_dict = {}
-
-    # Add the values from each climate zone to the converted_dict
     for cz_number, cz_name in enumerate(cz_list):
-        # Create a copy of the input dict at the level below a census
-        # division or climate zone (the structure below that level
-        # should be identical); uses the first census division in
-        # cd_list each time
-        base_dict = copy.deepcopy(input_dict[cd_list[0]])
-
-        # Loop through all census divisions to add their contributions
-        # to each climate zone
-        for cd_name in cd_list:
-            # Proceed only if the census division name is found in
-            # the dict specified in this function, otherwise raise
-            # a KeyError
-            if cd_name in cd.cdivdict.keys():
-                # Obtain the census division number from the dict
-                # and subtract 1 to make the number usable as a list
-                # index (1st list element is indexed by 0 in Python)
-                cd_number = cd.cdivdict[cd_name] - 1
-
-                # Make a copy of the portion of the input dict
-                # corresponding to the current census division
-                add_dict = copy.deepcopy(input_dict[cd_name])
-
-                # Call the merge_sum function to replace base_dict with
-                # updated contents; add 1 to the climate zone number
-                # because it will be used as a column index for an
-                # array where the first column of data are in the
-                # second column (indexed as 1 in Python); this approach
-                # overwrites base_dict, which is intentional because it
-                # is the master dict that stores the data on a climate
-                # zone basis as the contribution from each census
-                # division is added to the climate zone by merge_sum
-                base_dict = merge_sum(base_dict, add_dict, cd_number,
-                                      (cz_number + 1), cd.cdivdict, cd_list,
-                                      res_convert_array, com_convert_array)
-            else:
-                raise(KeyError("Census division name not found in dict keys!"))
-
-        # Once fully updated with the data from all census divisions,
-        # write the resulting data to a new variable and update the
-        # master dict with the data using the appropriate census
-        # division string name as the key
-        newadd = base_dict
-        converted_dict.update({cz_name: newadd})
+        converted_dict[cz_name] = rebuild_leaves(
+            base_dict, iter(cz_values[:, cz_number].tolist()))
 
     return converted_dict
 
@@ -368,7 +342,7 @@ def env_cpl_data_handler(cpl_data, conversions, years, key_list):
         if entry in mseg.bldgtypedict.keys():
             bldg_class = 'residential'
             bldg_type = entry
-        elif entry in cm.CommercialTranslationDicts().bldgtypedict.keys():
+        elif entry in cm.translation_dicts.bldgtypedict.keys():
             bldg_class = 'commercial'
             bldg_type = entry
 
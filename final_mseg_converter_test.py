@@ -6,9 +6,6 @@
 # Import code to be tested
 import final_mseg_converter as fmc
 
-# Import code with translation dicts
-import com_mseg as cm
-
 # Import needed packages
 import unittest
 import numpy as np
@@ -129,8 +126,9 @@ class CommonUnitTest(unittest.TestCase):
 
 
 class DataRestructuringFunctionTest(CommonUnitTest):
-    """ Test the operation of the function that calculates the
-    contribution of each census division to each climate zone """
+    """ Test the operation of the functions that extract the numeric
+    values and their building classes from the data for a census
+    division and rebuild the data from those values """
 
     # Create a sample dict that takes the form of the data provided
     # within each census division (each climate zone will have the
@@ -154,112 +152,33 @@ class DataRestructuringFunctionTest(CommonUnitTest):
             'natural gas': {
                 'water heating': {'2009': 20, '2010': 22, '2011': 23}}}}
 
-    # Specify the census divisions to be tested; more than one census
-    # divisions is tested here because the mathematical treatment of
-    # the first census division (in the order in which it appears in
-    # the census division list 'cd_list') to be added to a climate
-    # zone is different than subsequent climate zones
-    census_divisions = [1, 2]
-
-    # Specify the climate zones to be tested with the census divisions
-    # specified by 'census_divisions'
-    climate_zones = [1, 1]
-
-    # Create an instance of the CommericalTranslationDicts object from
-    # com_mseg, which includes dictionaries for converting between
-    # descriptive string keys for e.g., census divisions and the
-    # corresponding integer numeric values for those strings
-    cd = cm.CommercialTranslationDicts()
-
-    # List of census divisions typically derived from the top-level
-    # keys in the input JSON database
-    cd_list = ['new england', 'mid atlantic', 'east north central']
-
-    # List the dicts that should be produced from the inputs to the
-    # merge_sum function in the order in which they should be tested
-    # (i.e., matching the order of 'census_divisions' and 'climate_zones')
-    loutput = [
-        {'single family home': {
-            'new homes': {
-                '2009': 117.6489, '2010': 117.6489, '2011': 117.6489},
-            'total homes': {
-                '2009': 235.2978, '2010': 235.2978, '2011': 235.2978},
-            'square footage': {
-                '2009': 352.9467, '2010': 352.9467, '2011': 352.9467},
-            'electricity (grid)': {
-                'lighting': {
-                    'linear fluorescent': {
-                        'energy': {
-                            '2009': 16.9584,
-                            '2010': 18.0183,
-                            '2011': 19.0782},
-                        'stock': {
-                            '2009': 13.7787,
-                            '2010': 14.8386,
-                            '2011': 15.8985}}}}},
-         'mercantile/service': {
-            'total square footage': {
-                '2009': 21.9374, '2010': 24.2466, '2011': 23.092},
-            'new square footage': {
-                '2009': 6.9276, '2010': 5.773, '2011': 4.6184},
-            'electricity': {
-                'lighting': {
-                    'F96T8 HO_HB': {
-                        '2009': 0.3464, '2010': 0.6928, '2011': 0.8082}}},
-            'natural gas': {
-                'water heating': {
-                    '2009': 23.092, '2010': 25.401, '2011': 26.556}}}},
-        {'single family home': {
-            'new homes': {
-                '2009': 128.2494, '2010': 128.2494, '2011': 128.2494},
-            'total homes': {
-                '2009': 256.4988, '2010': 256.4988, '2011': 256.4988},
-            'square footage': {
-                '2009': 384.7482, '2010': 384.7482, '2011': 384.7482},
-            'electricity (grid)': {
-                'lighting': {
-                    'linear fluorescent': {
-                        'energy': {
-                            '2009': 18.4864,
-                            '2010': 19.6418,
-                            '2011': 20.7972},
-                        'stock': {
-                            '2009': 15.0202,
-                            '2010': 16.1756,
-                            '2011': 17.331}}}}},
-         'mercantile/service': {
-            'natural gas': {
-                'water heating': {
-                    '2009': 25.336, '2010': 27.8696, '2011': 29.1363}},
-            'total square footage': {
-                '2009': 24.0692, '2010': 26.6028, '2011': 25.336},
-            'new square footage': {
-                '2009': 7.6008, '2010': 6.334, '2011': 5.0672},
-            'electricity': {
-                'lighting': {
-                    'F96T8 HO_HB': {
-                        '2009': 0.38, '2010': 0.7601, '2011': 0.8866}}}}}]
+    # List the values that should be extracted from the sample dict,
+    # in sorted key order, and the building class of each value, where
+    # 1 indicates residential and 2 indicates commercial building types
+    values_out = [
+        0.3, 0.6, 0.7, 20, 22, 23, 6, 5, 4, 19, 21, 20,
+        16, 17, 18, 13, 14, 15, 111, 111, 111, 333, 333, 333,
+        222, 222, 222]
+    bldg_codes_out = [2] * 12 + [1] * 15
 
-    def test_conversion_calculation_for_individual_cz_cd_combinations(self):
-        for idx, _ in enumerate(self.census_divisions):
-            # Since the merge_sum function recursively operates on
-            # 'base_input', make the two required copies to serve as
-            # the inputs for testing purposes to ensure that all tests
-            # start with the same input data
-            base_input = copy.deepcopy(self.orig_input)
-            add_input = copy.deepcopy(self.orig_input)
+    def test_leaf_value_extraction(self):
+        values = []
+        bldg_codes = []
+        fmc.leaf_values(self.orig_input, self.orig_input, values,
+                        bldg_codes)
+        self.assertEqual(values, self.values_out)
+        self.assertEqual(bldg_codes, self.bldg_codes_out)
 
-            # Call the function to be tested
-            result = fmc.merge_sum(base_input,
-                                   add_input,
-                                   self.census_divisions[idx],
-                                   self.climate_zones[idx],
-                                   self.cd.cdivdict,
-                                   self.cd_list,
-                                   self.res_cd_cz_array,
-                                   self.com_cd_cz_array)
+    def test_leaf_value_mismatched_keys(self):
+        add_input = copy.deepcopy(self.orig_input)
+        add_input['mercantile/service']['gas'] = add_input[
+            'mercantile/service'].pop('natural gas')
+        with self.assertRaises(KeyError):
+            fmc.leaf_values(self.orig_input, add_input, [])
 
-            self.dict_check(result, self.loutput[idx])
+    def test_leaf_value_rebuild(self):
+        result = fmc.rebuild_leaves(self.orig_input, iter(self.values_out))
+        self.dict_check(result, self.orig_input)
 
 
 class ToClimateZoneConversionTest(CommonUnitTest):
@@ -1739,6 +1658,23 @@ class ToClimateZoneConversionTest(CommonUnitTest):
         dict2 = self.test_cpl_output
         self.dict_check(dict1, dict2)
 
+    # Check that the conversion does not depend on the order of the keys
+    # in the data for each census division and does not modify the input
+    def test_conversion_with_reordered_census_division_data(self):
+        def reverse_keys(d):
+            if isinstance(d, dict):
+                return {k: reverse_keys(d[k]) for k in reversed(list(d))}
+            else:
+                return d
+        test_input = {k: (reverse_keys(i) if n > 0 else i) for n, (k, i) in
+                      enumerate(self.test_energy_stock_input.items())}
+        test_input_copy = copy.deepcopy(test_input)
+        dict1 = fmc.clim_converter(test_input,
+                                   self.res_cd_cz_array,
+                                   self.com_cd_cz_array)
+        self.dict_check(dict1, self.test_energy_stock_output)
+        self.assertEqual(test_input, test_input_copy)
+
     # Check malformed dict to verify that the appropriate error is raised
     def test_census_division_to_climate_zone_conversion_error_handling(self):
         with self.assertRaises(KeyError):
@@ -6,6 +6,7 @@ import json
 import argparse
 import csv
 import mseg_techdata as rmt
+import eia_import
 
 
 class EIAData(object):
@@ -176,6 +177,34 @@ technology_demanddict = {'windows conduction': 'WIND_COND',
 res_dictlist = [endusedict, cdivdict, bldgtypedict, fueldict,
                 technology_supplydict, technology_demanddict]
 
+# Columns used to index the rows of the EIA energy and stock data and the
+# thermal load components data, in the order in which they are matched
+nrg_stock_index_cols = ['CDIV', 'BLDG', 'ENDUSE', 'FUEL', 'EQPCLASS',
+                        'BULBTYPE']
+tloads_index_cols = ['CDIV', 'BLDG', 'ENDUSE']
+
+
+def sum_by_year(data_sel, column):
+    """Sum the values in a column of an array for each year.
+
+    Args:
+        data_sel (numpy.ndarray): A structured array with a 'YEAR' column.
+        column (str): The column with the values to sum.
+
+    Returns:
+        A dict with the summed values, keyed by year (as strings, to be
+        compatible with valid JSON) in ascending order.
+    """
+    if len(data_sel) == 0:
+        return {}
+    # Sort the rows by year, keeping the original order of rows within
+    # each year, and sum the values across each run of rows for a year
+    order = numpy.argsort(data_sel['YEAR'], kind='mergesort')
+    years, starts = numpy.unique(data_sel['YEAR'][order], return_index=True)
+    sums = numpy.add.reduceat(data_sel[column][order], starts)
+
+    return {str(yr): val for yr, val in zip(years, sums)}
+
 
 def json_translator(dictlist, filterformat):
     """Determine filtering keys for finding information in the input data
@@ -309,7 +338,8 @@ def thermal_load_select(tl_data, sel):
     building envelope.
 
     Args:
-        tl_data (numpy.ndarray): An array of thermal load component factors.
+        tl_data (numpy.ndarray or RowGroupIndex): An array of thermal load
+            component factors, or an index of its rows.
         sel (list): A nested list of indices for selecting the relevant
             data, created by json_translator.
 
@@ -320,9 +350,8 @@ def thermal_load_select(tl_data, sel):
     """
 
     # Select the appropriate data from the thermal loads data array
-    tl_data_sel = tl_data[numpy.all([tl_data['ENDUSE'] == sel[0][0],
-                                     tl_data['CDIV'] == sel[0][1],
-                                     tl_data['BLDG'] == sel[0][2]], axis=0)]
+    tl_data_sel = eia_import.row_group_index(
+        tl_data, tloads_index_cols).select([sel[0][1], sel[0][2], sel[0][0]])
 
     # Extract the demand modifier value (the fraction of heating or
     # cooling load gained/lost through the relevant exterior surface)
@@ -345,8 +374,9 @@ def nrg_stock_select(data, sel):
     and stock data always have a single key for each year.
 
     Args:
-        data (numpy.ndarray): An array of AEO energy, equipment stock,
-            and household count data given by microsegment.
+        data (numpy.ndarray or RowGroupIndex): An array of AEO energy,
+            equipment stock, and household count data given by
+            microsegment, or an index of its rows.
         sel (list): A nested list of indices for selecting the relevant
             data, created by json_translator.
 
@@ -355,36 +385,10 @@ def nrg_stock_select(data, sel):
         each year of available data for the specified microsegment.
     """
 
-    # Define initial stock and energy dicts
-    group_stock = {}
-    group_energy = {}
-
-    # Select data for the specified census division and building type
-    data_sel = data[numpy.all([data['CDIV'] == sel[0][1],
-                               data['BLDG'] == sel[0][2]], axis=0)]
-
-    # Multiple end uses can be provided, but try first to see if only
-    # one end use is provided; if not, select data for all of the
-    # end uses given
-    try:
-        data_sel = data_sel[numpy.all(
-            [data_sel['ENDUSE'] == sel[0][0]], axis=0)]
-    except ValueError:
-        data_sel = data_sel[numpy.hstack([numpy.where(
-            data_sel['ENDUSE'] == i) for i in sel[0][0]]).flatten()]
-
-    # Multiple fuel types can be provided, but try first to see if only
-    # one fuel type is provided and if not, use a different approach to
-    # select data for all of the fuel types indicated
-    try:
-        data_sel = data_sel[numpy.all(
-            [data_sel['FUEL'] == sel[0][3]], axis=0)]
-    except ValueError:
-        data_sel = data_sel[numpy.hstack([numpy.where(
-            data_sel['FUEL'] == i) for i in sel[0][3]]).flatten()]
-
-    # If an equipment class is specified, select the subset of
-    # applicable data as appropriate
+    # Select data for the specified census division, building type, end
+    # use(s), and fuel type(s), as well as the equipment class (and bulb
+    # type, for lighting) if one is specified
+    sel_values = [sel[0][1], sel[0][2], sel[0][0], sel[0][3]]
     try:
         eqp = sel[0][4]
     except IndexError:
@@ -392,36 +396,17 @@ def nrg_stock_select(data, sel):
 
     if eqp:
         if isinstance(eqp, tuple):  # Lighting
-            data_sel = data_sel[
-                numpy.all([data_sel['EQPCLASS'] == eqp[0],
-                           data_sel['BULBTYPE'] == eqp[1]], axis=0)]
+            sel_values.extend(eqp)
         else:  # Other end uses
-            data_sel = data_sel[
-                numpy.all([data_sel['EQPCLASS'] == eqp], axis=0)]
-
-    # Loop through the reduced numpy stock and energy array and
-    # combine the reported values together
-    for idx, row in enumerate(data_sel):
-        # If data for the year is already present for the current
-        # microsegment (as with microsegments that combine several
-        # EIA categories together), add the new stock and consumption
-        # values to the existing values (assume that if the year is
-        # present in the group_stock dict it is also in group_energy)
-        if row['YEAR'] in group_stock:
-            # Record energy consumption and stock information
-            # (change the year to a string to yield a valid
-            # JSON dict, where all keys must be strings)
-            group_stock[row['YEAR']] += row['EQSTOCK']
-            group_energy[row['YEAR']] += row['CONSUMPTION']
-
-        else:
-            group_stock[row['YEAR']] = row['EQSTOCK']
-            group_energy[row['YEAR']] = row['CONSUMPTION']
+            sel_values.append(eqp)
+    data_sel = eia_import.row_group_index(
+        data, nrg_stock_index_cols).select(sel_values)
 
-    # Convert the numeric year keys in the energy and stock dicts
-    # to strings to be compatible with valid JSON
-    group_stock = {str(key): value for key, value in group_stock.items()}
-    group_energy = {str(key): value for key, value in group_energy.items()}
+    # Sum the stock and energy values reported for each year (as with
+    # microsegments that combine several EIA categories together), such
+    # that the stock and energy dicts have a single key for each year
+    group_stock = sum_by_year(data_sel, 'EQSTOCK')
+    group_energy = sum_by_year(data_sel, 'CONSUMPTION')
 
     return group_energy, group_stock
 
@@ -439,8 +424,9 @@ def sqft_homes_select(data, sel):
     use, building type, and technology type in each census division.
 
     Args:
-        data (numpy.ndarray): An array of AEO energy, equipment stock,
-            and household count data given by microsegment.
+        data (numpy.ndarray or RowGroupIndex): An array of AEO energy,
+            equipment stock, and household count data given by
+            microsegment, or an index of its rows.
         sel (list): A nested list of indices for selecting the relevant
             data, created by json_translator.
 
@@ -458,16 +444,12 @@ def sqft_homes_select(data, sel):
         raise ValueError('Unexpected housing stock filtering information!')
 
     # Select home count or square footage data based on selection indices
+    data_index = eia_import.row_group_index(data, nrg_stock_index_cols)
     if technology_supplydict['total homes (tech level)'] in sel[0]:
-        data_sel = data[numpy.all([data['ENDUSE'] == sel[0][0],
-                                   data['CDIV'] == sel[0][1],
-                                   data['BLDG'] == sel[0][2],
-                                   data['FUEL'] == sel[0][3],
-                                   data['EQPCLASS'] == sel[0][4]], axis=0)]
+        data_sel = data_index.select(
+            [sel[0][1], sel[0][2], sel[0][0], sel[0][3], sel[0][4]])
     else:
-        data_sel = data[numpy.all([data['ENDUSE'] == sel[0][0],
-                                   data['CDIV'] == sel[0][1],
-                                   data['BLDG'] == sel[0][2]], axis=0)]
+        data_sel = data_index.select([sel[0][1], sel[0][2], sel[0][0]])
 
     # Loop through the reduced numpy stock and energy (and ancillary
     # data) array and restructure the reported values
@@ -504,9 +486,11 @@ def list_generator(nrg_stock, tloads, filterdata, aeo_years, lt_factors):
     reported only for the first bulb type for each fixture type.
 
     Args:
-        nrg_stock (numpy.ndarray): An array of AEO energy, equipment
-            stock, and household count data given by microsegment.
-        loads (numpy.ndarray): An array of thermal load component factors.
+        nrg_stock (numpy.ndarray or RowGroupIndex): An array of AEO
+            energy, equipment stock, and household count data given by
+            microsegment, or an index of its rows.
+        loads (numpy.ndarray or RowGroupIndex): An array of thermal load
+            component factors, or an index of its rows.
         filterdata (list): A list of keys from the microsegments JSON
             indicating the data to be obtained.
         aeo_years (int): The number of years of data reported in the
@@ -673,9 +657,11 @@ def walk(nrg_stock, loads, json_dict, yrs_range, lt_factors, key_list=[]):
     terminal node.
 
     Args:
-        nrg_stock (numpy.ndarray): An array of AEO energy, equipment
-            stock, and household count data given by microsegment.
-        loads (numpy.ndarray): An array of thermal load component factors.
+        nrg_stock (numpy.ndarray or RowGroupIndex): An array of AEO
+            energy, equipment stock, and household count data given by
+            microsegment, or an index of its rows.
+        loads (numpy.ndarray or RowGroupIndex): An array of thermal load
+            component factors, or an index of its rows.
         json_dict (dict): The empty microsegments JSON structure.
         yrs_range (int): The number of years of data reported in the
             RESDBOUT file.
@@ -747,10 +733,11 @@ def lighting_eff_prep(lt_cpl_data, n_years, n_lt_types):
         the unique combinations of fixture and bulb type. In each row,
         the value reported for the year is the normalized efficiency
         factor for that row (fixture and bulb type).
-    """
 
-    # Extract the unique fixture types
-    fixture_types = numpy.unique(lt_cpl_data['Application'])
+    Raises:
+        ValueError: If the CPL data for any combination of fixture and
+            bulb type cover fewer than 'n_years' years.
+    """
 
     # Extract the final year of reported lighting data (and thus
     # all residential data obtained from the AEO) from the CPL data
@@ -776,76 +763,70 @@ def lighting_eff_prep(lt_cpl_data, n_years, n_lt_types):
     # number of rows (the dtype specification defines the columns)
     fixture_perf = numpy.zeros(n_lt_types, dtype=the_dtype)
 
-    itr = 0  # Initialize row counter variable
-
-    # Calculate the lighting efficiency for each unique combination
-    # of 'Application' and 'BulbType' for each year of data provided
-    # and populate a numpy structured array with the resulting values
-    for fixture in fixture_types:
-        # Identify the unique bulb types for this fixture type
-        bulb_types = numpy.unique(
-            lt_cpl_data[lt_cpl_data['Application'] == fixture]['BulbType'])
-
-        # Create an empty numpy array to use as an intermediate step
-        # to store lighting performance values for each bulb type
-        # associated with this fixture type
-        fixture_group = numpy.zeros((len(bulb_types), n_years))
-
-        # Create an empty list to which lists of fixture type and
-        # bulb type will be added (appended)
-        lt_type_codes = []
-
-        for idx, bulb in enumerate(bulb_types):
-            # Obtain the subset of the lighting data corresponding
-            # to the current bulb and fixture type
-            single_lt = lt_cpl_data[numpy.all([
-                            lt_cpl_data['Application'] == fixture,
-                            lt_cpl_data['BulbType'] == bulb], axis=0)]
-
-            # Calculate the number of times each value should repeat
-            # (to reflect the number of years the value stays the same)
-            n_repeat_times = single_lt['LastYear'] - single_lt['FirstYear'] + 1
-
-            # Generate numpy array of values using the number of
-            # repeats calculated for each value
-            bulb_perf_lm_watts, bulb_perf_watts = [numpy.repeat(
-              single_lt[x], n_repeat_times) for x in ['lm_per_W', 'Watts']]
-
-            # If more than the expected number of performance values
-            # appear in the 1D numpy array, truncate the initial values
-            bulb_perf_lm_watts, bulb_perf_watts = [
-              bulb_perf_lm_watts[-n_years:], bulb_perf_watts[-n_years:]]
-            # Find and remove spurious performance changes in lm/W
-            # performance over time, yielding a final performance array
-            bulb_perf = chk_false_eff(bulb_perf_lm_watts, bulb_perf_watts)
-
-            # Invert the values in bulb_perf so that higher efficiency
-            # bulbs (i.e., more lm/W) have lower values and thus
-            # will have lower energy use associated with them (when
-            # these efficiency multipliers are applied)
-            bulb_perf = 1/bulb_perf
-
-            # Insert the inverted bulb performance (referred to here as
-            # bulb efficiency) into the intermediate numpy array
-            fixture_group[idx, ] = bulb_perf
-
-            # Insert the fixture type and bulb type codes into an
-            # intermediate list of lists for later combination with
-            # the normalized bulb efficiency values
-            lt_type_codes.append([fixture, bulb])
-
-        # Calculate normalized efficiency weighting factors for each
-        # year for all of the bulb types that correspond to this
-        # fixture type
-        norm_fixture_group = fixture_group/numpy.sum(fixture_group, 0)
-
-        # Combine each row of normalized efficiency weighting factors
-        # with their corresponding fixture and bulb type codes and
-        # insert them into the final lighting efficiency values
-        # structured array
-        for idx, row in enumerate(norm_fixture_group):
-            fixture_perf[itr] = tuple(lt_type_codes[idx] + list(row))
-            itr += 1  # Increment row counter variable
+    # Sort the CPL data by fixture type and then bulb type (keeping the
+    # order of the rows for each lighting type) and identify the rows
+    # that begin each unique combination of fixture and bulb type
+    lt_cpl_data = lt_cpl_data[numpy.lexsort(
+        (lt_cpl_data['BulbType'], lt_cpl_data['Application']))]
+    new_type = numpy.ones(len(lt_cpl_data), dtype=bool)
+    new_type[1:] = (
+        (lt_cpl_data['Application'][1:] != lt_cpl_data['Application'][:-1]) |
+        (lt_cpl_data['BulbType'][1:] != lt_cpl_data['BulbType'][:-1]))
+    type_starts = numpy.flatnonzero(new_type)
+
+    # Calculate the number of times each value should repeat (to reflect
+    # the number of years the value stays the same) and generate arrays
+    # of the performance values in each year for all of the lighting
+    # types in sequence
+    n_repeat_times = lt_cpl_data['LastYear'] - lt_cpl_data['FirstYear'] + 1
+    all_perf_lm_watts, all_perf_watts = [numpy.repeat(
+        lt_cpl_data[x], n_repeat_times) for x in ['lm_per_W', 'Watts']]
+
+    # Select the final 'n_years' performance values for each lighting
+    # type (i.e., truncating the initial values if more than the expected
+    # number of performance values appear), with a row for each lighting
+    # type and a column for each year
+    type_n_values = numpy.add.reduceat(n_repeat_times, type_starts)
+    if numpy.any(type_n_values < n_years):
+        raise ValueError(
+            'Lighting CPL data for fixture and bulb type(s) ' +
+            str(list(zip(lt_cpl_data['Application'][type_starts][
+                type_n_values < n_years].tolist(),
+                lt_cpl_data['BulbType'][type_starts][
+                type_n_values < n_years].tolist()))) +
+            ' do not cover the expected ' + str(n_years) + ' years')
+    type_ends = numpy.cumsum(type_n_values)
+    perf_idx = type_ends[:, None] - n_years + numpy.arange(n_years)
+    bulb_perf_lm_watts, bulb_perf_watts = [
+        all_perf_lm_watts[perf_idx], all_perf_watts[perf_idx]]
+
+    # Find and remove spurious performance changes in lm/W performance
+    # over time, yielding a final performance array
+    bulb_perf = chk_false_eff(bulb_perf_lm_watts, bulb_perf_watts)
+
+    # Invert the values in bulb_perf so that higher efficiency bulbs
+    # (i.e., more lm/W) have lower values and thus will have lower energy
+    # use associated with them (when these efficiency multipliers are
+    # applied)
+    bulb_perf = 1/bulb_perf
+
+    # Calculate normalized efficiency weighting factors for each year for
+    # all of the bulb types that correspond to each fixture type, summing
+    # the efficiency values across the (contiguous) rows for each fixture
+    fixture_codes = lt_cpl_data['Application'][type_starts]
+    _, fixture_idx, fixture_inv = numpy.unique(
+        fixture_codes, return_index=True, return_inverse=True)
+    fixture_sums = numpy.add.reduceat(bulb_perf, numpy.sort(fixture_idx), 0)
+    norm_fixture_group = bulb_perf/fixture_sums[fixture_inv]
+
+    # Combine each row of normalized efficiency weighting factors with
+    # their corresponding fixture and bulb type codes in the final
+    # lighting efficiency values structured array
+    n_types = len(type_starts)
+    fixture_perf['Application'][:n_types] = fixture_codes
+    fixture_perf['BulbType'][:n_types] = lt_cpl_data['BulbType'][type_starts]
+    for idx, name in enumerate(col_names[2:]):
+        fixture_perf[name][:n_types] = norm_fixture_group[:, idx]
 
     # Return the final normalized (within each fixture type)
     # efficiency structured numpy array
@@ -861,21 +842,32 @@ def chk_false_eff(bulb_perf_lm_watts, bulb_perf_watts):
     lighting performance value in W also equals 99.
 
     Args:
-        bulb_perf_lm_watts (numpy.ndarray): Annual lighting performance (lm/W).
+        bulb_perf_lm_watts (numpy.ndarray): Annual lighting performance (lm/W),
+            with the years along the last axis (e.g., one row per lighting
+            type); modified in place.
         bulb_perf_watts (numpy.ndarray): Annual lighting performance (W).
 
     Returns: A numpy structured array of lighting performance values,
         in lm/W, which shows no spurious changes in performance values.
     """
 
-    # Loop through all annual lighting performance values in lm/W
-    for idx in range(0, len(bulb_perf_lm_watts)):
-        # Identify spurious lm/W values as those equal to 99, where the
-        # corresponding W performance value is also 99; set these
-        # values to the previous performance value in the array
-        if idx > 0 and (bulb_perf_lm_watts[idx] == 99) and (
-           bulb_perf_lm_watts[idx] == bulb_perf_watts[idx]):
-            bulb_perf_lm_watts[idx] = bulb_perf_lm_watts[idx - 1]
+    # Identify spurious lm/W values as those equal to 99, where the
+    # corresponding W performance value is also 99 (excluding the
+    # first value in each series of annual values)
+    spurious = (bulb_perf_lm_watts == 99) & (
+        bulb_perf_lm_watts == bulb_perf_watts)
+    spurious[..., 0] = False
+
+    # Set the spurious values to the closest preceding value that is
+    # not spurious
+    prev_idx = numpy.where(
+        spurious, 0, numpy.arange(bulb_perf_lm_watts.shape[-1]))
+    prev_idx = numpy.maximum.accumulate(prev_idx, axis=-1)
+    n_values = bulb_perf_lm_watts.shape[-1]
+    prev_idx = prev_idx.reshape(-1, n_values)
+    bulb_perf_lm_watts[...] = bulb_perf_lm_watts.reshape(-1, n_values)[
+        numpy.arange(len(prev_idx))[:, None], prev_idx].reshape(
+        bulb_perf_lm_watts.shape)
 
     return bulb_perf_lm_watts
 
@@ -923,127 +915,74 @@ def calc_lighting_factors(nrg_stock_data, lt_eff, n_yrs, n_lt_types):
         fixture type ('EQPCLASS'), bulb type ('BULBTYPE'), and year.
     """
 
-    # Extract the first year of reported lighting data from the
-    # AEO energy and stock data
-    first_yr = min(nrg_stock_data[nrg_stock_data['ENDUSE'] == 'LT']['YEAR'])
-
-    # Obtain census divisions from reported lighting data in the
-    # AEO energy and stock data
-    cdiv_list = set(nrg_stock_data[nrg_stock_data['ENDUSE'] == 'LT']['CDIV'])
+    # Select the lighting data from the AEO energy and stock data
+    lt_nrgst = nrg_stock_data[nrg_stock_data['ENDUSE'] == 'LT']
 
-    # Obtain building types from reported lighting data in the
+    # Extract the first year of reported lighting data from the
     # AEO energy and stock data
-    bldg_list = set(nrg_stock_data[nrg_stock_data['ENDUSE'] == 'LT']['BLDG'])
-
-    # Obtain the lighting fixture types from the lighting efficiency
-    # factors
-    fixture_types = list(set(lt_eff['Application']))
+    first_yr = min(lt_nrgst['YEAR'])
+
+    # Obtain census divisions and building types from reported lighting
+    # data in the AEO energy and stock data, along with the position of
+    # the census division and building type for each row of those data
+    cdiv_list, cdiv_idx = numpy.unique(lt_nrgst['CDIV'], return_inverse=True)
+    bldg_list, bldg_idx = numpy.unique(lt_nrgst['BLDG'], return_inverse=True)
+
+    # Find the lighting type (row in the lighting efficiency factors) for
+    # each row of the lighting energy and stock data; rows for lighting
+    # types without efficiency factors are dropped
+    lt_types_order = numpy.lexsort((lt_eff['BulbType'], lt_eff['Application']))
+    lt_types_sorted = lt_eff[lt_types_order][['Application', 'BulbType']]
+    lt_types_sorted = lt_types_sorted.astype(
+        [('Application', 'U50'), ('BulbType', 'U50')])
+    lt_rows = numpy.empty(len(lt_nrgst), dtype=lt_types_sorted.dtype)
+    lt_rows['Application'] = lt_nrgst['EQPCLASS']
+    lt_rows['BulbType'] = lt_nrgst['BULBTYPE']
+    type_pos = numpy.minimum(numpy.searchsorted(lt_types_sorted, lt_rows),
+                             len(lt_types_sorted) - 1)
+    type_found = lt_types_sorted[type_pos] == lt_rows
+    type_idx = lt_types_order[type_pos]
+
+    # Find the year (relative to the first year) for each row of the
+    # lighting energy and stock data
+    yr_idx = lt_nrgst['YEAR'] - first_yr
+    keep = type_found & (yr_idx >= 0) & (yr_idx < n_yrs)
+
+    # Arrange the lighting stock in an array with dimensions of census
+    # division, building type, lighting type, and year
+    stock = numpy.zeros((len(cdiv_list), len(bldg_list), n_lt_types, n_yrs))
+    stock[cdiv_idx[keep], bldg_idx[keep], type_idx[keep], yr_idx[keep]] = \
+        lt_nrgst['EQSTOCK'][keep]
+
+    # Multiply the stock for each lighting type by the corresponding
+    # efficiency factors
+    eff = numpy.column_stack(
+        [lt_eff[x] for x in lt_eff.dtype.names[2:]])[:, :n_yrs]
+    stock_eff = stock * eff
+
+    # Divide the efficiency-weighted stock for each lighting type by the
+    # total for all bulb types of the same fixture type
+    _, fixture_inv = numpy.unique(lt_eff['Application'], return_inverse=True)
+    fixture_map = numpy.zeros((n_lt_types, fixture_inv.max() + 1))
+    fixture_map[numpy.arange(n_lt_types), fixture_inv] = 1
+    total_denom = numpy.einsum('cbty,tf->cbfy', stock_eff, fixture_map)
+    factors = stock_eff/total_denom[:, :, fixture_inv, :]
 
     # Define the dtype for the lighting weighting factors array
     lt_wf_dtype = [('CDIV', 'i4'), ('BLDG', 'i4'), ('EQPCLASS', 'U4'),
                    ('BULBTYPE', 'U4'), ('YEAR', 'i4'), ('FACTOR', 'f8')]
 
-    # Calculate the number of rows for the lighting weighting factors
-    # array - unique factors are calculated for each combination of
-    # census division, building type, year, fixture type, and bulb type
-    n_rows = len(cdiv_list)*len(bldg_list)*n_yrs*n_lt_types
-
-    # Preallocate the structured array for the lighting weighting factors
-    lt_wf = numpy.zeros(n_rows, dtype=lt_wf_dtype)
-
-    incr = 0  # Initialize array position increment variable
-
-    # Prepare the lighting weighting factors for each unique census
-    # division, building type, fixture type, and bulb type
-    for cdiv in cdiv_list:
-        for bldg in bldg_list:
-            for fixture in fixture_types:
-                # Select the subset of the lighting energy and stock
-                # data corresponding to the current census division,
-                # building type, and fixture type
-                lt_nrgst = nrg_stock_data[numpy.all(
-                    [nrg_stock_data['ENDUSE'] == 'LT',
-                     nrg_stock_data['CDIV'] == cdiv,
-                     nrg_stock_data['BLDG'] == bldg,
-                     nrg_stock_data['EQPCLASS'] == fixture], axis=0)]
-
-                # Extract the unique (no repeated entries) list of
-                # applicable bulb types for this fixture type
-                bulb_types = list(set(
-                    lt_eff[lt_eff['Application'] == fixture]['BulbType']))
-
-                # Preallocate 1-D array to store total stock for all bulb
-                # types for the current lighting type
-                total_denom = numpy.zeros(n_yrs)
-
-                # Preallocate intermediate list to store indices for
-                # the lighting weighting factors calculated below
-                array_indices = []
-
-                # Preallocate intermediate array to store stock-weighted
-                # factors for all bulb types for the current lighting
-                # type, where each row corresponds to a bulb type and
-                # each column to a year
-                fixture_array_tmp = numpy.zeros((len(bulb_types), n_yrs))
-
-                for idx, bulb in enumerate(bulb_types):
-                    # Obtain the stock for the current bulb type
-                    # as a 1-D numpy array (vector with value for each year)
-                    x = lt_nrgst[lt_nrgst['BULBTYPE'] == bulb]
-                    x = x['EQSTOCK']
-
-                    # Obtain the efficiency factors for the current
-                    # bulb type though as a numpy structured array
-                    # that is next converted into a form that can be
-                    # multiplied by another array
-                    y = lt_eff[
-                        numpy.all([lt_eff['Application'] == fixture,
-                                   lt_eff['BulbType'] == bulb],
-                                  axis=0)]
-
-                    # Convert the structured array into a list and strip
-                    # off the leading Application and BulbType strings
-                    y = list(list(y)[0])[2:]
-
-                    # Multiply the stock for this bulb type with
-                    # the corresponding efficiency factors and
-                    # insert them into the appropriate row in the
-                    # temporary matrix
-                    tmp_vals = x*y
-                    fixture_array_tmp[idx, ] = tmp_vals
-
-                    # Add the stock for this bulb type multiplied by
-                    # the corresponding efficiency factors to the total
-                    total_denom += tmp_vals
-
-                    # Develop the array of indices for the current bulb type,
-                    # where each row corresponds to a single year
-                    for st in range(0, n_yrs):
-                        indices = [cdiv, bldg, fixture, bulb, st+first_yr]
-                        # Add the index values to the intermediate list
-                        array_indices.append(indices)
-                    # This loop approach is probably not the most runtime
-                    # efficient, but it avoids the need to create a
-                    # structured array as the intermediate array, since
-                    # the indices are a mix of strings and integers
-
-                # Divide the stock in each row of the intermediate
-                # matrix of lighting weighting factors by the total stock
-                fixture_array_tmp = fixture_array_tmp/total_denom
-
-                # Recast the 2-D array of weighting factors into a 1-D
-                # array to match the number of rows in the indices list
-                fixture_array_1d = numpy.reshape(fixture_array_tmp,
-                                                 numpy.size(fixture_array_tmp))
-
-                # For each lighting stock multiplier, construct the row
-                # from the indices and the value and insert it into the
-                # final array
-                for idx, val in enumerate(fixture_array_1d):
-                    lt_wf[incr+idx, ] = tuple(array_indices[idx] + [val])
-
-                # Update the array position increment variable
-                incr += idx+1
+    # Construct the structured array for the lighting weighting factors,
+    # with a row for each combination of census division, building type,
+    # fixture and bulb type, and year
+    grid = numpy.indices(factors.shape).reshape(4, -1)
+    lt_wf = numpy.zeros(factors.size, dtype=lt_wf_dtype)
+    lt_wf['CDIV'] = cdiv_list[grid[0]]
+    lt_wf['BLDG'] = bldg_list[grid[1]]
+    lt_wf['EQPCLASS'] = lt_eff['Application'][grid[2]]
+    lt_wf['BULBTYPE'] = lt_eff['BulbType'][grid[2]]
+    lt_wf['YEAR'] = grid[3] + first_yr
+    lt_wf['FACTOR'] = factors.ravel()
 
     return lt_wf
 
@@ -1143,7 +1082,8 @@ def data_import(data_file_path, dtype_list, delim_char=',', skip_rows=[]):
     Read the contents of a data file with a header line and convert
     it into a numpy structured array using the provided dtype definition.
     If specified, also skip lines that have values in the first column
-    indicated by 'skip_rows.'
+    indicated by 'skip_rows.' The file is read in a single pass (see
+    'eia_import'), unless the data type of a column must be corrected.
 
     Args:
         data_file_path (str): The full path to the data file to be imported.
@@ -1159,27 +1099,10 @@ def data_import(data_file_path, dtype_list, delim_char=',', skip_rows=[]):
         columns specified by dtype_list.
     """
 
-    # Open the target CSV formatted data file
-    with open(data_file_path) as thefile:
-
-        # This use of csv.reader assumes that the default setting of
-        # quotechar '"' is appropriate; the skipinitialspace option
-        # ensures proper reading of double-quoted text strings in the
-        # AEO data that have the delimiter inside them (e.g., cooking
-        # equipment descriptions); the loop which csv.reader is called
-        # is used to detect NULL characters and act appropriately (by
-        # removing them prior to converting to a csv.reader object)
-        # if they are encountered
-        if '\0' in open(data_file_path).read():  # NULL bytes detected
-            filecont = csv.reader((x.replace('\0', '') for x in thefile),
-                                  delimiter=delim_char, skipinitialspace=True)
-        else:  # No NULL bytes, proceed normally
-            filecont = csv.reader(thefile,
-                                  delimiter=delim_char, skipinitialspace=True)
-
-        # Create list to be populated with tuples of each row of data
-        # from the data file
-        data = []
+    def data_rows():
+        """Read the rows of data from the file to be imported."""
+        # Read the rows of the data file (with any NULL characters removed)
+        filecont = eia_import.text_rows(data_file_path, delim_char)
 
         # Skip first line of the file
         next(filecont)
@@ -1193,27 +1116,28 @@ def data_import(data_file_path, dtype_list, delim_char=',', skip_rows=[]):
         # can be coerced to strings or floats and empty strings cannot)
         for row in filecont:
             if row[0].strip() not in skip_rows:
-                if len(tuple(row)) != len(dtype_list):
+                if len(row) != len(dtype_list):
                     row = row + [0]*(len(dtype_list)-len(row))
-                data.append(tuple(row))
+                yield row
 
-        # Convert data into numpy structured array, using a try/catch
-        # for the case where the data type for a particular column
-        # is not identified correctly by the dtype_array function
-        try:
-            final_struct = numpy.array(data, dtype=dtype_list)
-        # Target error "ValueError: invalid literal for int() with base 10: ''"
-        except ValueError:
-            # In the 2017 AEO data, some consumption data are reported
-            # as floating point numbers on the 0.5 for some reason;
-            # update the dtype for that column to float
-            dtype_list[7] = (dtype_list[7][0], 'f8')
+    # Convert data into numpy structured array, using a try/catch
+    # for the case where the data type for a particular column
+    # is not identified correctly by the dtype_array function
+    try:
+        final_struct = eia_import.rows_to_array(data_rows(), dtype_list)
+    # Target error "ValueError: invalid literal for int() with base 10: ''"
+    except ValueError:
+        # In the 2017 AEO data, some consumption data are reported
+        # as floating point numbers on the 0.5 for some reason;
+        # update the dtype for that column to float
+        dtype_list[7] = (dtype_list[7][0], 'f8')
 
-            # With the '' strings replaced with integer coercible
-            # values, create the numpy array as originally desired
-            final_struct = numpy.array(data, dtype=dtype_list)
+        # With the '' strings replaced with integer coercible
+        # values, import the data again to create the numpy array
+        # as originally desired
+        final_struct = eia_import.rows_to_array(data_rows(), dtype_list)
 
-        return final_struct
+    return final_struct
 
 
 def str_cleaner(data_array, column_name):
@@ -1352,8 +1276,9 @@ def main():
 
         # Import EIA RESDBOUT.txt energy use and stock file
         ns_dtypes = dtype_array(eiadata.res_energy, '\t')
-        ns_data = data_import(eiadata.res_energy, ns_dtypes, '\t'
-                              ['SF', 'ST', 'FP'])
+        ns_data = eia_import.cached_import(
+            data_import, eiadata.res_energy, ns_dtypes, '\t',
+            ['SF', 'ST', 'FP'])
     else:
         yrs_range = 42
         lt_skip_header = 37
@@ -1361,9 +1286,10 @@ def main():
 
         # Import EIA RESDBOUT.txt energy use and stock file
         ns_dtypes = dtype_array(eiadata.res_energy)
-        ns_data = data_import(eiadata.res_energy, ns_dtypes, ',',
-                              ['SF', 'ST', 'FP', 'HSHE', 'HSHN',
-                               'HSHA', 'CSHA', 'CSHE', 'CSHN'])
+        ns_data = eia_import.cached_import(
+            data_import, eiadata.res_energy, ns_dtypes, ',',
+            ['SF', 'ST', 'FP', 'HSHE', 'HSHN',
+             'HSHA', 'CSHA', 'CSHE', 'CSHN'])
 
     # THIS APPROACH MAY NEED TO BE REVISITED IN THE FUTURE; AS IS,
     # IT DOES NOT ENSURE CONSISTENCY WITH THE OTHER AEO INPUT DATA
@@ -1377,7 +1303,8 @@ def main():
 
     # Import residential thermal load components data
     tl_dtypes = dtype_array(handyvars.res_tloads, '\t')
-    tl_data = data_import(handyvars.res_tloads, tl_dtypes, '\t')
+    tl_data = eia_import.cached_import(
+        data_import, handyvars.res_tloads, tl_dtypes, '\t')
 
     # Explicitly define the lighting data type (note that special)
     eia_lt_dtype = [('FirstYear', 'i4'), ('LastYear', 'i4'), ('Cost', 'f8'),
@@ -1392,8 +1319,9 @@ def main():
     # data for the purposes of redistributing the energy data, which
     # are reported for only one lighting technology type (bulb type)
     # for each fixture/luminaire type
-    eia_lt = numpy.genfromtxt(rmt.EIAData().r_lt_all, dtype=eia_lt_dtype,
-                              skip_header=lt_skip_header, skip_footer=54)
+    eia_lt = eia_import.cached_import(
+        numpy.genfromtxt, rmt.EIAData().r_lt_all, dtype=eia_lt_dtype,
+        skip_header=lt_skip_header, skip_footer=54)
 
     # Compute the number of unique lighting fixture and bulb type combinations
     n_lt_types = sum([len(set(eia_lt[eia_lt['Application'] == x]['BulbType']))
@@ -1424,9 +1352,15 @@ def main():
          handyvars.json_out, 'w') as jso:
         msjson = json.load(jsi)
 
+        # Index the rows of the energy and stock data and the thermal
+        # load components data by the columns used to select the data
+        # for each microsegment
+        ns_index = eia_import.RowGroupIndex(ns_data, nrg_stock_index_cols)
+        tl_index = eia_import.RowGroupIndex(tl_data, tloads_index_cols)
+
         # Run through JSON objects, determine replacement information
         # to mine from the imported data, and make the replacements
-        result = walk(ns_data, tl_data, msjson, yrs_range, lt_wt_fac)
+        result = walk(ns_index, tl_index, msjson, yrs_range, lt_wt_fac)
 
         # Write the updated dict of data to a new JSON file
         json.dump(result, jso, indent=2, default=fix_ints)
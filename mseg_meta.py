@@ -6,6 +6,7 @@ import mseg as rm
 import mseg_techdata as rmt
 import com_mseg as cm
 import com_mseg_tech as cmt
+import eia_import
 
 import numpy as np
 import re
@@ -78,6 +79,56 @@ def extract_year_range(data_array, colnames, min_years, max_years, pivot_yr=0):
     return new_min_years, new_max_years
 
 
+def year_columns_import(file_name, colnames, skip_rows=[], pad_rows=False):
+    """Import only the column(s) of year data from an EIA data file.
+
+    Rather than importing every column of a (potentially very large)
+    EIA data file, the file is read in a single pass and only the
+    values in the year column(s) are converted and stored. The rows
+    included are the same as those imported by the full data import
+    functions for the file (i.e., 'mseg.data_import' or
+    'com_mseg.data_import'), such that the year range found is the same.
+
+    Args:
+        file_name (str): The name of the file to be imported, which
+            should have a header line with the column names followed by
+            rows of comma- or tab-delimited data.
+        colnames (list): List of strings specifying the name(s) of the
+            column(s) containing year data.
+        skip_rows (list): A list of strings, one of which will appear
+            in the first column of each row to be skipped.
+        pad_rows (bool): If True, rows with fewer values than the header
+            are completed with 0 values; otherwise, rows that are not
+            the same length as the header are skipped.
+
+    Returns:
+        A numpy structured array with only the year column(s).
+    """
+    # Determine the delimiter from the header line of the file
+    with open(file_name) as thefile:
+        delim_char = '\t' if '\t' in thefile.readline() else ','
+
+    # Read the header line and locate the column(s) of year data
+    filecont = eia_import.text_rows(file_name, delim_char)
+    header = [entry.strip() for entry in next(filecont)]
+    n_cols = len(header)
+    usecols = [header.index(name) for name in colnames]
+
+    def data_rows():
+        """Select the rows of data that would be imported."""
+        for row in filecont:
+            if not row or row[0].strip() in skip_rows:
+                continue
+            if len(row) != n_cols:
+                if not pad_rows:
+                    continue
+                row = row + [0]*(n_cols-len(row))
+            yield row
+
+    return eia_import.rows_to_array(
+        data_rows(), [(name, 'i4') for name in colnames], usecols=usecols)
+
+
 def dtype_ripper(the_dtype, min_years, max_years):
     """Extract the range of years from the dtype of a structured array.
 
@@ -272,30 +323,26 @@ def main():
         lt_skip_header = 37
 
     def import_residential_energy_stock_data(file_name):
-        # The delimiters for RESDBOUT vary depending on the release
-        # year of the data
-        try:  # comma-delimited
-            ns_dtypes = rm.dtype_array(file_name)
-            ns_data = rm.data_import(file_name, ns_dtypes, ',',
-                                     ['SF', 'ST', 'FP', 'HSHE', 'HSHN',
-                                      'HSHA', 'CSHA', 'CSHE', 'CSHN'])
-        except (IndexError, ValueError):  # tab-delimited
-            ns_dtypes = rm.dtype_array(file_name, '\t')
-            ns_data = rm.data_import(file_name, ns_dtypes, '\t',
-                                     ['SF', 'ST', 'FP', 'HSHE', 'HSHN',
-                                      'HSHA', 'CSHA', 'CSHE', 'CSHN'])
+        # Import only the years from the energy and stock data (the
+        # delimiters for RESDBOUT vary depending on the release year of
+        # the data and are determined from the file)
+        ns_data = year_columns_import(file_name, ['YEAR'],
+                                      ['SF', 'ST', 'FP', 'HSHE', 'HSHN',
+                                       'HSHA', 'CSHA', 'CSHE', 'CSHN'],
+                                      pad_rows=True)
         return ns_data
 
     def import_residential_cpl_non_lighting_data(file_name, skip_header_lines):
-        eia_nlt_cp = np.genfromtxt(file_name, names=rmt.r_nlt_cp_names,
-                                   dtype=None, comments=None,
-                                   skip_header=skip_header_lines)
+        eia_nlt_cp = eia_import.cached_import(
+            np.genfromtxt, file_name, names=rmt.r_nlt_cp_names,
+            dtype=None, comments=None, skip_header=skip_header_lines)
         return eia_nlt_cp
 
     def import_residential_cpl_lighting_data(file_name, skip_header_lines):
-        eia_lt = np.genfromtxt(file_name, names=rmt.r_lt_names,
-                               dtype=None, comments=None,
-                               skip_header=skip_header_lines, skip_footer=54)
+        eia_lt = eia_import.cached_import(
+            np.genfromtxt, file_name, names=rmt.r_lt_names,
+            dtype=None, comments=None, skip_header=skip_header_lines,
+            skip_footer=54)
         return eia_lt
 
     def import_commercial_service_demand_data(file_name):  # KSDOUT.txt
@@ -303,8 +350,7 @@ def main():
         return serv_dtypes
 
     def import_commercial_energy_stock_data(file_name):  # KDBOUT.txt
-        catg_dtypes = cm.dtype_array(file_name)
-        catg_data = cm.data_import(file_name, catg_dtypes)
+        catg_data = year_columns_import(file_name, ['Year'])
         return catg_data
 
     def import_commercial_cpl_data(file_name):  # ktek.csv
@@ -315,15 +361,15 @@ def main():
                                         cmt.UsefulVars().columns_to_keep)
         # Manual correction of lifetime data type
         tech_dtypes[8] = ('Life', 'f8')
-        tech_data = cm.data_import(file_name, tech_dtypes, ',',
-                                   cmt.UsefulVars().cpl_data_skip_lines,
-                                   col_indices)
+        tech_data = eia_import.cached_import(
+            cm.data_import, file_name, tech_dtypes, ',',
+            cmt.UsefulVars().cpl_data_skip_lines, col_indices)
         return tech_data
 
     def import_commercial_time_preference_data(file_name):  # kprem.txt
-        tpp_data = cmt.kprem_import(file_name,
-                                    cmt.UsefulVars().tpp_dtypes,
-                                    cmt.UsefulVars().tpp_data_skip_lines)
+        tpp_data = eia_import.cached_import(
+            cmt.kprem_import, file_name, cmt.UsefulVars().tpp_dtypes,
+            cmt.UsefulVars().tpp_data_skip_lines)
         return tpp_data
 
     min_yrs, max_yrs = file_processor(rm.EIAData().res_energy,
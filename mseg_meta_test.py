@@ -6,6 +6,8 @@ import mseg_meta as mm
 # Import needed packages
 import unittest
 import numpy as np
+import tempfile
+import os
 
 
 class YearRangeExtractionFromStructuredArraysTest(unittest.TestCase):
@@ -293,6 +295,44 @@ class FileProcessorCombinedFunctionTest(unittest.TestCase):
         self.assertEqual(self.files_as_output, self.files_to_check)
 
 
+class YearColumnImportTest(unittest.TestCase):
+    """ Test the function that imports only the year data from an EIA
+    data file, skipping the rows that are not imported by the full
+    data import functions """
+
+    # Define sample residential energy and stock data (tab-delimited,
+    # with a row to skip and a row that is missing values)
+    res_text = ('ENDUSE\tCDIV\tYEAR\tEQSTOCK\tCONSUMPTION\n'
+                'HT\t1\t2009\t5.5\t2\n'
+                'SF\t1\t1990\t1.5\t3\n'
+                'CL\t2\t2040\t3.5\t4\n'
+                'HT\t3\n')
+
+    # Define sample commercial energy and stock data (comma-delimited,
+    # with an informational line at the end of the file)
+    com_text = ('Division,BldgType,Year,Amount,Label\n'
+                '1,1,22,1.5,EndUseConsump\n'
+                '9,11,51,2.5,EndUseConsump\n'
+                'Informational text about the data\n')
+
+    # Write the sample text to a temporary file and import the years
+    def import_text(self, text, *args, **kwargs):
+        with tempfile.TemporaryDirectory() as data_dir:
+            data_file = os.path.join(data_dir, 'data.txt')
+            with open(data_file, 'w') as fobj:
+                fobj.write(text)
+            return mm.year_columns_import(data_file, *args, **kwargs)
+
+    # Check the years imported, with and without completing short rows
+    def test_year_column_import(self):
+        res_data = self.import_text(self.res_text, ['YEAR'], ['SF'],
+                                    pad_rows=True)
+        np.testing.assert_array_equal(res_data['YEAR'], [2009, 2040, 0])
+        self.assertEqual(res_data.dtype.names, ('YEAR',))
+        com_data = self.import_text(self.com_text, ['Year'])
+        np.testing.assert_array_equal(com_data['Year'], [22, 51])
+
+
 # Offer external code execution (include all lines below this point in all
 # test files)
 def main():
@@ -4,6 +4,7 @@ import re
 import numpy
 import json
 import mseg
+import eia_import
 import copy
 import argparse
 
@@ -828,13 +829,11 @@ def fill_years_nlt(match_list, project_dict, tech_dict_key):
                                         ("INST_COST", "<f8"),
                                         ("EFF_CHOICE_P1", "<f8"),
                                         ("EFF_CHOICE_P2", "<f8")])
-    # Update performance information for projection years
-    perf = stitch(match_list, project_dict, "BASE_EFF")
-    # Update cost information for projection years
-    cost = stitch(match_list, project_dict, "INST_COST")
-    # Update consumer choice parameters for projection years
-    b1 = stitch(match_list, project_dict, "EFF_CHOICE_P1")
-    b2 = stitch(match_list, project_dict, "EFF_CHOICE_P2")
+    # Update performance, cost, and consumer choice information for
+    # projection years
+    [perf, cost, b1, b2] = stitch_columns(
+        match_list, project_dict,
+        ["BASE_EFF", "INST_COST", "EFF_CHOICE_P1", "EFF_CHOICE_P2"])
 
     # Return updated EIA performance, cost, and consumer choice information for
     # non-lighting technologies
@@ -849,12 +848,9 @@ def fill_years_lt(match_list, project_dict):
     # Filter out any rows where 9999 is found in lighting life column (invalid)
     match_list = match_list[numpy.where(match_list["LIFE_HRS"] != 9999)]
 
-    # Update performance information for projection years
-    perf = stitch(match_list, project_dict, "BASE_EFF")
-    # Update cost information for projection years
-    cost = stitch(match_list, project_dict, "INST_COST")
-    # Update lifetime information for projection years
-    life = stitch(match_list, project_dict, "LIFE_HRS")
+    # Update performance, cost, and lifetime information for projection years
+    [perf, cost, life] = stitch_columns(
+        match_list, project_dict, ["BASE_EFF", "INST_COST", "LIFE_HRS"])
     # Convert lighting lifetimes from hours to years
     for yr in life.keys():
         life[yr] = life[yr] / 8760
@@ -864,6 +860,61 @@ def fill_years_lt(match_list, project_dict):
     return [perf, cost, life]
 
 
+def stitch_rows(input_array, project_dict):
+    """ Given EIA performance, cost, and lifetime projections for a technology
+    between a series of time periods (i.e. 2010-2014, 2014-2020, 2020-2040),
+    find the row of the projections that applies to each year of the modeling
+    time horizon used in "mseg.py"; a year with no row starting in that year
+    takes the row found for the previous year, and the first year takes the
+    row whose "START_EQUIP_YR" is closest to it if no row starts in that year
+    (the first such row if the closest rows are equally distant) """
+
+    # Sort the years of the modeling time horizon
+    years = sorted(project_dict.keys())
+    yr_vals = numpy.array([int(x) for x in years])
+
+    # Sort the rows of the input array on the "START_EQUIP_YR" column and
+    # find the range of sorted rows that start in each year of the modeling
+    # time horizon
+    start_yrs = input_array["START_EQUIP_YR"]
+    order = numpy.argsort(start_yrs, kind="mergesort")
+    start_lo = numpy.searchsorted(start_yrs[order], yr_vals, side="left")
+    start_hi = numpy.searchsorted(start_yrs[order], yr_vals, side="right")
+
+    # Yield an error if multiple rows start in any of the years
+    if numpy.any((start_hi - start_lo) > 1):
+        raise ValueError("Multiple identical years in filtered array!")
+
+    # Set the row for each year with a row starting in that year, and for
+    # the first year if it has no such row, the row closest to that year
+    matched = start_hi > start_lo
+    rows = numpy.full(len(years), -1)
+    rows[matched] = order[start_lo[matched]]
+    if not matched[0]:
+        rows[0] = numpy.argmin(abs(yr_vals[0] - start_yrs))
+        matched[0] = True
+
+    # Carry the row for each year with a row forward to the following
+    # years without a row
+    rows = rows[numpy.maximum.accumulate(
+        numpy.where(matched, numpy.arange(len(rows)), 0))]
+
+    return years, rows
+
+
+def stitch_columns(input_array, project_dict, col_names):
+    """ Given EIA performance, cost, and lifetime projections for a technology
+    between a series of time periods, reconstruct the information in each of
+    several columns of the projections in a dict with annual keys across the
+    modeling time horizon used in "mseg.py" (see "stitch") """
+
+    # Find the row of the input array for each year of the modeling time
+    # horizon once, and draw the output information for each column from it
+    years, rows = stitch_rows(input_array, project_dict)
+    return [dict(zip(years, input_array[x][rows].astype(float).tolist()))
+            for x in col_names]
+
+
 def stitch(input_array, project_dict, col_name):
     """ Given EIA performance, cost, and lifetime projections for a technology
     between a series of time periods (i.e. 2010-2014, 2014-2020, 2020-2040),
@@ -871,70 +922,9 @@ def stitch(input_array, project_dict, col_name):
     modeling time horizon used in "mseg.py" (i.e. {"2009": XXX, "2010": XXX,
     ..., "2040": XXX}) """
 
-    # Initialize output dict which will contain EIA performance, cost,
-    # or lifetime information continuous across each year of the
-    # modeling time horizon
-    output_dict = {}
-
-    # Initialize a previous year value indicator to be used
-    # in cases where the input array does not contain information
-    # for a given year in the modeling time horizon
-    prev_yr_val = None
-
-    # Loop through each year of the projection and fill in information
-    # from the appropriate row and column from the input array
-    for (yr_ind, yr) in enumerate(sorted(project_dict.keys())):
-        # Reduce the input array to only the row concerning the year being
-        # looped through (if this year exists in the "START_EQUIP_YR" column)
-        array_reduce = input_array[input_array["START_EQUIP_YR"] == int(yr)]
-        # If a unique row has been discovered for the looped year, draw output
-        # information from column in that row keyed by col_name input; if
-        # there are multiple rows that match the looped year, yield an error
-        if array_reduce.shape[0] > 0:
-            if array_reduce.shape[0] == 1:
-                output_dict[yr] = float(array_reduce[col_name])
-            else:
-                raise ValueError("Multiple identical years in filtered array!")
-        # If no row has been discovered for the looped year and we are not in
-        # the first year of the loop, set output information to that of the
-        # previously looped year
-        elif yr_ind != 0:
-            output_dict[yr] = prev_yr_val
-        # If no row has been discovered for the looped year and we are in the
-        # first year of the loop, set output information to that of the row
-        # with a "START_EQUIP_YR" that is closest to the looped year
-        else:
-            # Find the row(s) where the absolute difference between the loop
-            # year and value for the "START_EQUIP_YR" column is smallest
-            array_close_ind = numpy.where(abs(int(yr) -
-                                          input_array["START_EQUIP_YR"]) ==
-                                          min(abs(int(yr) -
-                                              input_array[
-                                              "START_EQUIP_YR"])))[0]
-            # If only one row has been found above, draw output information
-            # from the column in that row keyed by col_name input
-            if len(array_close_ind) == 1:
-                output_dict[yr] = float(input_array[array_close_ind][col_name])
-            # If multiple rows have been found above and each has a unique year
-            # value, draw output information from the column in the first of
-            # these rows keyed by col_name input; if multiple rows have been
-            # found with the same year value, yield an error
-            else:
-                if len(array_close_ind) > 1 and \
-                   len(numpy.unique(array_close_ind)) == len(array_close_ind):
-                    output_dict[yr] = float(
-                        input_array[array_close_ind][0][col_name])
-                else:
-                    raise ValueError("Multiple identical years in filtered" +
-                                     " array!")
-
-        # Update previous year value indicator to the output information for
-        # the current loop
-        prev_yr_val = output_dict[yr]
-
     # Return output dictionary with performance, lifetime, or cost information
     # updated across all projection years
-    return output_dict
+    return stitch_columns(input_array, project_dict, [col_name])[0]
 
 
 def main():
@@ -970,21 +960,21 @@ def main():
     eiadata = EIAData()
 
     # Import EIA non-lighting residential cost and performance data
-    eia_nlt_cp = numpy.genfromtxt(eiadata.r_nlt_costperf, names=r_nlt_cp_names,
-                                  dtype=None, comments=None,
-                                  skip_header=nlt_cp_skip_header,
-                                  encoding="latin1")
+    eia_nlt_cp = eia_import.cached_import(
+        numpy.genfromtxt, eiadata.r_nlt_costperf, names=r_nlt_cp_names,
+        dtype=None, comments=None, skip_header=nlt_cp_skip_header,
+        encoding="latin1")
 
     # Import EIA non-lighting residential lifetime data
-    eia_nlt_l = numpy.genfromtxt(eiadata.r_nlt_life, names=r_nlt_l_names,
-                                 dtype=None, comments=None,
-                                 skip_header=19, encoding="latin1")
+    eia_nlt_l = eia_import.cached_import(
+        numpy.genfromtxt, eiadata.r_nlt_life, names=r_nlt_l_names,
+        dtype=None, comments=None, skip_header=19, encoding="latin1")
 
     # Import EIA lighting residential cost, performance and lifetime data
-    eia_lt = numpy.genfromtxt(eiadata.r_lt_all, names=r_lt_names,
-                              dtype=None, comments=None,
-                              skip_header=lt_skip_header, skip_footer=54,
-                              encoding="latin1")
+    eia_lt = eia_import.cached_import(
+        numpy.genfromtxt, eiadata.r_lt_all, names=r_lt_names,
+        dtype=None, comments=None, skip_header=lt_skip_header,
+        skip_footer=54, encoding="latin1")
 
     # Establish the modeling time horizon based on metadata generated
     # from EIA AEO data files
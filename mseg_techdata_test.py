@@ -1070,6 +1070,16 @@ class StitchTest(unittest.TestCase):
             dict2 = self.ok_out[idx]
             self.dict_check(dict1, dict2)
 
+    # Test that the output dicts for all of the variables are yielded by a
+    # single call to the stitch_columns function, including when the rows of
+    # the input array are not sorted by their "START_EQUIP_YR" column values
+    def test_convert_match_columns(self):
+        for in_array in [self.ok_array, self.ok_array[::-1]]:
+            dicts = mseg_techdata.stitch_columns(
+                in_array, self.project_dict, self.col_names)
+            for (dict1, dict2) in zip(dicts, self.ok_out):
+                self.dict_check(dict1, dict2)
+
     # Test that the function yields a ValueError given the fail_array above,
     # which includes multiple rows with the same "START_EQUIP_YR" column value
     def test_convert_fail(self):
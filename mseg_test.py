@@ -4,6 +4,7 @@
 
 # Import code to be tested
 import mseg as rm
+import eia_import
 
 # Import needed packages
 import unittest
@@ -385,6 +386,26 @@ class NumpyArrayReductionTest(unittest.TestCase):
             # Compare consumption
             self.assertEqual(b, self.EIA_nrg_stock_out[n][1])
 
+    # Test that restructuring of EIA data from a prebuilt index of the
+    # rows of the EIA data yields the same results as from the data array
+    def test_recording_of_EIA_data_indexed(self):
+        nrg_stock_index = eia_import.RowGroupIndex(
+            self.EIA_nrg_stock, rm.nrg_stock_index_cols)
+        for n in range(0, len(self.EIA_nrg_stock_filter)):
+            (a, b) = rm.nrg_stock_select(nrg_stock_index,
+                                         self.EIA_nrg_stock_filter[n])
+            self.assertEqual(a, self.EIA_nrg_stock_out[n][0])
+            self.assertEqual(b, self.EIA_nrg_stock_out[n][1])
+        for n in range(0, len(self.EIA_sqft_homes_filter)):
+            a = rm.sqft_homes_select(nrg_stock_index,
+                                     self.EIA_sqft_homes_filter[n])
+            self.assertEqual(a, self.EIA_sqft_homes_out[n])
+        # Select data for multiple fuel types at once
+        (a, b) = rm.nrg_stock_select(
+            nrg_stock_index, [['HT', 9, 2, ('GS', 'EL')], ''])
+        self.assertEqual(a, {"2010": 16, "2011": 14, "2012": 12})
+        self.assertEqual(b, {"2010": 12, "2011": 14, "2012": 16})
+
     # Test restructuring of EIA data into a square footage list, confirming
     # that both the reported data and the reduced array with the remaining
     # data are correct
@@ -841,6 +862,15 @@ class LightingEfficiencyTablePrepTest(unittest.TestCase):
                  for name in row.dtype.names
                  if name not in ('Application', 'BulbType')]))
 
+    # Test that an error is raised if the CPL data for a lighting type
+    # (here, GSL LED, missing its final row) cover too few years
+    def test_lighting_efficiency_table_prep_missing_years(self):
+        short_cpl_data = np.delete(self.lighting_cpl_data, 4)
+        with self.assertRaises(ValueError):
+            rm.lighting_eff_prep(short_cpl_data,
+                                 self.total_n_years,
+                                 self.n_lighting_types)
+
 
 class LightingStockWeightedFactorsTest(unittest.TestCase):
     """ Test the function that takes the normalized bulb efficiency
@@ -13,6 +13,7 @@ from optparse import OptionParser
 import subprocess
 import sys
 import warnings
+import ecm_prep
 
 
 class UsefulInputFiles(object):
@@ -20,7 +21,11 @@ class UsefulInputFiles(object):
 
     Attributes:
         metadata = Baseline metadata including common min/max for year range.
-        meas_summary_data (string): High-level measure summary data.
+        meas_summary_data (string): High-level measure summary data (as
+            previously written to a single file).
+        meas_summary_store (string): Directory of high-level measure summary
+            data, with one file per measure and a manifest file listing all
+            measure names.
         meas_compete_data (string): Contributing microsegment data needed
             for measure competition.
         active_measures (string): Measures that are active for the analysis.
@@ -35,6 +40,7 @@ class UsefulInputFiles(object):
         # self.metadata = "metadata_2017.json"
         self.meas_summary_data = \
             ("supporting_data", "ecm_prep.json")
+        self.meas_summary_store = ("supporting_data", "ecm_prep")
         self.meas_compete_data = ("supporting_data", "ecm_competition_data")
         self.active_measures = "run_setup.json"
         self.meas_engine_out_ecms = ("results", "ecm_results.json")
@@ -58,6 +64,12 @@ class UsefulVars(object):
             the building sector categories used in summarizing measure outputs.
         out_break_enduses (OrderedDict): Maps measure end use names to
             the end use categories used in summarizing measure outputs.
+        out_break_czones_map (dict): Maps climate zone names to output
+            climate zone categories.
+        out_break_bldgtypes_map (dict): Maps building type and structure
+            type names to output building sector categories.
+        out_break_enduses_map (dict): Maps end use and technology type (or,
+            for 'freezers', technology) names to output end use categories.
     """
 
     def __init__(self, base_dir, handyfiles):
@@ -137,6 +149,14 @@ class UsefulVars(object):
             ('Other', [
                 "cooking", "drying", "ceiling fan", "fans & pumps",
                 "MELs", "other (grid electric)"])])
+        # Invert the above output category definitions such that the output
+        # breakout categories for a given climate zone, building type and
+        # structure type, and end use and technology type/technology can be
+        # looked up directly rather than found by scanning each category
+        (self.out_break_czones_map, self.out_break_bldgtypes_map,
+         self.out_break_enduses_map) = ecm_prep.out_break_maps(
+            self.out_break_czones, self.out_break_bldgtypes,
+            self.out_break_enduses)
 
 
 class Measure(object):
@@ -278,38 +298,35 @@ class Engine(object):
             # Set measure climate zone, building sector, and end use
             # output category names for use in filtering and/or breaking
             # out results
-            czones, bldgtypes, end_uses = ([] for n in range(3))
             # Find measure climate zone output categories
-            for cz in self.handyvars.out_break_czones.items():
-                if any([x in cz[1] for x in m.climate_zone]) and \
-                        cz[0] not in czones:
-                    czones.append(cz[0])
-            # Find measure building sector output categories
-            for bldg in self.handyvars.out_break_bldgtypes.items():
-                if any([x in bldg[1] for x in m.bldg_type]) and \
-                        bldg[0] not in bldgtypes:
-                    bldgtypes.append(bldg[0])
-            # Find measure end use output categories
-            for euse in self.handyvars.out_break_enduses.items():
-                # Find primary end use categories
-                if any([x in euse[1] for x in m.end_use["primary"]]) and \
-                        euse[0] not in end_uses:
-                    # * Note: classify special freezers ECM case as
-                    # 'Refrigeration'; classify 'supply' side heating/cooling
-                    # ECMs as 'Heating (Equip.)'/'Cooling (Equip.)' and
-                    # 'demand' side heating/cooling ECMs as 'Envelope'
-                    if (euse[0] == "Refrigeration" and
-                        ("refrigeration" in m.end_use["primary"] or
-                         "freezers" in m.technology)) or (
-                        euse[0] != "Refrigeration" and ((
-                            euse[0] in ["Heating (Equip.)",
-                                        "Cooling (Equip.)"] and
-                            "supply" in m.technology_type["primary"]) or (
-                            euse[0] == "Envelope" and "demand" in
-                            m.technology_type["primary"]) or (euse[0] not in [
-                                "Heating (Equip.)", "Cooling (Equip.)",
-                                "Envelope"]))):
-                        end_uses.append(euse[0])
+            cz_cats = [self.handyvars.out_break_czones_map.get(x) for x in
+                       m.climate_zone]
+            czones = [cz for cz in self.handyvars.out_break_czones.keys() if
+                      cz in cz_cats]
+            # Find measure building sector output categories (for all
+            # structure types)
+            bldg_cats = [self.handyvars.out_break_bldgtypes_map.get(
+                (x, s)) for x in m.bldg_type for s in ["new", "existing"]]
+            bldgtypes = [b for b in self.handyvars.out_break_bldgtypes.keys()
+                         if b in bldg_cats]
+            # Find measure primary end use output categories
+            # * Note: classify special freezers ECM case as 'Refrigeration';
+            # classify 'supply' side heating/cooling ECMs as 'Heating
+            # (Equip.)'/'Cooling (Equip.)' and 'demand' side heating/cooling
+            # ECMs as 'Envelope'
+            tech_types = [None] + [
+                x for x in ["supply", "demand"] if
+                x in m.technology_type["primary"]]
+            euse_cats = [self.handyvars.out_break_enduses_map.get((x, t)) for
+                         x in m.end_use["primary"] for t in tech_types]
+            if "freezers" in m.technology and any([
+                    x in self.handyvars.out_break_enduses["Refrigeration"]
+                    for x in m.end_use["primary"]]):
+                euse_cats.append("Refrigeration")
+            end_uses = []
+            for euse in self.handyvars.out_break_enduses.keys():
+                if euse in euse_cats and euse not in end_uses:
+                    end_uses.append(euse)
                 # Find secondary end use categories
                 if m.end_use["secondary"] is not None and any([
                     x in m.end_use["secondary"] for x in [
@@ -2718,14 +2735,12 @@ def main(base_dir):
     # Instantiate useful variables object
     handyvars = UsefulVars(base_dir, handyfiles)
 
-    # Import measure files
-    with open(path.join(base_dir, *handyfiles.meas_summary_data), 'r') as mjs:
-        try:
-            meas_summary = json.load(mjs)
-        except ValueError as e:
-            raise ValueError(
-                "Error reading in '" + handyfiles.meas_summary_data +
-                "': " + str(e)) from None
+    # Import measure files (one file per measure listed in the measure
+    # summary store manifest or, if the store does not exist, a single
+    # file of all measures)
+    meas_summary = ecm_prep.read_meas_summary(
+        path.join(base_dir, *handyfiles.meas_summary_store),
+        path.join(base_dir, *handyfiles.meas_summary_data))[0]
 
     # Import list of all unique active measures
     with open(path.join(base_dir, handyfiles.active_measures), 'r') as am:
@@ -14,11 +14,17 @@ Following these updates to the active and inactive lists, the user is
 prompted opportunities to move ECMs only from the active to the
 inactive lists based on their desired selections of subsets of some of
 the applicable baseline market categories.
+
+Alternatively, the keywords and baseline market selections can be given
+as command line options (e.g., '--kw_inactive Prospective --climate
+AIA_CZ1,AIA_CZ2 --bldg residential'), in which case no prompts are shown
+and the ECM lists are updated on those selections directly.
 """
 
-import re
 import json
 import os
+from optparse import OptionParser
+import ecm_catalog
 
 
 class UsefulVars(object):
@@ -27,6 +33,8 @@ class UsefulVars(object):
     Attributes:
         setup_file (str): Scout setup/configuration JSON file name
         ecm_folder_location (str): Path to the folder with the ECM JSON files
+        ecm_catalog_location (str): Path to the index of ECM names and
+            baseline market parameters for the ECM JSON files
         market_filters (list): List of strings corresponding to the
             keys in the JSON for the applicable baseline market
             parameters that are handled by this module
@@ -34,6 +42,7 @@ class UsefulVars(object):
     def __init__(self):
         self.setup_file = 'run_setup.json'
         self.ecm_folder_location = './ecm_definitions'
+        self.ecm_catalog_location = './supporting_data/ecm_catalog.json'
         self.market_filters = ['climate_zone', 'bldg_type', 'structure_type']
 
 
@@ -94,22 +103,91 @@ def user_input_ecm_kw(prompt_text):
     # Obtain keywords/search terms from user input
     kw_to_move = input(prompt_text)
 
+    return split_ecm_kw(kw_to_move)
+
+
+def split_ecm_kw(kw_text):
+    """Split a string of comma-separated keywords to filter the ECM lists
+
+    Args:
+        kw_text (str): Keywords/search terms separated by commas.
+
+    Returns:
+        A cleaned list of ECM name filtering keywords, which is empty
+        if no keywords are given.
+    """
+
     # Split lists of filters input by the user based on the specified
     # delimiter and simultaneously strip any leading or trailing
     # whitespace and any empty strings
-    kw_to_move = [val.strip() for val in kw_to_move.split(',') if val.strip()]
+    return [val.strip() for val in kw_text.split(',') if val.strip()]
+
 
-    return kw_to_move
+class ECMNameIndex(object):
+    """Index ECM names by the lower-cased words in the names
 
+    The index maps each lower-cased, whitespace-delimited word in the
+    ECM names to the set of ECM names with that word, such that the
+    ECM names that include a given search term can be found by checking
+    only the ECM names with a word that includes (part of) the term,
+    rather than every ECM name. Search results are cached by term.
 
-def ecm_kw_regex_select(ecm_names_list, list_of_match_str):
+    Attributes:
+        names (set): All of the ECM names in the index
+        names_lower (dict): Lower-cased version of each ECM name
+        words (dict): Sets of ECM names keyed by the lower-cased words
+            in those names
+        term_matches (dict): Sets of ECM names that include each of the
+            search terms looked up so far, keyed by lower-cased term
+    """
+    def __init__(self, ecm_names_list):
+        self.names = set(ecm_names_list)
+        self.names_lower = {x: x.lower() for x in self.names}
+        self.words = {}
+        for name, name_lower in self.names_lower.items():
+            for word in name_lower.split():
+                self.words.setdefault(word, set()).add(name)
+        self.term_matches = {}
+
+    def search(self, term):
+        """Find the ECM names that include a search term
+
+        Args:
+            term (str): Search term, which is matched against the ECM
+                names as (case-insensitive) literal text.
+
+        Returns:
+            The set of ECM names that include the search term.
+        """
+        term = term.lower()
+        if term not in self.term_matches:
+            term_words = term.split()
+            if term_words:
+                # Any ECM name that includes the term has a word that
+                # includes the longest word of the term; only those ECM
+                # names need to be checked against the full term
+                term_word = max(term_words, key=len)
+                candidates = set().union(*[
+                    names for word, names in self.words.items()
+                    if term_word in word])
+                self.term_matches[term] = set([
+                    x for x in candidates if term in self.names_lower[x]])
+            else:
+                # An empty (or whitespace) term matches all ECM names
+                self.term_matches[term] = set([
+                    x for x in self.names if term in self.names_lower[x]])
+
+        return self.term_matches[term]
+
+
+def ecm_kw_regex_select(ecm_names_list, list_of_match_str, name_index=None):
     """Identify matching, non-matching ECM names using a list of search terms
 
     This function searches a list of ECM names to find all of the ECM
     names that have the words specified by the user as search terms.
     This function is used to identify the ECMs that should be moved from
-    the active to inactive list or vice versa. The regex is set up to
-    be case-insensitive.
+    the active to inactive list or vice versa. The search terms are
+    matched as literal text and are not case-sensitive.
 
     Args:
         ecm_names_list (list): A list of ECM names encoded as strings.
@@ -117,6 +195,9 @@ def ecm_kw_regex_select(ecm_names_list, list_of_match_str):
             corresponding to the strings specified by the user to
             be used to select ECMs to move from the active to the
             inactive list, or vice versa.
+        name_index (ECMNameIndex): Index of ECM names that includes all
+            of the names in 'ecm_names_list'; if not given, an index of
+            the names in 'ecm_names_list' is built.
 
     Returns:
         A list of all of the ECM names that matched with the search
@@ -127,25 +208,22 @@ def ecm_kw_regex_select(ecm_names_list, list_of_match_str):
     # If the list is not empty, identify the matching and non-matching
     # entries in the list of ECM names
     if list_of_match_str:
-        # Construct the regex search pattern from the list of strings given
-        nom_regex = re.compile(r'(?:%s)' % '|'.join(list_of_match_str),
-                               re.IGNORECASE).search
-        # Construct the inverse regex search pattern from list of strings given
-        nom_regex_inv = re.compile(r'(?:%s)' % '|'.join([
-            x.strip("! ") for x in list_of_match_str if "!" in x]),
-            re.IGNORECASE).search
-
-        # Construct a list of all of the ECM names that matched the regex
-        matches = [ecm for ecm in ecm_names_list if nom_regex(ecm)]
-        # Construct list of all ECM names that matched the inverse regex
-        matches_inv = [ecm for ecm in ecm_names_list if nom_regex_inv(ecm)]
-        # Add all ECMs that do NOT match the inverse regex search term(s) to
-        # the list of matched ECMs
-        if len(matches_inv) > 0:
-            matches.extend([x for x in ecm_names_list if (
-                x not in matches_inv and x not in matches)])
-        # Construct list of all ECM names that were not matched
-        non_matches = [ecm for ecm in ecm_names_list if ecm not in matches]
+        if name_index is None:
+            name_index = ECMNameIndex(ecm_names_list)
+        # Find the set of ECM names that match any of the search terms
+        matches_set = set().union(
+            *[name_index.search(x) for x in list_of_match_str])
+        # Add all ECMs that do NOT match the inverse search term(s) (i.e.,
+        # terms including "!") to the set of matched ECMs
+        kw_inv = [x.strip("! ") for x in list_of_match_str if "!" in x]
+        if kw_inv:
+            matches_set = matches_set.union(name_index.names - set().union(
+                *[name_index.search(x) for x in kw_inv]))
+        # Construct lists of all ECM names that were and were not matched,
+        # preserving the order of the ECM names given
+        matches = [ecm for ecm in ecm_names_list if ecm in matches_set]
+        non_matches = [
+            ecm for ecm in ecm_names_list if ecm not in matches_set]
 
     # If the list is empty, running the above process would result in
     # all of the ECM names matching, which is the opposite of what is
@@ -239,6 +317,7 @@ def fix_ecm_move_conflicts(conflict_ecm_list, move_order_text):
 
     # Create a list of all of the ECMs that are going to be kept
     # in place/not moved
+    move_ecm_numbers = set(move_ecm_numbers)
     keep_in_place = [conflict_ecm_list[i-1]
                      for i in range(1, len(conflict_ecm_list)+1)
                      if i not in move_ecm_numbers]
@@ -246,7 +325,8 @@ def fix_ecm_move_conflicts(conflict_ecm_list, move_order_text):
     return keep_in_place
 
 
-def ecm_list_kw_update(active_list, inactive_list):
+def ecm_list_kw_update(active_list, inactive_list, kw_to_inactive=None,
+                       kw_to_active=None):
     """Update the lists of ECMs based on the keywords specified by the user
 
     Taking the lists of ECM names that are indicated as active and
@@ -260,58 +340,50 @@ def ecm_list_kw_update(active_list, inactive_list):
     updated lists of active and inactive ECMs to write back to the
     JSON file.
 
+    If the keywords are given as arguments (e.g., from the command
+    line), the user is not prompted and conflicts are resolved by
+    leaving the conflicting ECMs on their original lists.
+
     Args:
         active_list (list): A list of ECM names that are set to be
             active (i.e., included) when executing run.py.
         inactive_list (list): A list of ECN names corresponding to the
             ECMs that will not be included in an analysis using run.py.
+        kw_to_inactive (list): Keywords to use to move ECMs from the
+            active to the inactive list; if neither this nor
+            'kw_to_active' is given, the user is prompted for both.
+        kw_to_active (list): Keywords to use to move ECMs from the
+            inactive to the active list.
 
     Returns:
         Revised lists of active and inactive ECMs.
     """
 
-    # Text to print to the console, broken into short blocks
-    print('You can use short strings to quickly move groups of ECMs '
-          'from the active to inactive lists and vice versa. '
-          'For example, you can specify "Prospective" (without the double '
-          'quotes) to select all ECMs that have the word Prospective '
-          'in their name.\n')
-    print('You may input more than one search term. Please separate '
-          'each term with a comma, for example: Efficient, 20%\n')
-    print('Adding a "!" character before any of your terms will invert the '
-          'search for that term. For example, you can specify "Prospective, '
-          '!ENERGY STAR" (without the double quotes) to select all ECM names '
-          'that have the word Prospective or do NOT have the word ENERGY STAR '
-          'in their name.\n')
-    print('Search terms are not case-sensitive. Search terms should '
-          'not be enclosed by any quotes or other special characters.\n')
-    print('If you are unsure of the ECMs currently listed as active '
-          'and inactive, inspect the lists in the run_setup.json file.\n')
-
-    # Define text for prompts to user to input keywords for moving
-    # ECMs to the inactive and active lists
-    to_inactive_prompt_text = ('Enter ECM name keywords separated by '
-                               'commas to move ECMs active -> inactive: ')
-    to_active_prompt_text = ('Enter ECM name keywords separated by '
-                             'commas to move ECMs inactive -> active: ')
+    # Prompt the user for keywords unless keywords are given
+    interactive = kw_to_inactive is None and kw_to_active is None
+    if interactive:
+        kw_to_inactive, kw_to_active = user_input_ecm_kw_moves()
+    else:
+        kw_to_inactive = kw_to_inactive or []
+        kw_to_active = kw_to_active or []
 
-    # Call function to obtain list of user input strings
-    kw_to_inactive = user_input_ecm_kw(to_inactive_prompt_text)
-    kw_to_active = user_input_ecm_kw(to_active_prompt_text)
+    # Index the words in all of the ECM names for use in each of the
+    # keyword searches below
+    name_index = ECMNameIndex(active_list + inactive_list)
 
     # Update active and inactive lists and identify moves
-    move_to_inactive, active_list = ecm_kw_regex_select(active_list,
-                                                        kw_to_inactive)
-    move_to_active, inactive_list = ecm_kw_regex_select(inactive_list,
-                                                        kw_to_active)
+    move_to_inactive, active_list = ecm_kw_regex_select(
+        active_list, kw_to_inactive, name_index)
+    move_to_active, inactive_list = ecm_kw_regex_select(
+        inactive_list, kw_to_active, name_index)
 
     # ACTIVE ECM LIST AND ASSOCIATED MOVES ----------------------------
     # Check if the keywords given for selecting inactive ECMs to move
     # to the active list would select any of the ECMs about to move
     # to the inactive list
     if kw_to_active and move_to_inactive:
-        back_to_active, _ = ecm_kw_regex_select(move_to_inactive,
-                                                kw_to_active)
+        back_to_active, _ = ecm_kw_regex_select(
+            move_to_inactive, kw_to_active, name_index)
 
         # If there are any ECMs that are selected to move to the
         # inactive list that could then be moved back to active
@@ -319,14 +391,18 @@ def ecm_list_kw_update(active_list, inactive_list):
         # resolve what to do with those ECMs based on user input
         if back_to_active:
             # Get user input on how to move the ECMs
-            keep_active = fix_ecm_move_conflicts(back_to_active,
-                                                 'active to inactive')
+            if interactive:
+                keep_active = fix_ecm_move_conflicts(back_to_active,
+                                                     'active to inactive')
+            else:
+                keep_active = back_to_active
 
             # Update the active list by restoring the ECMs that had
             # been slated for removal and rebuild the list of ECMs
             # to move to the inactive list by removing all those that
             # will now be kept as active
             active_list = active_list + keep_active
+            keep_active = set(keep_active)
             move_to_inactive = [ecm for ecm in move_to_inactive
                                 if ecm not in keep_active]
 
@@ -335,8 +411,8 @@ def ecm_list_kw_update(active_list, inactive_list):
     # the inactive list would select any of the ECMs about to move the
     # the active list
     if kw_to_inactive and move_to_active:
-        back_to_inactive, _ = ecm_kw_regex_select(move_to_active,
-                                                  kw_to_inactive)
+        back_to_inactive, _ = ecm_kw_regex_select(
+            move_to_active, kw_to_inactive, name_index)
 
         # If there are any ECMs that are selected to move to the
         # active list that could then be moved back to inactive
@@ -344,14 +420,18 @@ def ecm_list_kw_update(active_list, inactive_list):
         # resolve what to do with those ECMs based on user input
         if back_to_inactive:
             # Get user input on how to move the ECMs
-            keep_inactive = fix_ecm_move_conflicts(back_to_inactive,
-                                                   'inactive to active')
+            if interactive:
+                keep_inactive = fix_ecm_move_conflicts(back_to_inactive,
+                                                       'inactive to active')
+            else:
+                keep_inactive = back_to_inactive
 
             # Update the inactive list by restoring the ECMs that had
             # been slated for removal and rebuild the list of ECMs to
             # move to the active list by removing all those that will
             # now be kept as inactive
             inactive_list = inactive_list + keep_inactive
+            keep_inactive = set(keep_inactive)
             move_to_active = [ecm for ecm in move_to_active
                               if ecm not in keep_inactive]
 
@@ -364,6 +444,46 @@ def ecm_list_kw_update(active_list, inactive_list):
     return active_list, inactive_list
 
 
+def user_input_ecm_kw_moves():
+    """Get user input for the keywords to move ECMs between the lists
+
+    Returns:
+        Lists of keywords to use to move ECMs from the active to the
+        inactive list and from the inactive to the active list.
+    """
+
+    # Text to print to the console, broken into short blocks
+    print('You can use short strings to quickly move groups of ECMs '
+          'from the active to inactive lists and vice versa. '
+          'For example, you can specify "Prospective" (without the double '
+          'quotes) to select all ECMs that have the word Prospective '
+          'in their name.\n')
+    print('You may input more than one search term. Please separate '
+          'each term with a comma, for example: Efficient, 20%\n')
+    print('Adding a "!" character before any of your terms will invert the '
+          'search for that term. For example, you can specify "Prospective, '
+          '!ENERGY STAR" (without the double quotes) to select all ECM names '
+          'that have the word Prospective or do NOT have the word ENERGY STAR '
+          'in their name.\n')
+    print('Search terms are not case-sensitive. Search terms should '
+          'not be enclosed by any quotes or other special characters.\n')
+    print('If you are unsure of the ECMs currently listed as active '
+          'and inactive, inspect the lists in the run_setup.json file.\n')
+
+    # Define text for prompts to user to input keywords for moving
+    # ECMs to the inactive and active lists
+    to_inactive_prompt_text = ('Enter ECM name keywords separated by '
+                               'commas to move ECMs active -> inactive: ')
+    to_active_prompt_text = ('Enter ECM name keywords separated by '
+                             'commas to move ECMs inactive -> active: ')
+
+    # Call function to obtain list of user input strings
+    kw_to_inactive = user_input_ecm_kw(to_inactive_prompt_text)
+    kw_to_active = user_input_ecm_kw(to_active_prompt_text)
+
+    return kw_to_inactive, kw_to_active
+
+
 def user_input_baseline_market_filters(market_cat):
     """Obtain user selections for the baseline market filtering categories
 
@@ -486,61 +606,26 @@ def evaluate_ecm_json(json_contents, filters, market_cat):
         where keep = True, move to inactive = False
     """
 
-    # Extract the relevant values from the key in the dict indicated
-    # by the 'market_cat' variable
-    json_vals = json_contents[market_cat]
-
-    # Set the return value (active_bool) to False initially
-    active_bool = False
-
-    # Determine whether the filter values are in the current ECM
-    if json_vals == 'all':
-        # If the JSON is set to "all" for the current field of
-        # interest, then there's certainly a match with whatever
-        # filters the user has requested
-        active_bool = True
-    # Special handling for building type
-    elif market_cat == 'bldg_type':
-        # Do not need for loop through filters since only two
-        # building type values can be passed to this function,
-        # and if both apply, this function should not be called
-        # in the first place
+    # Index the ECM on its own and apply the filters to the index
+    market_index = {market_cat: {'all': set(), '_indexed': set()}}
+    index_market_values(market_index, json_contents)
+    active_list = ecm_list_market_filter(
+        [json_contents['name']], [], {market_cat: filters}, market_index)[0]
 
-        il = IndexLists()  # Instantiate object
-
-        # Make the value(s) in json_vals into a list
-        # if it is not already
-        if not isinstance(json_vals, list):
-            json_vals = [json_vals]
-
-        # Set active_bool based on whether or not there are any matching
-        # building types present in the ECM; note that the isdisjoint
-        # set evaluation returns FALSE if matches are found;
-        # 'filters[0]' will always match one of the two building type
-        # keys specified in the building_type_map attribute of IndexLists
-        if not set(il.building_type_map[filters[0]]).isdisjoint(json_vals):
-            active_bool = True
-    else:
-        # Cycle through all of the filter values
-        for entry in filters:
-            # If any of the entries in the list of filters match for
-            # this ECM, set the active status of this ECM to True
-            if entry in json_vals:
-                active_bool = True
-
-    return active_bool
+    return bool(active_list)
 
 
 def ecm_list_market_update(ecm_folder, active_list, inactive_list,
-                           filters, market_cat):
+                           filters, market_cat, catalog=None):
     """Update the active and inactive lists based on the user-selected filters
 
     Based on the filters identified by the user for a given baseline
-    market parameter, this function opens each ECM and (after checking
-    to ensure that it is on the active list) checks to see if it
-    passes the filters and can thus be retained on the active list
-    or if it should be moved to the inactive list. The active and
-    and inactive lists are updated after reviewing each ECM
+    market parameter, this function looks up each ECM in the catalog of
+    ECM definitions and (after checking to ensure that it is on the
+    active list) checks to see if it passes the filters and can thus be
+    retained on the active list or if it should be moved to the inactive
+    list. The active and inactive lists are updated after reviewing
+    each ECM
 
     Args:
         ecm_folder (str): The path to the folder where the ECM JSON
@@ -553,59 +638,191 @@ def ecm_list_market_update(ecm_folder, active_list, inactive_list,
             the current ECM should be active or not
         market_cat (str): Applicable baseline market string used to
             indicate what data should be requested from the user
+        catalog (ECMCatalog): Catalog of the ECM JSON definition files in
+            'ecm_folder'; if not given, the ECM JSON files are cataloged
+            when this function is called
+
+    Returns:
+        Updated lists of active and inactive ECMs.
+    """
+
+    # Catalog the ECM JSON files in the ECM folder if no catalog is given
+    if catalog is None:
+        catalog = ecm_catalog.ECMCatalog(ecm_folder)
+
+    # Index the ECMs by baseline market and filter the active ECMs
+    return ecm_list_market_filter(active_list, inactive_list,
+                                  {market_cat: filters},
+                                  market_filter_index(catalog))
+
+
+def market_filter_index(catalog):
+    """Index the ECM names by the baseline market values they apply to
+
+    For each of the baseline market categories handled by this module,
+    the names of the ECMs in the catalog are grouped by the values in
+    that category that the ECMs apply to, such that the ECMs matching
+    any set of user-selected filters can be found with set operations
+    rather than by evaluating each ECM definition.
+
+    Building types are indexed by the building type families that can
+    be selected by the user (i.e., the keys in the building_type_map
+    attribute of IndexLists).
+
+    Args:
+        catalog (ECMCatalog): Catalog of the ECM JSON definition files
+
+    Returns:
+        A dict keyed by baseline market category, where each value
+        is a dict of sets of ECM names keyed by the baseline market
+        value that the ECMs apply to; ECMs that apply to all values
+        in a given category are included under the key 'all', and
+        all of the indexed ECMs are included under the key '_indexed'.
+    """
+    # Instantiate object with useful variables
+    ref = UsefulVars()
+
+    # Initialize the index for each baseline market category
+    market_index = {market_cat: {'all': set(), '_indexed': set()}
+                    for market_cat in ref.market_filters}
+
+    # Work through the cataloged ECMs, skipping the package ECMs JSON
+    # definition file
+    for ecm_file, entry in catalog.entries.items():
+        if ecm_file == 'package_ecms.json':
+            continue
+        index_market_values(market_index, entry)
+
+    return market_index
+
+
+def index_market_values(market_index, ecm):
+    """Add an ECM to an index of ECM names by baseline market value
+
+    The ECM is recorded under the '_indexed' key for each baseline
+    market category in the index, whether or not any of its values
+    in that category can be selected by the user, such that ECMs
+    with no selectable values (e.g., building types outside of the
+    building type families) are moved to the inactive list when the
+    category is filtered.
+
+    Args:
+        market_index (dict): ECM names indexed by baseline market
+            category and value, as output by market_filter_index
+        ecm (dict): The name and baseline market fields of an ECM
+    """
+    # Instantiate index lists object
+    il = IndexLists()
+
+    for market_cat, market_cat_index in market_index.items():
+        market_cat_index['_indexed'].add(ecm['name'])
+        json_vals = ecm[market_cat]
+        # ECMs set to "all" for the current field match any filters
+        if json_vals == 'all':
+            market_cat_index['all'].add(ecm['name'])
+            continue
+        # Make the value(s) in json_vals into a list if it is not
+        # already
+        if not isinstance(json_vals, list):
+            json_vals = [json_vals]
+        # Convert building types into building type families
+        if market_cat == 'bldg_type':
+            json_vals = [
+                x for x in il.building_type if not set(
+                    il.building_type_map[x]).isdisjoint(json_vals)]
+        for val in json_vals:
+            market_cat_index.setdefault(val, set()).add(ecm['name'])
+
+
+def ecm_list_market_filter(active_list, inactive_list, market_filters,
+                           market_index):
+    """Update the active and inactive lists based on baseline market filters
+
+    ECMs on the active list are moved to the inactive list if they do
+    not match the filters given for any one of the baseline market
+    categories; ECMs on the active list that are not in the baseline
+    market index (e.g., package ECMs) remain active.
+
+    Args:
+        active_list (list): A list of ECM names that are set to be
+            active (i.e., included) when executing run.py
+        inactive_list (list): A list of ECN names corresponding to the
+            ECMs that will not be included in an analysis using run.py
+        market_filters (dict): Lists of strings to use to determine
+            whether each ECM should be active or not, keyed by the
+            applicable baseline market category; categories for which
+            the filters are False (i.e., all options are selected)
+            are not used to filter the ECMs
+        market_index (dict): ECM names indexed by baseline market
+            category and value, as output by market_filter_index
 
     Returns:
         Updated lists of active and inactive ECMs.
     """
+    # Determine the set of ECMs that do not match the filters for
+    # one or more baseline market categories
+    ecms_out = set()
+    for market_cat, filters in market_filters.items():
+        if not filters:
+            continue
+        market_cat_index = market_index[market_cat]
+        ecms_in = market_cat_index['all'].union(
+            *[market_cat_index.get(x, set()) for x in filters])
+        ecms_out.update(market_cat_index['_indexed'] - ecms_in)
+
+    # Move the ECMs that do not match the filters from the active list
+    # to the inactive list
+    inactive_list = inactive_list + [
+        x for x in active_list if x in ecms_out]
+    active_list = [x for x in active_list if x not in ecms_out]
 
-    # Get list of files in the ECM folder
-    file_list = os.listdir(ecm_folder)
-
-    # Clean up list of files to include only ECM JSONs
-    file_list = [name for name in file_list if name.endswith('.json')]
-
-    # Try to remove the package ECMs JSON definition file if it is
-    # present, otherwise continue
-    try:
-        file_list.remove('package_ecms.json')
-    except ValueError:
-        pass
-
-    # Work through the list of ECMs
-    for ecm_file in file_list:
-        # Construct file path
-        ecm_file_path = ecm_folder + '/' + ecm_file
-
-        # Import JSON file
-        with open(ecm_file_path, 'r') as fobj:
-            ecm_json_contents = json.load(fobj)
-
-        # Check if the ECM is currently in the active list, and if
-        # it is, determine whether it should remain in that list
-        if ecm_json_contents['name'] in active_list:
-            # Find out whether or not this ECM should be included
-            # in the active list
-            keep = evaluate_ecm_json(ecm_json_contents, filters, market_cat)
-
-            # Update the active and inactive lists based on the
-            # evaluation of the ECM by the evaluate_ecm_json function
-            if not keep:
-                active_list.remove(ecm_json_contents['name'])
-                inactive_list.append(ecm_json_contents['name'])
-
-    # Return the updated list of active ECMs and ECMs to be moved to inactive
     return active_list, inactive_list
 
 
-def main():
-    # Clear the console window before printing any text
-    os.system('cls' if os.name == 'nt' else 'clear')
+def cli_market_filters(market_cat, selections):
+    """Convert baseline market selections given at the command line
+
+    Args:
+        market_cat (str): Applicable baseline market category
+        selections (str): Comma-separated values to select for the
+            baseline market category, specified in the same format
+            as in the ECM definitions (e.g., 'AIA_CZ1,AIA_CZ2')
+
+    Returns:
+        A list of filters corresponding to the values that should
+        match with the updated list of active ECMs, or False if all
+        of the options for the baseline market category are selected.
+
+    Raises:
+        ValueError: If any of the selections is not a valid option
+            for the baseline market category.
+    """
+    # Instantiate index lists object
+    il = IndexLists()
 
-    # Print initial script message to the console
-    print('\nThis function will help configure the simulation. '
-          'Respond to each of the prompts.\n'
-          'Hit "enter" or "return" to skip a question.\n')
+    # Set the options available for the baseline market category
+    json_keys = {'climate_zone': il.climate_zone,
+                 'bldg_type': il.building_type,
+                 'structure_type': il.structure_type}[market_cat]
+
+    # Convert the selections into a list of filters, checking that
+    # each of the selections is a valid option
+    user_match_filters = [x.strip() for x in selections.split(',')
+                          if x.strip()]
+    invalid = [x for x in user_match_filters if x not in json_keys]
+    if invalid:
+        raise ValueError(
+            "Invalid " + market_cat + " selection(s) " + str(invalid) +
+            "; valid options are " + str(json_keys))
+
+    # Return False if the selections cover all of the options
+    if set(user_match_filters) == set(json_keys):
+        user_match_filters = False
 
+    return user_match_filters
+
+
+def main():
     # Instantiate object with useful master variables
     ref = UsefulVars()
 
@@ -613,34 +830,58 @@ def main():
     with open(ref.setup_file, 'r') as fobj:
         setup_json = json.load(fobj)
 
-    # Execute function to update lists
-    active, inactive = ecm_list_kw_update(setup_json['active'],
-                                          setup_json['inactive'])
-
-    # Clear the console window again
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-    # Print instructions regarding additional filtering opportunities
-    print('\nNow, you will be prompted to further reduce the '
-          'list of ECMs to include in the analysis, if you desire. '
-          'Your selections in the subsequent prompts will only apply '
-          'to the active ECM list.\nHit "enter" or "return" to skip '
-          'a question.\n')
-
-    # Loop through the baseline market fields available, prompt
-    # the user, and update the list of active ECMs accordingly
-    for market in ref.market_filters:
-        user_filter_choices = user_input_baseline_market_filters(market)
-
-        # If False, do not proceed, otherwise use filters to select
-        # the appropriate ECMs and move them from the active to the
-        # inactive list
-        if user_filter_choices:
-            active, inactive = ecm_list_market_update(ref.ecm_folder_location,
-                                                      active,
-                                                      inactive,
-                                                      user_filter_choices,
-                                                      market)
+    # Determine the baseline market selections given as command line
+    # options, if any
+    cli_selections = {
+        market: getattr(options, market) for market in ref.market_filters
+        if getattr(options, market) is not None}
+
+    # If keywords or baseline market selections are given as command line
+    # options, update the ECM lists on those selections without prompting
+    if cli_selections or options.kw_inactive is not None or \
+            options.kw_active is not None:
+        active, inactive = ecm_list_kw_update(
+            setup_json['active'], setup_json['inactive'],
+            split_ecm_kw(options.kw_inactive or ''),
+            split_ecm_kw(options.kw_active or ''))
+        market_filters = {
+            market: cli_market_filters(market, selections)
+            for market, selections in cli_selections.items()}
+    else:
+        # Clear the console window before printing any text
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+        # Print initial script message to the console
+        print('\nThis function will help configure the simulation. '
+              'Respond to each of the prompts.\n'
+              'Hit "enter" or "return" to skip a question.\n')
+
+        # Execute function to update lists
+        active, inactive = ecm_list_kw_update(setup_json['active'],
+                                              setup_json['inactive'])
+
+        # Clear the console window again
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+        # Print instructions regarding additional filtering opportunities
+        print('\nNow, you will be prompted to further reduce the '
+              'list of ECMs to include in the analysis, if you desire. '
+              'Your selections in the subsequent prompts will only apply '
+              'to the active ECM list.\nHit "enter" or "return" to skip '
+              'a question.\n')
+
+        # Loop through the baseline market fields available and prompt
+        # the user for the filters to apply to each
+        market_filters = {market: user_input_baseline_market_filters(market)
+                          for market in ref.market_filters}
+
+    # Catalog the ECM definitions and index them by baseline market, then
+    # move the ECMs that do not match the filters from the active to the
+    # inactive list
+    catalog = ecm_catalog.ECMCatalog(
+        ref.ecm_folder_location, ref.ecm_catalog_location)
+    active, inactive = ecm_list_market_filter(
+        active, inactive, market_filters, market_filter_index(catalog))
 
     # Update configuration/setup object with new ECM lists
     setup_json['active'] = active
@@ -651,4 +892,23 @@ def main():
 
 
 if __name__ == '__main__':
+    # Handle command line options specifying keywords and baseline market
+    # selections
+    parser = OptionParser()
+    parser.add_option("--kw_inactive", dest="kw_inactive", default=None,
+                      help="comma-separated ECM name keywords to move ECMs "
+                           "active -> inactive (prefix '!' to invert)")
+    parser.add_option("--kw_active", dest="kw_active", default=None,
+                      help="comma-separated ECM name keywords to move ECMs "
+                           "inactive -> active (prefix '!' to invert)")
+    parser.add_option("--climate", dest="climate_zone", default=None,
+                      help="comma-separated climate zones to keep active "
+                           "ECMs for (e.g., 'AIA_CZ1,AIA_CZ2')")
+    parser.add_option("--bldg", dest="bldg_type", default=None,
+                      help="comma-separated building types to keep active "
+                           "ECMs for ('residential' and/or 'commercial')")
+    parser.add_option("--structure", dest="structure_type", default=None,
+                      help="comma-separated structure types to keep active "
+                           "ECMs for ('new' and/or 'retrofit')")
+    (options, args) = parser.parse_args()
     main()
@@ -11,6 +11,7 @@ from collections import Counter
 import os
 import json
 import sys
+import tempfile
 
 
 class NullDevice(object):
@@ -239,6 +240,33 @@ class RegexECMNameMatchingTest(CommonUnitTest):
             self.assertTrue(self.compare(self.active_list_non_match[idx], out))
 
 
+class ECMNameIndexTest(CommonUnitTest):
+    # Test that the index finds the ECM names including each search
+    # term, including terms that span or only partly match the words
+    # in the ECM names
+    def test_ECM_name_index_search(self):
+        name_index = run_setup.ECMNameIndex(
+            self.active_list + self.inactive_list)
+        self.assertEqual(name_index.search('energy star'), set([
+            'ENERGY STAR Refrigerators v. 3.0',
+            'Window A/C (ENERGY STAR Most Efficient)',
+            'ENERGY STAR Water Heater v.5.0',
+            'low-cost energy star refrigerator v.3.0']))
+        self.assertEqual(name_index.search('rgy st'),
+                         name_index.search('ENERGY STAR'))
+        self.assertEqual(name_index.search('0%'), set([
+            'Air Sealing Retrofit, Infiltration Reduction 20%']))
+        self.assertEqual(name_index.search('Scenario 1'), set())
+
+    # Test that the search terms are matched as literal text
+    def test_ECM_list_matching_literal_search_terms(self):
+        out, _ = run_setup.ecm_kw_regex_select(
+            self.active_list, ['(ENERGY STAR', 'v. 3.0'])
+        self.assertTrue(self.compare(out, [
+            'Window A/C (ENERGY STAR Most Efficient)',
+            'ENERGY STAR Refrigerators v. 3.0']))
+
+
 class FixECMMoveConflictsTest(CommonUnitTest):
     # Set up example lists of conflicting entries from which
     # responses can be drawn
@@ -488,6 +516,47 @@ class ECMListKeywordSelectionUpdatingTest(CommonUnitTest):
         self.assertTrue(self.compare(actual_active, self.expected_active))
         self.assertTrue(self.compare(actual_inactive, self.expected_inactive))
 
+    # Test a case where the keywords are given as arguments rather than
+    # by the user, in which case the ECMs with conflicting moves should
+    # remain on their original lists without prompting the user
+    @patch('run_setup.fix_ecm_move_conflicts')
+    @patch('run_setup.user_input_ecm_kw')
+    def test_ecm_list_update_non_interactive(self, patch_kw, patch_fix):
+        # Active list for the given keywords
+        self.expected_active = [
+            'OLED Manufacturing Cost Reduction',
+            'Low-cost Triple Pane Window, U-factor 0.20',
+            'Novel Electric Clothes Dryer, Low-cost',
+            'SEER 20 Central AC System',
+            'Air Sealing Retrofit, Infiltration Reduction 20%',
+            'Low-cost Prospective Integrated Heat Pump',
+            'Low-cost Insulated Integrated Roof Decking']
+
+        # Inactive list for the given keywords
+        self.expected_inactive = [
+            'Peel and stick sensors and integrated fan control (Prospective)',
+            'prospective advanced thermoelastic water heater',
+            'low-cost energy star refrigerator v.3.0',
+            'Thermoelectric Heat Pump (Prospective)',
+            'ENERGY STAR Refrigerators v. 3.0',
+            'Window A/C (ENERGY STAR Most Efficient)',
+            '(Prospective) Silica Nanoparticle Liquid-applied Insulation',
+            '20 CFM Bathroom Ventilation Fan (Prospective)',
+            'ENERGY STAR Water Heater v.5.0']
+
+        # Obtain outputs from the function under test
+        actual_active, actual_inactive = run_setup.ecm_list_kw_update(
+            self.active_list, self.inactive_list,
+            ['Prospective', 'ENERGY STAR'], ['Low-cost'])
+
+        # Confirm that the user was not prompted and compare the active
+        # and inactive lists output by the function with the expected
+        # output
+        patch_kw.assert_not_called()
+        patch_fix.assert_not_called()
+        self.assertTrue(self.compare(actual_active, self.expected_active))
+        self.assertTrue(self.compare(actual_inactive, self.expected_inactive))
+
 
 class UserBaselineMarketSelectionsTest(unittest.TestCase):
     # Test the output of the baseline market selection function when
@@ -796,10 +865,13 @@ class ECMListMarketSelectionUpdatingTest(CommonUnitTest):
             'Commercial Lighting, IECC c. 2015']
         self.inactive_list = ['ENERGY STAR Gas Boiler v. 3.0']
 
-    # Patch through the mock_open functionality and the os.listdir command
+    # Patch through the mock_open functionality and the os.listdir and
+    # os.stat commands
     @patch('builtins.open', new_callable=mock_open)
     @patch.object(os, 'listdir', create=True)
-    def test_ecm_list_baseline_market_updating(self, mock_listdir, mock_fopen):
+    @patch.object(os, 'stat')
+    def test_ecm_list_baseline_market_updating(
+            self, mock_stat, mock_listdir, mock_fopen):
         # Set up file list to be returned by the mocked os.listdir
         # call, including the package_ecms.json file and a few folders
         # that should be skipped automatically by the function
@@ -842,6 +914,130 @@ class ECMListMarketSelectionUpdatingTest(CommonUnitTest):
         self.assertTrue(self.compare(inactive, expect_inactive))
 
 
+class ECMMarketFilterIndexTest(CommonUnitTest):
+    # Set up a folder of ECM definitions and the lists of active and
+    # inactive ECMs for the tests of the indexed baseline market filtering
+    def setUp(self):
+        self.ecms = {
+            'ecm1.json': {
+                'name': 'ENERGY STAR Air Source HP v. 5.0',
+                'climate_zone': 'all',
+                'bldg_type': 'all residential',
+                'structure_type': 'existing',
+                'end_use': ['cooling', 'heating'],
+                'fuel_type': 'electricity',
+                'technology': 'ASHP'},
+            'ecm2.json': {
+                'name': 'Commercial Gas Boiler, 90.1 c. 2013',
+                'climate_zone': ['AIA_CZ3', 'AIA_CZ4'],
+                'bldg_type': 'all commercial',
+                'structure_type': 'all',
+                'end_use': 'heating',
+                'fuel_type': 'natural gas',
+                'technology': 'gas_boiler'},
+            'ecm3.json': {
+                'name': 'ENERGY STAR Windows v. 6.0',
+                'climate_zone': ['AIA_CZ1', 'AIA_CZ2', 'AIA_CZ3'],
+                'bldg_type': 'all residential',
+                'structure_type': 'all',
+                'end_use': ['heating', 'secondary heating', 'cooling'],
+                'fuel_type': 'all',
+                'technology': ['windows conduction', 'windows solar']},
+            'ecm4.json': {
+                'name': 'Commercial Lighting, IECC c. 2015',
+                'climate_zone': 'all',
+                'bldg_type': ['assembly', 'education', 'small office'],
+                'structure_type': 'new',
+                'end_use': 'lighting',
+                'fuel_type': 'electricity',
+                'technology': ['F32T8', 'T8 F32 EEMag (e)']}}
+        self.ecm_dir = tempfile.TemporaryDirectory()
+        for ecm_file, ecm in self.ecms.items():
+            with open(os.path.join(self.ecm_dir.name, ecm_file), 'w') as f:
+                json.dump(ecm, f)
+        # Package ECMs are not cataloged and should remain active
+        self.active_list = [
+            'ENERGY STAR Air Source HP v. 5.0',
+            'Commercial Gas Boiler, 90.1 c. 2013',
+            'ENERGY STAR Windows v. 6.0',
+            'Commercial Lighting, IECC c. 2015',
+            'Residential Package']
+        self.inactive_list = ['ENERGY STAR Gas Boiler v. 3.0']
+        self.market_index = run_setup.market_filter_index(
+            run_setup.ecm_catalog.ECMCatalog(self.ecm_dir.name))
+
+    def tearDown(self):
+        self.ecm_dir.cleanup()
+
+    # Test that the ECMs are indexed by the baseline market values
+    # they apply to
+    def test_market_filter_index(self):
+        self.assertEqual(self.market_index['climate_zone']['all'], {
+            'ENERGY STAR Air Source HP v. 5.0',
+            'Commercial Lighting, IECC c. 2015'})
+        self.assertEqual(self.market_index['climate_zone']['AIA_CZ3'], {
+            'Commercial Gas Boiler, 90.1 c. 2013',
+            'ENERGY STAR Windows v. 6.0'})
+        self.assertEqual(self.market_index['bldg_type']['commercial'], {
+            'Commercial Gas Boiler, 90.1 c. 2013',
+            'Commercial Lighting, IECC c. 2015'})
+
+    # Test filtering of the active ECMs on several baseline market
+    # categories at once
+    def test_ecm_list_market_filter(self):
+        market_filters = {
+            'climate_zone': ['AIA_CZ1', 'AIA_CZ2'],
+            'bldg_type': False,
+            'structure_type': ['new']}
+        expect_active = [
+            'ENERGY STAR Windows v. 6.0',
+            'Commercial Lighting, IECC c. 2015',
+            'Residential Package']
+        expect_inactive = [
+            'ENERGY STAR Air Source HP v. 5.0',
+            'Commercial Gas Boiler, 90.1 c. 2013',
+            'ENERGY STAR Gas Boiler v. 3.0']
+        active, inactive = run_setup.ecm_list_market_filter(
+            self.active_list, self.inactive_list, market_filters,
+            self.market_index)
+        self.assertTrue(self.compare(active, expect_active))
+        self.assertTrue(self.compare(inactive, expect_inactive))
+
+    # Test conversion of baseline market selections given as command
+    # line options into filters
+    def test_cli_market_filters(self):
+        self.assertEqual(run_setup.cli_market_filters(
+            'climate_zone', 'AIA_CZ1, AIA_CZ2'), ['AIA_CZ1', 'AIA_CZ2'])
+        self.assertFalse(run_setup.cli_market_filters(
+            'bldg_type', 'residential,commercial'))
+        with self.assertRaises(ValueError):
+            run_setup.cli_market_filters('structure_type', 'existing')
+
+    # Test that ECMs with no building type family or no climate zones
+    # are moved to the inactive list when those categories are filtered
+    def test_ecm_list_market_filter_unmatched_values(self):
+        ecm5 = {
+            'name': 'Unmapped Building Type ECM',
+            'climate_zone': [],
+            'bldg_type': 'unknown building',
+            'structure_type': 'all',
+            'end_use': 'heating',
+            'fuel_type': 'electricity',
+            'technology': 'ASHP'}
+        with open(os.path.join(self.ecm_dir.name, 'ecm5.json'), 'w') as f:
+            json.dump(ecm5, f)
+        market_index = run_setup.market_filter_index(
+            run_setup.ecm_catalog.ECMCatalog(self.ecm_dir.name))
+        for market_cat, filters in [('bldg_type', ['residential']),
+                                    ('climate_zone', ['AIA_CZ1'])]:
+            active, inactive = run_setup.ecm_list_market_filter(
+                [ecm5['name']], [], {market_cat: filters}, market_index)
+            self.assertEqual(active, [])
+            self.assertEqual(inactive, [ecm5['name']])
+            self.assertFalse(
+                run_setup.evaluate_ecm_json(ecm5, filters, market_cat))
+
+
 # Offer external code execution (include all lines below this point in all
 # test files)
 def main():